@@ -0,0 +1,394 @@
+import asyncio
+import glob
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from common import profiling
+from common.base import BaseAnalyzer
+from common.compact import compact_program
+from common.copybook import CopybookLibrary
+from common.manifest import ReuseStats, current_input
+from common.parse_cache import DEFAULT_MAX_BYTES as DEFAULT_PARSE_CACHE_BYTES, ParseCache
+from common.results import RESULTS_SUFFIX, DocumentationResult
+from common.parser import get_parser
+from common.profiling import Profile
+from common.source import read_source
+from common.util import Program
+from metrics import DocumentationMetrics
+from static_analyzer import StaticAnalyzer
+
+OUTPUT_NAME_TEMPLATE = '{}_{}.output'
+DEFAULT_CHUNK_SIZE = 8
+SOURCE_SUFFIXES = ('.cbl', '.cob', '.cobol')
+# Inputs the pipeline reads, parses and documents at the same time
+FILES_IN_FLIGHT = 32
+
+
+@dataclass
+class FileResult:
+    analyzer: str
+    input_path: str
+    output_path: str
+    statements: int = 0
+    seconds: float = 0.0
+    summary: str = ''
+    error: Optional[str] = None
+    reused: int = 0
+    paragraphs: int = 0
+    # None when no parse cache is in use
+    parse_cache_hit: Optional[bool] = None
+    # COPY statements expanded and copybooks parsed while the analyzer parsed the file
+    copybook_includes: int = 0
+    copybooks_parsed: int = 0
+    # Spans and counters of a pool worker, when profiling
+    profile: Optional[Profile] = None
+
+
+@dataclass
+class BatchOptions:
+    output_dir: str
+    fixed_format: bool = False
+    metrics: bool = True
+    manifest_dir: Optional[str] = None
+    dataflow_cap: Optional[int] = None
+    parse_cache: Optional[str] = None
+    parse_cache_bytes: int = DEFAULT_PARSE_CACHE_BYTES
+    use_parse_cache: bool = True
+    profile: bool = False
+    # Directories searched for COPY members; none leaves COPY statements to the parser
+    copybook_paths: Tuple[str, ...] = ()
+    # Outputs mirror each input's directory below this one; none writes them all into output_dir
+    input_root: Optional[str] = None
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Resolve files, directories and glob patterns to a sorted list of members."""
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                found.update(os.path.join(root, n) for n in names if n.lower().endswith(SOURCE_SUFFIXES))
+        elif os.path.isfile(item):
+            found.add(item)
+        else:
+            found.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(found)
+
+
+def input_root(inputs: List[str]) -> Optional[str]:
+    """The deepest directory holding every input."""
+    try:
+        return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs])
+    except ValueError:
+        # No inputs, or inputs on several drives
+        return None
+
+
+def output_path(options: BatchOptions, analyzer_name: str, input_path: str) -> str:
+    """Where input_path is documented: its directory below options.input_root
+    is mirrored and its full name kept, so members sharing a name in other
+    directories, or a stem with another suffix, get outputs of their own."""
+    directory = options.output_dir
+    if options.input_root is not None:
+        relative = os.path.relpath(os.path.dirname(os.path.abspath(input_path)), options.input_root)
+        if relative != os.pardir and not relative.startswith(os.pardir + os.sep):
+            directory = os.path.normpath(os.path.join(directory, relative))
+    return os.path.join(directory, OUTPUT_NAME_TEMPLATE.format(analyzer_name, os.path.basename(input_path)))
+
+
+def write_atomic(path: str, write: Callable[[TextIO], object]):
+    """Write into a temporary file next to path, then rename over it."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def document_file(analyzer_name: str, analyzer: BaseAnalyzer, input_path: str, options: BatchOptions,
+                  source: str = None, program: Program = None) -> FileResult:
+    result = FileResult(analyzer_name, input_path, output_path(options, analyzer_name, input_path))
+    start = time.perf_counter()
+    token = current_input.set(input_path)
+    try:
+        cache = analyzer.parse_cache if program is None else None
+        hits = cache.hits if cache is not None else 0
+        copybooks = analyzer.copybooks if program is None else None
+        if copybooks is not None:
+            included, parsed = copybooks.included, copybooks.parsed
+        if source is None and program is None and not analyzer.reads_source:
+            # Fixed-format members are parsed as their lines stream off the file
+            program = analyzer.fetch_member(input_path)
+            if program is None:
+                raise ValueError(f"{input_path} could not be parsed")
+            source = ''
+        elif source is None:
+            with profiling.span('read'):
+                source = read_source(input_path, options.fixed_format)
+        with profiling.span('document', analyzer=analyzer_name, file=input_path):
+            write_atomic(result.output_path, lambda f: analyzer.document(source, f, program))
+        if cache is not None:
+            result.parse_cache_hit = cache.hits > hits
+        if copybooks is not None:
+            result.copybook_includes = copybooks.included - included
+            result.copybooks_parsed = copybooks.parsed - parsed
+        if isinstance(analyzer, StaticAnalyzer):
+            doc = analyzer.result
+        else:
+            with open(result.output_path, encoding='utf-8') as f:
+                doc = DocumentationResult.from_text(analyzer_name, f.read())
+        _summarize(result, analyzer, options, doc)
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        current_input.reset(token)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+async def document_file_async(analyzer_name: str, analyzer: BaseAnalyzer, input_path: str, options: BatchOptions,
+                              source: str = None, program: Program = None) -> FileResult:
+    result = FileResult(analyzer_name, input_path, output_path(options, analyzer_name, input_path))
+    start = time.perf_counter()
+    token = current_input.set(input_path)
+    try:
+        if source is None:
+            with profiling.span('read'):
+                source = read_source(input_path, options.fixed_format)
+        buffer = io.StringIO()
+        with profiling.span('document', analyzer=analyzer_name, file=input_path):
+            await analyzer.document_async(source, buffer, program)
+        write_atomic(result.output_path, lambda f: f.write(buffer.getvalue()))
+        _summarize(result, analyzer, options, DocumentationResult.from_text(analyzer_name, buffer.getvalue()))
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        current_input.reset(token)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _summarize(result: FileResult, analyzer: BaseAnalyzer, options: BatchOptions, doc: DocumentationResult):
+    with profiling.span('write.results'):
+        write_atomic(result.output_path + RESULTS_SUFFIX, doc.write_jsonl)
+    program = getattr(analyzer, 'program', None)
+    if program is not None:
+        result.statements = sum(len(p.statements) for p in program.paragraphs)
+    # LLM analyzers serve many files concurrently, so their reuse is only totalled per run
+    reuse = getattr(analyzer, 'reuse', None)
+    if isinstance(analyzer, StaticAnalyzer) and reuse is not None:
+        result.reused, result.paragraphs = reuse.reused, reuse.total
+    if options.metrics:
+        with profiling.span('metrics'):
+            result.summary = DocumentationMetrics(doc, result.output_path).get_summary()
+
+
+@lru_cache(maxsize=None)
+def open_parse_cache(path: Optional[str], max_bytes: int) -> ParseCache:
+    """One connection per process, shared by every file it documents."""
+    return ParseCache(path, max_bytes)
+
+
+@lru_cache(maxsize=None)
+def open_copybooks(search_paths: Tuple[str, ...], fixed_format: bool,
+                   parse_cache: ParseCache = None) -> Optional[CopybookLibrary]:
+    """The process's copybook library; with a parse cache, copybooks parsed
+    by one worker or run are loaded from it by the others."""
+    return CopybookLibrary(search_paths, fixed_format, parse_cache) if search_paths else None
+
+
+def _static_worker(job: Tuple[str, BatchOptions]) -> FileResult:
+    input_path, options = job
+    # StaticAnalyzer accumulates state across document() calls
+    analyzer = StaticAnalyzer(options.manifest_dir, options.dataflow_cap, stream=True)
+    analyzer.fixed_format = options.fixed_format
+    if options.use_parse_cache:
+        analyzer.parse_cache = open_parse_cache(options.parse_cache, options.parse_cache_bytes)
+    analyzer.copybooks = open_copybooks(options.copybook_paths, options.fixed_format, analyzer.parse_cache)
+    return _document_worker('static', analyzer, input_path, options)
+
+
+def _document_worker(analyzer_name: str, analyzer: BaseAnalyzer, input_path: str, options: BatchOptions,
+                     source: str = None, program: Program = None) -> FileResult:
+    """document_file in a pool worker, sending its profile back with the result."""
+    if not options.profile:
+        return document_file(analyzer_name, analyzer, input_path, options, source, program)
+    profiler = profiling.enable()
+    result = document_file(analyzer_name, analyzer, input_path, options, source, program)
+    result.profile = profiler.drain()
+    return result
+
+
+def run_static(inputs: List[str], options: BatchOptions, workers: int = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterable[FileResult]:
+    jobs = [(path, options) for path in inputs]
+    if workers == 1:
+        yield from map(_static_worker, jobs)
+        return
+    # Forked workers start without the parent's profiler and its spans
+    with ProcessPoolExecutor(max_workers=workers, initializer=profiling.disable) as executor:
+        yield from executor.map(_static_worker, jobs, chunksize=chunk_size)
+
+
+@dataclass
+class FileRecord:
+    """Every analyzer's result for one input, from a single read and parse."""
+    input_path: str
+    results: Dict[str, FileResult] = field(default_factory=dict)
+    parse_seconds: float = 0.0
+    # Wall clock for the file, parse included
+    seconds: float = 0.0
+    error: Optional[str] = None
+    parse_cache_hit: Optional[bool] = None
+
+    @property
+    def analyzer_seconds(self) -> float:
+        """What the file would take with its analyzers run one after another."""
+        return self.parse_seconds + sum(result.seconds for result in self.results.values())
+
+
+class FilePipeline:
+    """Reads and parses each input once, then hands the same Program to every
+    analyzer at once: those with document_async() are awaited on the event
+    loop while the others (the static analyzer) run in a pool of worker
+    processes, or a thread when workers is 1. The Program is shared in its
+    compact form, whose statement tuples and data dicts analyzers cannot
+    change under each other. A member that fails to parse is reported once
+    for every analyzer, none of which runs on it.
+
+    analyzers maps names to factories, called once per file, so stateful
+    analyzers get a fresh instance and shared ones can return themselves;
+    those run in workers must pickle.
+    """
+
+    def __init__(self, analyzers: Dict[str, Callable[[], BaseAnalyzer]], options: BatchOptions,
+                 parse_cache: ParseCache = None, workers: int = None):
+        self.analyzers = analyzers
+        self.options = options
+        self.parse_cache = parse_cache
+        self.workers = workers
+        self.copybooks = open_copybooks(options.copybook_paths, options.fixed_format, parse_cache)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _parse(self, source: str) -> Tuple[Optional[Program], Optional[bool]]:
+        parse = self.parse_cache.parse if self.parse_cache is not None else get_parser().parse
+        parse = partial(parse, fixed_format=self.options.fixed_format)
+        hits = self.parse_cache.hits if self.parse_cache is not None else 0
+        program = self.copybooks.parse(source, parse) if self.copybooks is not None else parse(source)
+        return program, None if self.parse_cache is None else self.parse_cache.hits > hits
+
+    async def run(self, input_path: str) -> FileRecord:
+        with profiling.span('file', file=input_path):
+            return await self._run(input_path)
+
+    async def _run(self, input_path: str) -> FileRecord:
+        record = FileRecord(input_path)
+        start = time.perf_counter()
+        try:
+            with profiling.span('read'):
+                source = read_source(input_path, self.options.fixed_format)
+            program, record.parse_cache_hit = await asyncio.to_thread(self._parse, source)
+            if program is None:
+                raise ValueError(f"{input_path} could not be parsed")
+            program = compact_program(program)
+        except Exception as e:
+            record.error = str(e)
+            for name in self.analyzers:
+                record.results[name] = FileResult(name, input_path, output_path(self.options, name, input_path),
+                                                  error=record.error)
+            record.seconds = time.perf_counter() - start
+            return record
+        record.parse_seconds = time.perf_counter() - start
+
+        jobs = []
+        loop = asyncio.get_running_loop()
+        for name, factory in self.analyzers.items():
+            analyzer = factory()
+            text = source if analyzer.reads_source else ''
+            if hasattr(analyzer, 'document_async'):
+                jobs.append(document_file_async(name, analyzer, input_path, self.options, text, program))
+            elif self._executor is not None:
+                jobs.append(loop.run_in_executor(self._executor, _document_worker, name, analyzer, input_path,
+                                                 self.options, text, program))
+            else:
+                jobs.append(asyncio.to_thread(document_file, name, analyzer, input_path, self.options, text, program))
+        statements = sum(len(p.statements) for p in program.paragraphs)
+        for name, result in zip(self.analyzers, await asyncio.gather(*jobs)):
+            result.parse_cache_hit = record.parse_cache_hit
+            result.statements = result.statements or statements
+            record.results[name] = result
+        record.seconds = time.perf_counter() - start
+        return record
+
+    def run_all(self, inputs: List[str], files_in_flight: int = FILES_IN_FLIGHT) -> List[FileRecord]:
+        """Run every input, at most files_in_flight of them held in memory at once."""
+        async def run_all():
+            slots = asyncio.Semaphore(files_in_flight)
+
+            async def run_one(path: str) -> FileRecord:
+                async with slots:
+                    return await self.run(path)
+            return await asyncio.gather(*(run_one(path) for path in inputs))
+        if self.workers == 1:
+            return asyncio.run(run_all())
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=profiling.disable) as self._executor:
+            try:
+                return asyncio.run(run_all())
+            finally:
+                self._executor = None
+
+
+@dataclass
+class Throughput:
+    files: int = 0
+    failures: int = 0
+    statements: int = 0
+    seconds: float = 0.0
+    reuse: ReuseStats = field(default_factory=ReuseStats)
+    parse_hits: int = 0
+    parse_misses: int = 0
+    copybook_includes: int = 0
+    copybooks_parsed: int = 0
+
+    def add(self, result: FileResult):
+        self.files += 1
+        self.statements += result.statements
+        self.reuse.add(result.reused, result.paragraphs)
+        if result.parse_cache_hit is not None:
+            self.parse_hits += result.parse_cache_hit
+            self.parse_misses += not result.parse_cache_hit
+        self.copybook_includes += result.copybook_includes
+        self.copybooks_parsed += result.copybooks_parsed
+        if result.error is not None:
+            self.failures += 1
+
+    def add_run(self, other: 'Throughput'):
+        self.files += other.files
+        self.failures += other.failures
+        self.statements += other.statements
+        self.seconds += other.seconds
+        self.reuse.add(other.reuse.reused, other.reuse.total)
+        self.parse_hits += other.parse_hits
+        self.parse_misses += other.parse_misses
+        self.copybook_includes += other.copybook_includes
+        self.copybooks_parsed += other.copybooks_parsed
+
+    def report(self, label: str) -> str:
+        elapsed = self.seconds or float('inf')
+        report = (f"{label}: {self.files} files ({self.failures} failed) in {self.seconds:.2f}s, "
+                  f"{self.files / elapsed:.1f} files/sec, {self.statements / elapsed:.1f} statements/sec")
+        if self.reuse.total:
+            report += f", {self.reuse}"
+        if self.parse_hits + self.parse_misses:
+            report += f", {self.parse_hits} of {self.parse_hits + self.parse_misses} parses cached"
+        return report
@@ -0,0 +1,23 @@
+import glob
+import os
+
+from benchmarks.generate import generate_program
+from common.llm import StubModel, LLMClient
+from common.parser import get_parser
+from common.util import read_file
+from llm_ast_analyzer import AST_ENCODINGS, LLMAstAnalyzer
+
+INPUT_GLOB = '../resources/input/*.cbl'
+
+if __name__ == '__main__':
+    analyzer = LLMAstAnalyzer(LLMClient(StubModel()))
+    programs = {os.path.basename(path): read_file(path) for path in sorted(glob.glob(INPUT_GLOB))}
+    programs.update({f'generated-{n}': generate_program(n) for n in (100, 1000)})
+
+    header = ''.join(f"{name + ' tokens':>20}" for name in AST_ENCODINGS)
+    print(f"{'program':<22}{header}{'compact saving':>16}")
+    for name, code in programs.items():
+        sizes = analyzer.prompt_sizes(get_parser().parse(code))
+        row = ''.join(f"{sizes[e][1]:>20,}" for e in AST_ENCODINGS)
+        saving = 1 - sizes['compact'][1] / sizes['json'][1]
+        print(f"{name:<22}{row}{saving:>16.0%}")
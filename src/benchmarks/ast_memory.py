@@ -0,0 +1,41 @@
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generate import generate_program
+from common.compact import compact_program
+from common.parser import get_parser
+
+# A corpus of members of STATEMENTS statements each, held in memory at once
+MEMBERS = 50
+STATEMENTS = 2_000
+
+
+def retained(codes, convert):
+    """Traced bytes still held once every member is parsed (and converted)."""
+    parser = get_parser()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    programs = [convert(parser.parse(code)) for code in codes]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del programs
+    return size / 2 ** 20, elapsed
+
+
+if __name__ == '__main__':
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else MEMBERS
+    codes = [generate_program(STATEMENTS, name=f'MEMBER{i}') for i in range(members)]
+    source_mb = sum(len(code) for code in codes) / 2 ** 20
+    get_parser()
+
+    dataclass_mb, dataclass_s = retained(codes, lambda program: program)
+    compact_mb, compact_s = retained(codes, compact_program)
+    print(f"{members} members, {source_mb:.1f} MB of source")
+    print(f"{'layout':<12}{'MB':>8}{'x source':>10}{'parse s':>10}")
+    print(f"{'dataclass':<12}{dataclass_mb:>8.1f}{dataclass_mb / source_mb:>10.1f}{dataclass_s:>10.2f}")
+    print(f"{'compact':<12}{compact_mb:>8.1f}{compact_mb / source_mb:>10.1f}{compact_s:>10.2f}")
@@ -0,0 +1,51 @@
+import io
+import sys
+import time
+
+from benchmarks.generate import INDENT, STATEMENT_INDENT, generate_program
+from common.callgraph import CallGraph
+from common.parser import get_parser
+from static_analyzer import StaticAnalyzer
+
+# Paragraphs of 8 statements, each performing the next, so the PERFORM
+# chain is as deep as the program is long
+PARAGRAPHS = [1_000, 5_000, 20_000]
+
+
+def chained_program(paragraphs: int) -> str:
+    """Generated chain plus a paragraph nothing reaches that performs itself."""
+    return (generate_program(paragraphs * 8, paragraph_size=8)
+            + f'{INDENT}ORPHAN.\n{STATEMENT_INDENT}PERFORM ORPHAN.\n')
+
+
+def measure(paragraphs: int):
+    code = chained_program(paragraphs)
+    program = get_parser().parse(code)
+
+    start = time.perf_counter()
+    graph = CallGraph(program)
+    built = time.perf_counter()
+    cycles = graph.cycles()
+    unreachable = graph.unreachable()
+    depth = max(depth for depth, _, _ in graph.walk())
+    traversed = time.perf_counter()
+
+    assert unreachable == ['ORPHAN'] and cycles == [['ORPHAN']], (unreachable, cycles)
+    assert depth == paragraphs - 1, depth
+
+    out = io.StringIO()
+    StaticAnalyzer().document(code, out)
+    documented = time.perf_counter()
+    text = out.getvalue()
+    assert 'Unreachable Procedures: ORPHAN' in text
+    return {'depth': depth, 'build': built - start, 'traverse': traversed - built,
+            'document': documented - traversed, 'output': len(text) / 2 ** 20}
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or PARAGRAPHS
+    print(f"{'paragraphs':>11}{'depth':>8}{'build s':>10}{'graph s':>10}{'document s':>12}{'output MB':>11}")
+    for paragraphs in sizes:
+        r = measure(paragraphs)
+        print(f"{paragraphs:>11}{r['depth']:>8}{r['build']:>10.3f}{r['traverse']:>10.3f}"
+              f"{r['document']:>12.3f}{r['output']:>11.2f}")
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generate import INDENT, generate_program
+from common import profiling
+from common.copybook import CopybookLibrary, apply_replacing
+from common.parser import get_parser
+
+PROGRAMS = 200
+STATEMENTS = 50
+# Every program includes INCLUDES of the COPYBOOKS shared record layouts
+COPYBOOKS = 10
+INCLUDES = 5
+ENTRIES = 40
+WORKING_STORAGE = 'WORKING-STORAGE SECTION.'
+
+
+def copybook(index: int) -> str:
+    return ''.join(f'{INDENT}01 :PFX:-FIELD-{index}-{i} PIC X(10) VALUE "{i}".\n' for i in range(ENTRIES))
+
+
+def programs(count: int):
+    """Each program with its COPY statements, and the same program with the
+    copybooks pasted in, as if expanded by hand."""
+    for n in range(count):
+        code = generate_program(STATEMENTS, name=f'MEMBER{n}')
+        books = [(n + k) % COPYBOOKS for k in range(INCLUDES)]
+        copies = ''.join(f'{INDENT}COPY BOOK{b} REPLACING ==:PFX:== BY ==WS==.\n' for b in books)
+        pasted = ''.join(apply_replacing(copybook(b), ((':PFX:', 'WS'),)) for b in books)
+        yield (code.replace(WORKING_STORAGE, WORKING_STORAGE + '\n' + copies.rstrip('\n'), 1),
+               code.replace(WORKING_STORAGE, WORKING_STORAGE + '\n' + pasted.rstrip('\n'), 1))
+
+
+def measure(parse_all):
+    profiler = profiling.enable()
+    start = time.perf_counter()
+    parsed = parse_all()
+    elapsed = time.perf_counter() - start
+    tokens = profiler.drain().counters['tokens lexed']
+    profiling.disable()
+    return parsed, elapsed, tokens
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PROGRAMS
+    sources = list(programs(count))
+    parser = get_parser()
+    with tempfile.TemporaryDirectory() as directory:
+        for b in range(COPYBOOKS):
+            with open(os.path.join(directory, f'BOOK{b}.cpy'), 'w') as f:
+                f.write(copybook(b))
+        library = CopybookLibrary([directory])
+        expanded, copy_s, copy_tokens = measure(lambda: [library.parse(code) for code, _ in sources])
+        inline, inline_s, inline_tokens = measure(lambda: [parser.parse(code) for _, code in sources])
+
+    assert [p.variables for p in expanded] == [p.variables for p in inline], 'expansion differs from pasted copybooks'
+    print(f"{count} programs x {INCLUDES} COPY statements of {COPYBOOKS} copybooks ({ENTRIES} entries each)")
+    print(f"{'':<18}{'seconds':>10}{'tokens lexed':>15}")
+    print(f"{'pasted in':<18}{inline_s:>10.3f}{inline_tokens:>15,}")
+    print(f"{'copybook cache':<18}{copy_s:>10.3f}{copy_tokens:>15,}  {library.stats()}")
@@ -0,0 +1,82 @@
+import io
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.generate import generate_program
+from static_analyzer import StaticAnalyzer
+
+# Paragraphs of 10 statements sharing 8 hot variables, so every variable
+# is written and read by nearly every paragraph
+PARAGRAPHS = [100, 200, 400]
+HOT_VARIABLES = 8
+CAP = 1000
+MODES = ['triples', 'links', 'capped']
+
+
+class Triples(dict):
+    """A dict per (writer, reader, variable), answering the DataflowLinks
+    queries of the analyzer's result by scanning every triple."""
+
+    def variables(self):
+        return list(dict.fromkeys(variable for _, _, variable in self))
+
+    def writers(self, variable):
+        return {writer for writer, _, var in self if var == variable}
+
+    def readers(self, variable):
+        return {reader for _, reader, var in self if var == variable}
+
+    def pair_count(self, variable):
+        return sum(var == variable for _, _, var in self)
+
+
+class TripleAnalyzer(StaticAnalyzer):
+    """Materializes a dict per (writer, reader, variable), as before DataflowLinks."""
+
+    def _analyze_dataflow_links(self):
+        self.dataflow = Triples()
+        for var_name in self.var_usage:
+            for writer in self.var_usage[var_name]['writes']:
+                for reader in self.var_usage[var_name]['reads']:
+                    if writer != reader:
+                        self.dataflow[(writer, reader, var_name)] = {'from': writer, 'to': reader, 'variable': var_name}
+
+    def _generate_data_linkage(self):
+        lines = ["\nDATA LINKAGE ANALYSIS", "=" * 80, "\nShowing how data flows between procedures:", ""]
+        var_flows = {}
+        for flow in self.dataflow.values():
+            var_flows.setdefault(flow['variable'], []).append((flow['from'], flow['to']))
+        for var, flows in sorted(var_flows.items()):
+            lines += [f"\n{var}:", f"  Purpose: {self.var_usage[var]['purpose']}", "  Data Flow:"]
+            lines += [f"    {a} --->[writes]---> {var} ----[reads]----> {b}" for a, b in flows]
+        return lines
+
+
+def measure(mode: str, paragraphs: int):
+    code = generate_program(paragraphs * 10, HOT_VARIABLES, paragraph_size=10)
+    analyzer = {'triples': lambda: TripleAnalyzer(),
+                'links': lambda: StaticAnalyzer(),
+                'capped': lambda: StaticAnalyzer(dataflow_cap=CAP)}[mode]()
+    start = time.perf_counter()
+    analyzer.document(code, io.StringIO())
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed:.3f} {peak_mb:.1f} {len(analyzer.dataflow)}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], int(sys.argv[2]))
+        sys.exit(0)
+    # A process per measurement, as peak RSS only ever grows
+    print(f"{'paragraphs':>10}{'links':>10}" + ''.join(f"{mode + ' MB':>14}{'s':>8}" for mode in MODES))
+    for paragraphs in PARAGRAPHS:
+        row, links = '', 0
+        for mode in MODES:
+            out = subprocess.run([sys.executable, '-m', 'benchmarks.dataflow_memory', mode, str(paragraphs)],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            elapsed, peak, links = float(out[0]), float(out[1]), int(out[2])
+            row += f"{peak:>14.1f}{elapsed:>8.2f}"
+        print(f"{paragraphs:>10}{links:>10}{row}")
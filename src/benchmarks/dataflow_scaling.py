@@ -0,0 +1,47 @@
+import sys
+import time
+
+from benchmarks.generate import generate_program
+from common.dataflow import DataflowEngine, DataflowLinks
+from common.parser import get_parser
+from static_analyzer import StaticAnalyzer
+
+# (statements, variables), paragraphs of 20 statements
+SIZES = [(10_000, 2_000), (50_000, 10_000), (100_000, 30_000)]
+
+
+def measure(statements: int, variables: int):
+    program = get_parser().parse(generate_program(statements, variables, paragraph_size=20))
+    analyzer = StaticAnalyzer()
+    analyzer.program = program
+    analyzer._init_variables()
+    analyzer._analyze_procedures()
+    analyzer._build_call_graph()
+
+    start = time.perf_counter()
+    engine = DataflowEngine(program, analyzer.graph)
+    solved = time.perf_counter()
+    links = DataflowLinks(para.name for para in program.paragraphs)
+    for var_name, reader, writers in engine.reaching_links():
+        links.add(var_name, reader, writers)
+    unused = engine.unused_definitions()
+    done = time.perf_counter()
+
+    precise = len(links)
+    product = 0
+    for usage in analyzer.var_usage.values():
+        writers, readers = usage['writes'], usage['reads']
+        product += len(writers) * len(readers) - len(writers & readers)
+    return {'paragraphs': len(program.paragraphs), 'definitions': len(engine.definitions),
+            'solve': solved - start, 'query': done - solved,
+            'precise': precise, 'product': product, 'unused': len(unused)}
+
+
+if __name__ == '__main__':
+    sizes = [tuple(map(int, arg.split(':'))) for arg in sys.argv[1:]] or SIZES
+    print(f"{'statements':>11}{'variables':>10}{'paragraphs':>11}{'defs':>8}{'solve s':>9}{'query s':>9}"
+          f"{'links':>9}{'w x r':>10}{'unused':>8}")
+    for statements, variables in sizes:
+        r = measure(statements, variables)
+        print(f"{statements:>11}{variables:>10}{r['paragraphs']:>11}{r['definitions']:>8}{r['solve']:>9.3f}"
+              f"{r['query']:>9.3f}{r['precise']:>9}{r['product']:>10}{r['unused']:>8}")
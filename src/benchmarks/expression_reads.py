@@ -0,0 +1,59 @@
+import re
+import sys
+import time
+
+from benchmarks.generate import generate_program
+from common.ast_encoding import walk_statements
+from common.expression import complexity
+from common.parser import get_parser
+from static_analyzer import StaticAnalyzer
+
+STATEMENTS = 200_000
+ROUNDS = 5
+
+
+class ScanningAnalyzer(StaticAnalyzer):
+    """Expression and condition reads found by regex on every visit, as before expression trees."""
+
+    def _analyze_statement(self, stmt, para_name: str):
+        if stmt.type == 'COMPUTE':
+            self._record_write(stmt.data['target'], para_name)
+            for var in re.findall(r'[A-Za-z][A-Za-z0-9\-]*', stmt.data['expression']):
+                self._record_read(var, para_name)
+        elif stmt.type == 'IF':
+            for var in re.findall(r'[A-Za-z][A-Za-z0-9\-]*', stmt.data['condition']):
+                self._record_read(var, para_name)
+            for s in stmt.data.get('then', []):
+                self._analyze_statement(s, para_name)
+            for s in stmt.data.get('else', []):
+                self._analyze_statement(s, para_name)
+        else:
+            super()._analyze_statement(stmt, para_name)
+
+
+def usage_time(analyzer_class, program):
+    best = float('inf')
+    for _ in range(ROUNDS):
+        analyzer = analyzer_class()
+        analyzer.program = program
+        analyzer._init_variables()
+        start = time.perf_counter()
+        analyzer._analyze_procedures()
+        best = min(best, time.perf_counter() - start)
+    return best, analyzer.var_usage
+
+
+if __name__ == '__main__':
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else STATEMENTS
+    program = get_parser().parse(generate_program(statements))
+    scan, expected = usage_time(ScanningAnalyzer, program)
+    trees, usage = usage_time(StaticAnalyzer, program)
+    assert usage == expected, 'precomputed reads differ from the scanned ones'
+
+    measures = [complexity(value.tree) for para in program.paragraphs for stmt in walk_statements(para.statements)
+                for value in (stmt.data.get('expression'), stmt.data.get('condition'))
+                if getattr(value, 'tree', None) is not None]
+    print(f"{statements} statements, {len(measures)} expressions, "
+          f"max depth {max(depth for _, depth in measures)}")
+    print(f"regex scan   {scan:.3f}s")
+    print(f"trees        {trees:.3f}s  {scan / trees:.2f}x")
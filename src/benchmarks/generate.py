@@ -0,0 +1,72 @@
+from typing import List
+
+INDENT = ' ' * 7
+STATEMENT_INDENT = ' ' * 11
+
+
+def generate_program(statements: int, variables: int = None, paragraph_size: int = 50, name: str = 'GENERATED') -> str:
+    """Synthetic COBOL member exercising every statement form the grammar accepts."""
+    variables = variables or max(4, statements // 10)
+    paragraphs = max(1, statements // paragraph_size)
+    names = [f'VAR-{i}' for i in range(variables)]
+
+    lines: List[str] = [
+        f'{INDENT}IDENTIFICATION DIVISION.',
+        f'{INDENT}PROGRAM-ID. {name}.',
+        '',
+        f'{INDENT}DATA DIVISION.',
+        f'{INDENT}WORKING-STORAGE SECTION.',
+    ]
+    for i, var in enumerate(names):
+        lines.append(f'{INDENT}01 {var} PIC 9(5)V99 VALUE {i}.')
+
+    lines += ['', f'{INDENT}PROCEDURE DIVISION.']
+    emitted = 0
+    for p in range(paragraphs):
+        lines.append(f'{INDENT}PARA-{p}.')
+        count = paragraph_size if p < paragraphs - 1 else statements - emitted
+        for s in range(count):
+            k = emitted + s
+            a, b, c = names[k % variables], names[(k * 7 + 1) % variables], names[(k * 13 + 2) % variables]
+            kind = k % 8
+            if kind == 0:
+                lines.append(f'{STATEMENT_INDENT}MOVE {a} TO {b}.')
+            elif kind == 1:
+                lines.append(f'{STATEMENT_INDENT}ADD {a} TO {b} GIVING {c}.')
+            elif kind == 2:
+                lines.append(f'{STATEMENT_INDENT}SUBTRACT {k} FROM {a} GIVING {b}.')
+            elif kind == 3:
+                lines.append(f'{STATEMENT_INDENT}MULTIPLY {a} BY {b} GIVING {c}.')
+            elif kind == 4:
+                lines.append(f'{STATEMENT_INDENT}COMPUTE {a} = {b} + {c} - {k}.')
+            elif kind == 5 and p + 1 < paragraphs:
+                lines.append(f'{STATEMENT_INDENT}PERFORM PARA-{p + 1}.')
+            elif kind == 6:
+                lines.append(f'{STATEMENT_INDENT}IF {a} > {b} THEN')
+                lines.append(f'{STATEMENT_INDENT}    SUBTRACT {b} FROM {c} GIVING {a}')
+                lines.append(f'{STATEMENT_INDENT}ELSE')
+                lines.append(f'{STATEMENT_INDENT}    COMPUTE {c} = {b} + 1')
+                lines.append(f'{STATEMENT_INDENT}END-IF.')
+            else:
+                lines.append(f'{STATEMENT_INDENT}DISPLAY "{a}".')
+        emitted += count
+        lines.append('')
+    lines.append(f'{STATEMENT_INDENT}STOP RUN.')
+    return '\n'.join(lines) + '\n'
+
+
+def to_fixed_format(code: str) -> str:
+    """Lay free-format generator output out in fixed columns: sequence
+    number, indicator, code area and identification area, with a
+    comment line ahead of every paragraph."""
+    lines = []
+    for line in code.splitlines():
+        body = line[7:]
+        if body and not body.startswith(' ') and not body.startswith('01'):
+            lines.append(f'{len(lines) + 1:06d}* {body}')
+        lines.append(f'{len(lines) + 1:06d} {body:<65}GENERATD')
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    print(generate_program(40, paragraph_size=10))
@@ -0,0 +1,52 @@
+import asyncio
+import io
+import tempfile
+import time
+
+from benchmarks.generate import generate_program
+from common.llm import LLMClient, StubModel
+from llm_ast_analyzer import LLMAstAnalyzer
+from static_analyzer import StaticAnalyzer
+
+STATEMENTS = 20000
+TOKEN_BUDGET = 4000
+
+
+def edit_paragraph(code: str, index: int) -> str:
+    header = f'PARA-{index}.\n'
+    return code.replace(header, header + '           DISPLAY "EDITED".\n', 1)
+
+
+def run_static(code: str, manifest_dir: str = None):
+    analyzer = StaticAnalyzer(manifest_dir)
+    start = time.perf_counter()
+    output = analyzer.document(code, io.StringIO())
+    return time.perf_counter() - start, output, analyzer.reuse
+
+
+def run_llm(code: str, manifest_dir: str):
+    model = StubModel(latency=0.02)
+    analyzer = LLMAstAnalyzer(LLMClient(model, max_concurrency=16), encoding='compact',
+                              chunk_tokens=TOKEN_BUDGET, manifest_dir=manifest_dir)
+    start = time.perf_counter()
+    asyncio.run(analyzer.document_async(code, io.StringIO()))
+    return time.perf_counter() - start, model.calls, analyzer.reuse
+
+
+if __name__ == '__main__':
+    code = generate_program(STATEMENTS)
+    edited = edit_paragraph(code, STATEMENTS // 100)
+
+    with tempfile.TemporaryDirectory() as manifest_dir:
+        print(f"static analyzer, {STATEMENTS} statements")
+        for label, source in [('first run', code), ('unchanged', code), ('one paragraph edited', edited)]:
+            seconds, output, reuse = run_static(source, manifest_dir)
+            _, expected, _ = run_static(source)
+            assert output == expected, f"{label}: incremental output differs from a full run"
+            print(f"  {label:<22}{seconds:>8.3f}s  {reuse}")
+
+    with tempfile.TemporaryDirectory() as manifest_dir:
+        print(f"llm_ast chunked map-reduce, budget {TOKEN_BUDGET} tokens")
+        for label, source in [('first run', code), ('unchanged', code), ('one paragraph edited', edited)]:
+            seconds, calls, reuse = run_llm(source, manifest_dir)
+            print(f"  {label:<22}{seconds:>8.3f}s  {calls:>4} model calls  {reuse}")
@@ -0,0 +1,21 @@
+import time
+
+from benchmarks.generate import generate_program
+from common.lexer import LEXER_ENGINES
+
+BENCH_STATEMENTS = 50_000
+
+
+def tokens_per_second(engine: str, code: str) -> float:
+    lexer = LEXER_ENGINES[engine]().build()
+    start = time.perf_counter()
+    lexer.input(code)
+    count = sum(1 for _ in iter(lexer.token, None))
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    # That scan yields ply's tokens is checked by tests/test_lexer.py
+    code = generate_program(BENCH_STATEMENTS)
+    for engine in LEXER_ENGINES:
+        print(f"{engine:>5}: {tokens_per_second(engine, code):>12,.0f} tokens/sec")
@@ -0,0 +1,36 @@
+import asyncio
+import io
+import time
+
+from benchmarks.generate import generate_program
+from common.llm import LLMClient, StubModel
+from llm_analyzer import LLMAnalyzer
+from llm_ast_analyzer import LLMAstAnalyzer
+
+SIZES = [100, 500, 2000, 5000]
+TOKEN_BUDGET = 4000
+LATENCY = 0.05
+SECONDS_PER_TOKEN = 0.00005
+
+
+def run(make_analyzer, code: str, chunk_tokens: int = None):
+    model = StubModel(latency=LATENCY, seconds_per_token=SECONDS_PER_TOKEN)
+    analyzer = make_analyzer(LLMClient(model, max_concurrency=16), chunk_tokens)
+    start = time.perf_counter()
+    asyncio.run(analyzer.document_async(code, io.StringIO()))
+    return time.perf_counter() - start, model.calls
+
+
+if __name__ == '__main__':
+    analyzers = {
+        'llm': lambda client, budget: LLMAnalyzer(client, chunk_tokens=budget),
+        'llm_ast': lambda client, budget: LLMAstAnalyzer(client, encoding='compact', chunk_tokens=budget),
+    }
+    print(f"stub latency {LATENCY * 1000:.0f} ms + {SECONDS_PER_TOKEN * 1e6:.0f} us/token, budget {TOKEN_BUDGET} tokens")
+    print(f"{'analyzer':<10}{'statements':>12}{'single s':>12}{'chunked s':>12}{'calls':>8}")
+    for name, make in analyzers.items():
+        for size in SIZES:
+            code = generate_program(size)
+            single, _ = run(make, code)
+            chunked, calls = run(make, code, TOKEN_BUDGET)
+            print(f"{name:<10}{size:>12}{single:>12.3f}{chunked:>12.3f}{calls:>8}")
@@ -0,0 +1,38 @@
+import asyncio
+import io
+import time
+
+from benchmarks.generate import generate_program
+from common.llm import LLMClient, RetryPolicy, StubModel
+from llm_analyzer import LLMAnalyzer
+
+REQUESTS = 64
+LATENCY = 0.05
+ERROR_RATE = 0.1
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+
+
+async def document_all(analyzer: LLMAnalyzer, sources):
+    return await asyncio.gather(*(analyzer.document_async(code, io.StringIO()) for code in sources))
+
+
+def run(concurrency: int, sources) -> float:
+    model = StubModel(latency=LATENCY, error_rate=ERROR_RATE, seed=concurrency)
+    retry = RetryPolicy(max_retries=10, base_delay=LATENCY / 10, max_delay=LATENCY)
+    analyzer = LLMAnalyzer(LLMClient(model, max_concurrency=concurrency, retry=retry))
+    start = time.perf_counter()
+    results = asyncio.run(document_all(analyzer, sources))
+    elapsed = time.perf_counter() - start
+    assert len(results) == len(sources) and all(results)
+    return elapsed
+
+
+if __name__ == '__main__':
+    sources = [generate_program(50, name=f'GEN-{i}') for i in range(REQUESTS)]
+    print(f"{REQUESTS} requests, {LATENCY * 1000:.0f} ms stub latency, {ERROR_RATE:.0%} transient errors")
+    print(f"{'concurrency':>12} {'seconds':>10} {'speedup':>10}")
+    baseline = None
+    for level in CONCURRENCY_LEVELS:
+        elapsed = run(level, sources)
+        baseline = baseline or elapsed
+        print(f"{level:>12} {elapsed:>10.3f} {baseline / elapsed:>9.1f}x")
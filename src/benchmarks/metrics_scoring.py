@@ -0,0 +1,78 @@
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from batch import BatchOptions, expand_inputs, run_static
+from benchmarks.generate import generate_program
+from common.results import RESULTS_SUFFIX
+from metrics import MetricsTable, expand_outputs, score_outputs
+
+FILES = 200
+STATEMENTS = 2_000
+
+
+class LegacyMetrics:
+    """Regex scraping of the whole text, every score computed twice, as before the results sidecar."""
+
+    def __init__(self, path: str):
+        with open(path, encoding='utf-8') as f:
+            self.content = f.read()
+        self.procedures = set(re.findall(r'PROCEDURE:\s+(\S+)', self.content))
+        self.variables = set(re.findall(r'01\s+(\S+)', self.content))
+        self.statements = sum(int(x) for x in re.findall(r'Statements\s+\((\d+)\s+total\)', self.content))
+        self.purposes = [p.strip() for p in re.findall(r'Purpose:\s+(.+?)(?:\n|$)', self.content)]
+        self.flows = re.findall(r'(\w+)\s+---?\[(?:writes|reads)\]---?>\s+(\w+)', self.content)
+        self.calls = re.findall(r'Calls:\s+(.+?)(?:\n|$)', self.content)
+
+    def readability(self):
+        keywords = ['perform', 'calculate', 'display', 'initialize', 'execute', 'control']
+        return sum(1 for kw in keywords if kw in self.content.lower())
+
+    def scores(self):
+        return [self.readability() + len(self.purposes) + len(self.flows) for _ in range(2)]
+
+
+def write_corpus(directory: str):
+    sources = os.path.join(directory, 'src')
+    os.makedirs(sources)
+    for i in range(FILES):
+        with open(os.path.join(sources, f'member{i}.cbl'), 'w') as f:
+            f.write(generate_program(STATEMENTS + i * 10, name=f'MEMBER{i}'))
+    outputs = os.path.join(directory, 'out')
+    os.makedirs(outputs)
+    list(run_static(expand_inputs([sources]), BatchOptions(outputs, metrics=False)))
+    return outputs
+
+
+def timed(label: str, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"{label:<28}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        outputs = write_corpus(directory)
+        paths = expand_outputs([outputs])
+        text_only = os.path.join(directory, 'text')
+        shutil.copytree(outputs, text_only, ignore=shutil.ignore_patterns('*' + RESULTS_SUFFIX))
+        text_paths = expand_outputs([text_only])
+        megabytes = sum(os.path.getsize(path) for path in paths) / 2 ** 20
+        print(f"{len(paths)} outputs, {megabytes:.1f} MB of text")
+
+        timed('regex scraping', lambda: [LegacyMetrics(path).scores() for path in paths])
+        timed('text, one pass', lambda: score_outputs(text_paths, workers=1))
+        timed(f'text, {workers} workers', lambda: score_outputs(text_paths, workers=workers))
+        sidecar = timed('sidecar', lambda: score_outputs(paths, workers=1))
+        parallel = timed(f'sidecar, {workers} workers', lambda: score_outputs(paths, workers=workers))
+        assert list(parallel.columns['overall']) == list(sidecar.columns['overall'])
+
+        table = MetricsTable()
+        for i in range(100_000):
+            table.add(str(i), ('static', 'llm', 'llm_ast')[i % 3], [float(i % 101)] * 7)
+        timed('aggregate of 100000 rows', table.aggregate)
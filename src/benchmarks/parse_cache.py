@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generate import generate_program
+from common import parse_cache
+from common.parse_cache import ParseCache, hit_rate_report
+from common.parser import get_parser
+
+MEMBERS = 40
+STATEMENTS = 2_000
+
+
+class CountingParser:
+    """Counts the parses the cache falls through to."""
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.calls = 0
+
+    def parse(self, source, fixed_format=False):
+        self.calls += 1
+        return self.parser.parse(source, fixed_format)
+
+
+def run(path, codes):
+    cache = ParseCache(path)
+    start = time.perf_counter()
+    programs = [cache.parse(code) for code in codes]
+    elapsed = time.perf_counter() - start
+    cache.close()
+    return programs, elapsed, cache.hits, cache.misses
+
+
+if __name__ == '__main__':
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else MEMBERS
+    codes = [generate_program(STATEMENTS, name=f'MEMBER{i}') for i in range(members)]
+    counter = CountingParser(get_parser())
+    parse_cache.get_parser = lambda: counter
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'parsed.sqlite3')
+        cold, cold_s, *cold_stats = run(path, codes)
+        cold_parses = counter.calls
+        warm, warm_s, *warm_stats = run(path, codes)
+        assert warm == cold, 'cached ASTs differ from fresh parses'
+        print(f"{members} members of {STATEMENTS} statements, {os.path.getsize(path) / 2 ** 20:.1f} MB cached")
+        print(f"cold  {cold_s:.2f}s  {cold_parses} parses  {hit_rate_report(*cold_stats)}")
+        print(f"warm  {warm_s:.2f}s  {counter.calls - cold_parses} parses  {hit_rate_report(*warm_stats)}  "
+              f"{cold_s / warm_s:.1f}x")
@@ -0,0 +1,42 @@
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.generate import generate_program
+from common.parser import ParserPool, get_parser, parse_source
+from common.util import read_file
+
+INPUT_GLOB = '../resources/input/*.cbl'
+COPIES = 20
+# Fixed rather than the CPU count, so the pool contends for the GIL even on one core
+THREADS = 8
+
+
+def corpus():
+    sources = [read_file(path) for path in sorted(glob.glob(INPUT_GLOB))]
+    sources += [generate_program(100 + i * 37, name=f'GEN-{i}') for i in range(10)]
+    return sources * COPIES
+
+
+if __name__ == '__main__':
+    sources = corpus()
+
+    start = time.perf_counter()
+    serial = [get_parser().parse(code) for code in sources]
+    serial_time = time.perf_counter() - start
+
+    pool = ParserPool(THREADS)
+    start = time.perf_counter()
+    threaded = pool.parse_all(sources)
+    threaded_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=pool.size) as executor:
+        processed = list(executor.map(parse_source, sources, chunksize=16))
+    process_time = time.perf_counter() - start
+
+    # That the pools build the serial ASTs is checked by tests/test_parser.py
+    print(f"{len(sources)} members, pool size {pool.size}")
+    print(f"Serial:       {serial_time:8.3f} s")
+    print(f"Thread pool:  {threaded_time:8.3f} s")
+    print(f"Process pool: {process_time:8.3f} s")
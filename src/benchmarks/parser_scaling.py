@@ -0,0 +1,28 @@
+import sys
+import time
+
+from benchmarks.generate import generate_program
+from common.parser import get_parser
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def parse_time(statements: int) -> float:
+    code = generate_program(statements, paragraph_size=statements // 10)
+    start = time.perf_counter()
+    program = get_parser().parse(code)
+    elapsed = time.perf_counter() - start
+    assert program is not None, f'generated program of {statements} statements failed to parse'
+    return elapsed
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    get_parser()
+    baseline = None
+    print(f"{'statements':>12} {'seconds':>10} {'us/stmt':>10} {'vs first':>10}")
+    for size in sizes:
+        elapsed = parse_time(size)
+        per_stmt = elapsed / size
+        baseline = baseline or per_stmt
+        print(f"{size:>12} {elapsed:>10.3f} {per_stmt * 1e6:>10.2f} {per_stmt / baseline:>9.2f}x")
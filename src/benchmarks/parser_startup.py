@@ -0,0 +1,35 @@
+import tempfile
+import time
+
+from common.parser import Parser, get_parser
+from common.util import read_file
+
+SAMPLE_PATH = '../resources/input/payroll.cbl'
+RUNS = 20
+
+
+def cold_parse(code: str):
+    parser = Parser()
+    parser.build(debug=False, write_tables=False)
+    return parser.parse(code)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    code = read_file(SAMPLE_PATH)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        table_build = timed(get_parser, cache_dir)
+        get_parser.cache_clear()
+        table_load = timed(get_parser, cache_dir)
+        cold = sum(timed(cold_parse, code) for _ in range(RUNS)) / RUNS
+        warm = sum(timed(get_parser(cache_dir).parse, code) for _ in range(RUNS)) / RUNS
+    print(f"Table build (empty cache):  {table_build * 1000:8.2f} ms")
+    print(f"Table load (cached pickle): {table_load * 1000:8.2f} ms")
+    print(f"Cold parse (new Parser):    {cold * 1000:8.2f} ms")
+    print(f"Warm parse (shared Parser): {warm * 1000:8.2f} ms")
+    print(f"Speedup:                    {cold / warm:8.1f}x")
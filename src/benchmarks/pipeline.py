@@ -0,0 +1,95 @@
+import asyncio
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+from batch import BatchOptions, FilePipeline, document_file_async, run_static
+from benchmarks.generate import generate_program
+from common.llm import LLMClient, StubModel
+from common.parser import Parser
+from llm_analyzer import LLMAnalyzer
+from llm_ast_analyzer import LLMAstAnalyzer
+from static_analyzer import StaticAnalyzer
+
+MEMBERS = 8
+STATEMENTS = 2_000
+# Roughly what the static analyzer spends on a member of this size
+LATENCY = 0.5
+
+parses = 0
+parse = Parser.parse
+
+
+def counting_parse(self, code, fixed_format=False):
+    global parses
+    parses += 1
+    return parse(self, code, fixed_format)
+
+
+def llm_analyzers():
+    return {'llm': LLMAnalyzer(LLMClient(StubModel(latency=LATENCY))),
+            'llm_ast': LLMAstAnalyzer(LLMClient(StubModel(latency=LATENCY)), encoding='compact')}
+
+
+def per_analyzer(inputs, options):
+    """The previous main(): each analyzer over every file in turn, each parsing for itself."""
+    results = list(run_static(inputs, options, workers=1))
+    for name, analyzer in llm_analyzers().items():
+        async def run_all():
+            return await asyncio.gather(*(document_file_async(name, analyzer, path, options) for path in inputs))
+        results += asyncio.run(run_all())
+    return results
+
+
+def pipelined(inputs, options, files_in_flight=None):
+    analyzers = llm_analyzers()
+    factories = {'static': lambda: StaticAnalyzer(stream=True),
+                 'llm': lambda: analyzers['llm'], 'llm_ast': lambda: analyzers['llm_ast']}
+    pipeline = FilePipeline(factories, options)
+    records = pipeline.run_all(inputs, files_in_flight) if files_in_flight else pipeline.run_all(inputs)
+    return [result for record in records for result in record.results.values()], records
+
+
+def timed(run, inputs, options):
+    global parses
+    parses = 0
+    start = time.perf_counter()
+    out = run(inputs, options)
+    return out, time.perf_counter() - start, parses
+
+
+if __name__ == '__main__':
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else MEMBERS
+    Parser.parse = counting_parse
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = []
+        for i in range(members):
+            inputs.append(os.path.join(directory, f'member{i}.cbl'))
+            with open(inputs[-1], 'w') as f:
+                f.write(generate_program(STATEMENTS, name=f'MEMBER{i}'))
+        before = BatchOptions(os.path.join(directory, 'before'), metrics=False, use_parse_cache=False)
+        after = BatchOptions(os.path.join(directory, 'after'), metrics=False, use_parse_cache=False)
+        os.makedirs(before.output_dir)
+        os.makedirs(after.output_dir)
+
+        results, serial_s, serial_parses = timed(per_analyzer, inputs, before)
+        (piped, records), pipeline_s, pipeline_parses = timed(pipelined, inputs, after)
+        assert not any(result.error for result in results + piped)
+        names = sorted(os.listdir(before.output_dir))
+        assert names == sorted(os.listdir(after.output_dir))
+        _, mismatch, errors = filecmp.cmpfiles(before.output_dir, after.output_dir, names, shallow=False)
+        assert not mismatch and not errors, f'outputs differ: {mismatch + errors}'
+
+        # One member at a time, so each file's wall clock is its own
+        _, records = pipelined(inputs, after, files_in_flight=1)
+        wall = sum(record.seconds for record in records) / members
+        serial = sum(record.analyzer_seconds for record in records) / members
+        slowest = sum(max(result.seconds for result in record.results.values()) for record in records) / members
+        print(f"{members} members of {STATEMENTS} statements, static + 2 LLM analyzers at {LATENCY * 1000:.0f} ms")
+        print(f"{'run':<14}{'seconds':>10}{'parses':>8}")
+        print(f"{'per analyzer':<14}{serial_s:>10.2f}{serial_parses:>8}")
+        print(f"{'pipeline':<14}{pipeline_s:>10.2f}{pipeline_parses:>8}  {serial_s / pipeline_s:.1f}x")
+        print(f"per file: {wall:.2f}s wall clock, slowest analyzer {slowest:.2f}s, "
+              f"parse and analyzers one after another {serial:.2f}s")
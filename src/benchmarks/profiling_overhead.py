@@ -0,0 +1,53 @@
+import io
+import sys
+import time
+
+from benchmarks.generate import generate_program
+from common import profiling
+from common.parser import get_parser
+from static_analyzer import StaticAnalyzer
+
+# Many small members, where per-stage instrumentation weighs the most
+MEMBERS = 200
+STATEMENTS = 100
+ROUNDS = 5
+SPAN_CALLS = 1_000_000
+
+
+def document_all(codes) -> float:
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for code in codes:
+            StaticAnalyzer(stream=True).document(code, io.StringIO())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def span_cost() -> float:
+    start = time.perf_counter()
+    for _ in range(SPAN_CALLS):
+        with profiling.span('noop'):
+            pass
+    return (time.perf_counter() - start) / SPAN_CALLS
+
+
+if __name__ == '__main__':
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else MEMBERS
+    codes = [generate_program(STATEMENTS, name=f'MEMBER{i}') for i in range(members)]
+    get_parser()
+
+    off, off_span = document_all(codes), span_cost()
+    profiler = profiling.enable()
+    on = document_all(codes)
+    profile = profiler.drain()
+    on_span = span_cost()
+    profiling.disable()
+    spans = len(profile.events) / (members * ROUNDS)
+
+    print(f"{members} members of {STATEMENTS} statements, parsed and documented (best of {ROUNDS})")
+    print(f"{'profiling':<10}{'seconds':>10}{'overhead':>10}{'span ns':>10}")
+    print(f"{'off':<10}{off:>10.3f}{'':>10}{off_span * 1e9:>10.0f}")
+    print(f"{'on':<10}{on:>10.3f}{on / off - 1:>10.1%}{on_span * 1e9:>10.0f}")
+    print(f"{spans:.0f} spans per member; switched off they cost {spans * off_span / (off / members):.2%} "
+          f"of its document time")
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.generate import generate_program, to_fixed_format
+from common.lexer import Scanner
+from common.source import FixedFormatSource
+from common.util import read_file
+
+SIZES = [10_000, 50_000, 100_000]
+
+
+def count_tokens_read_text(path: str) -> int:
+    lexer = Scanner(fixed_format=True)
+    lexer.input(read_file(path))
+    return sum(1 for _ in lexer)
+
+
+def count_tokens_streamed(path: str) -> int:
+    lexer = Scanner(fixed_format=True)
+    with FixedFormatSource(path) as source:
+        lexer.input_lines(source.lines())
+        return sum(1 for _ in lexer)
+
+
+def peak_memory(fn, path: str) -> int:
+    tracemalloc.start()
+    try:
+        fn(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'statements':>10} {'file MB':>8} {'read_text peak MB':>18} {'mmap stream peak MB':>20}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            path = os.path.join(workdir, f'member_{size}.cbl')
+            with open(path, 'w') as f:
+                f.write(to_fixed_format(generate_program(size)))
+            file_mb = os.path.getsize(path) / 2 ** 20
+            whole = peak_memory(count_tokens_read_text, path) / 2 ** 20
+            streamed = peak_memory(count_tokens_streamed, path) / 2 ** 20
+            print(f"{size:>10} {file_mb:>8.1f} {whole:>18.2f} {streamed:>20.3f}")
@@ -0,0 +1,55 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+SAMPLE_PATH = '../resources/input/payroll.cbl'
+RUNS = 5
+# What main imported up front before analyzers were looked up by name
+EAGER_IMPORTS = 'import main, google.generativeai, llm_analyzer, llm_ast_analyzer, common.llm'
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)')
+
+
+def import_times(statement: str):
+    """Microseconds of the top-level imports in statement, from -X importtime."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for match in IMPORT_LINE.finditer(stderr):
+        # Top-level modules are indented by a single space
+        if len(match.group(3)) == 1:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def best_import(statement: str) -> float:
+    """Seconds spent importing the modules statement names, interpreter startup excluded."""
+    modules = statement[len('import '):].split(', ')
+    return min(sum(import_times(statement).get(module, 0) for module in modules) for _ in range(RUNS)) / 1e6
+
+
+def best_run(output_dir: str) -> float:
+    best = float('inf')
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py', SAMPLE_PATH, '-a', 'static', '--no-metrics', '-o', output_dir],
+                       capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    lazy = best_import('import main')
+    eager = best_import(EAGER_IMPORTS)
+    loaded = subprocess.run([sys.executable, '-c', 'import sys, main; main.main(["' + SAMPLE_PATH + '", "-a", "static", '
+                             '"--no-metrics", "-o", sys.argv[1]]); print(sorted(m for m in sys.modules '
+                             'if m.startswith(("google.generativeai", "google.api_core", "llm", "common.llm", "dotenv"))))',
+                             tempfile.mkdtemp()], capture_output=True, text=True, check=True).stdout.splitlines()[-1]
+    with tempfile.TemporaryDirectory() as output_dir:
+        run = best_run(output_dir)
+    print(f"import main (static only)        {lazy * 1000:8.1f} ms")
+    print(f"import main with the LLM stack   {eager * 1000:8.1f} ms  {eager / lazy:.1f}x")
+    print(f"static run of {os.path.basename(SAMPLE_PATH)}, whole process {run * 1000:8.1f} ms")
+    print(f"LLM modules loaded by a static run: {loaded}")
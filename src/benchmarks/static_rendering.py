@@ -0,0 +1,43 @@
+import sys
+import time
+
+from benchmarks.generate import generate_program
+from common.parser import get_parser
+from static_analyzer import StaticAnalyzer
+
+# (statements, variables), paragraphs of 10 statements
+SIZES = [(10_000, 2_000), (20_000, 10_000), (40_000, 20_000)]
+
+
+class ScanningAnalyzer(StaticAnalyzer):
+    """Per-paragraph usage found by scanning every variable, as before the index."""
+
+    def _paragraph_usage(self, para_name: str):
+        reads, writes = set(), set()
+        for var_name, usage in self.var_usage.items():
+            if para_name in usage['reads']:
+                reads.add(var_name)
+            if para_name in usage['writes']:
+                writes.add(var_name)
+        return reads, writes
+
+
+def render_time(analyzer_class, program):
+    analyzer = analyzer_class()
+    analyzer.program = program
+    analyzer.analyze()
+    start = time.perf_counter()
+    lines = analyzer._generate_procedure_details() + analyzer._generate_visual_graph()
+    return time.perf_counter() - start, lines
+
+
+if __name__ == '__main__':
+    sizes = [tuple(map(int, arg.split(':'))) for arg in sys.argv[1:]] or SIZES
+    print(f"{'statements':>12}{'variables':>11}{'paragraphs':>12}{'scan s':>10}{'index s':>10}{'speedup':>9}")
+    for statements, variables in sizes:
+        program = get_parser().parse(generate_program(statements, variables, paragraph_size=10))
+        scan, expected = render_time(ScanningAnalyzer, program)
+        indexed, lines = render_time(StaticAnalyzer, program)
+        assert lines == expected, 'indexed rendering differs from the scanning one'
+        print(f"{statements:>12}{variables:>11}{len(program.paragraphs):>12}"
+              f"{scan:>10.3f}{indexed:>10.3f}{scan / indexed:>8.1f}x")
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generate import generate_program
+from common.parser import get_parser
+from static_analyzer import StaticAnalyzer
+
+STATEMENTS = 100_000
+VARIABLES = 10_000
+
+
+def render(program, stream: bool):
+    """Peak traced memory and time of rendering alone, analysis excluded."""
+    analyzer = StaticAnalyzer(stream=stream)
+    analyzer.program = program
+    analyzer.analyze()
+    with open(os.devnull, 'w') as out:
+        tracemalloc.start()
+        start = time.perf_counter()
+        if stream:
+            for text in analyzer.iter_documentation():
+                out.write(text)
+        else:
+            out.write(analyzer.generate_documentation())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, analyzer.section_stats
+
+
+if __name__ == '__main__':
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else STATEMENTS
+    program = get_parser().parse(generate_program(statements, VARIABLES, paragraph_size=10))
+    joined_s, joined_mb, _ = render(program, stream=False)
+    stream_s, stream_mb, sections = render(program, stream=True)
+
+    print(f"{'section':<18}{'KB':>10}{'s':>9}")
+    for section in sections:
+        print(f"{section.name:<18}{section.bytes / 1024:>10.1f}{section.seconds:>9.3f}")
+    total = sum(section.bytes for section in sections) / 2 ** 20
+    largest = max(section.bytes for section in sections) / 2 ** 20
+    print(f"\ndocument {total:.1f} MB, largest section {largest:.1f} MB")
+    print(f"joined     peak {joined_mb:>7.1f} MB  {joined_s:.2f}s")
+    print(f"streamed   peak {stream_mb:>7.1f} MB  {stream_s:.2f}s")
@@ -0,0 +1,143 @@
+import re
+from collections import Counter
+from typing import Iterator, List, Set, Tuple
+
+from common.util import Paragraph, Program, Statement
+
+# How llm_ast can serialize the AST into its prompt
+AST_ENCODINGS = ('json', 'json_min', 'compact')
+
+STATEMENT_FIELDS = {
+    'MOVE': ('source', 'target'),
+    'ADD': ('operand1', 'operand2', 'target'),
+    'SUBTRACT': ('operand1', 'operand2', 'target'),
+    'MULTIPLY': ('operand1', 'operand2', 'target'),
+    'COMPUTE': ('target', 'expression'),
+    'PERFORM': ('target', 'thru', 'until'),
+    'IF': ('condition',),
+    'DISPLAY': ('item',),
+    'STOP': (),
+}
+# Fields the grammar also fills from a string literal, whose quotes the lexer drops
+LITERAL_FIELDS = {('MOVE', 'source'), ('DISPLAY', 'item')}
+# What a field holding a single data name or number looks like
+NAME_OR_NUMBER = re.compile(r'[A-Za-z][A-Za-z0-9-]*|[+-]?(?:\d+\.?\d*|\.\d+)')
+
+COMPACT_SCHEMA = """\
+# Compact COBOL AST, one record per line, fields separated by '|'.
+# Trailing empty fields are omitted and '-' marks an empty field.
+# $N stands for entry N of the SYMBOLS record.
+# Literals other than a single name or number are double-quoted, with
+# backslash, '"', '|' and newline escaped as \\\\, \\", \\| and \\n.
+# PROGRAM|name
+# SYMBOLS|name0|name1|...
+# V|level|name|picture|value      one per WORKING-STORAGE item
+# P|name                          one per paragraph, followed by its statements
+# Statements are indented one space per nesting level:
+#  MOVE|source|target
+#  ADD|operand1|operand2|target   (SUBTRACT and MULTIPLY alike)
+#  COMPUTE|target|expression
+#  PERFORM|target|thru|until
+#  IF|condition                   then-branch, an ELSE record, else-branch
+#  DISPLAY|item
+#  STOP
+"""
+
+
+def walk_statements(statements: List[Statement]) -> Iterator[Statement]:
+    for stmt in statements:
+        yield stmt
+        if stmt.type == 'IF':
+            yield from walk_statements(stmt.data.get('then', []))
+            yield from walk_statements(stmt.data.get('else', []))
+
+
+def _words(value) -> List[str]:
+    return str(value).split(' ') if value is not None else []
+
+
+def _is_literal(value) -> bool:
+    return value is not None and not NAME_OR_NUMBER.fullmatch(str(value))
+
+
+def _quote(value) -> str:
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('|', '\\|').replace('\n', '\\n')
+    return f'"{text}"'
+
+
+def referenced_names(paragraph: Paragraph) -> Set[str]:
+    """Every word used in the paragraph's statement fields, nested ones included."""
+    names = set()
+    for stmt in walk_statements(paragraph.statements):
+        for field in STATEMENT_FIELDS.get(stmt.type, ()):
+            names.update(_words(stmt.data.get(field)))
+    return names
+
+
+class CompactEncoder:
+    """Positional, symbol-table based rendering of a Program for prompts."""
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.symbols = self._symbol_table()
+
+    def _symbol_table(self) -> dict:
+        # Only names that occur more than once are worth a table entry
+        counts = Counter(var.name for var in self.program.variables)
+        for para in self.program.paragraphs:
+            counts[para.name] += 1
+            for stmt in walk_statements(para.statements):
+                for field in STATEMENT_FIELDS.get(stmt.type, ()):
+                    value = stmt.data.get(field)
+                    if not ((stmt.type, field) in LITERAL_FIELDS and _is_literal(value)):
+                        counts.update(_words(value))
+        known = {var.name for var in self.program.variables} | {p.name for p in self.program.paragraphs}
+        names = [name for name, count in counts.items() if count > 1 and name in known]
+        return {name: f'${i}' for i, name in enumerate(names)}
+
+    def _field(self, value, literal: bool = False) -> str:
+        """literal fields may hold a string literal, which is quoted and
+        never has names in it replaced by symbols."""
+        if value is None:
+            return '-'
+        if literal and _is_literal(value):
+            return _quote(value)
+        return ' '.join(self.symbols.get(word, word) for word in _words(value))
+
+    def _record(self, tag: str, *fields, literals: Tuple[bool, ...] = ()) -> str:
+        fields = list(fields)
+        while fields and fields[-1] is None:
+            fields.pop()
+        literals = literals + (False,) * (len(fields) - len(literals))
+        return '|'.join([tag, *(self._field(f, literal) for f, literal in zip(fields, literals))])
+
+    def _statements(self, statements: List[Statement], depth: int) -> Iterator[str]:
+        indent = ' ' * depth
+        for stmt in statements:
+            names = STATEMENT_FIELDS.get(stmt.type, ())
+            fields = [stmt.data.get(name) for name in names]
+            literals = tuple((stmt.type, name) in LITERAL_FIELDS for name in names)
+            yield indent + self._record(stmt.type, *fields, literals=literals)
+            if stmt.type == 'IF':
+                yield from self._statements(stmt.data.get('then', []), depth + 1)
+                if stmt.data.get('else'):
+                    yield indent + 'ELSE'
+                    yield from self._statements(stmt.data['else'], depth + 1)
+
+    def lines(self) -> Iterator[str]:
+        yield COMPACT_SCHEMA.rstrip('\n')
+        yield f'PROGRAM|{self.program.name}'
+        if self.symbols:
+            yield '|'.join(['SYMBOLS', *self.symbols])
+        for var in self.program.variables:
+            yield self._record('V', var.level, var.name, var.picture, var.value, literals=(False, False, False, True))
+        for para in self.program.paragraphs:
+            yield self._record('P', para.name)
+            yield from self._statements(para.statements, 1)
+
+    def encode(self) -> str:
+        return '\n'.join(self.lines())
+
+
+def encode_compact(program: Program) -> str:
+    return CompactEncoder(program).encode()
@@ -1,21 +1,62 @@
+import importlib
 import sys
 from abc import ABC, abstractmethod
-from typing import TextIO
+from functools import partial
+from typing import Optional, TextIO, Type
 
-from common.parser import Parser
+from common.parser import get_parser
+from common.source import parse_fixed_format, read_source
 from common.util import Program
 
+# Module and class of each analyzer, imported only once it is selected:
+# the LLM ones pull in the model SDK, which dominates a static-only startup
+ANALYZERS = {
+    'static': ('static_analyzer', 'StaticAnalyzer'),
+    'llm': ('llm_analyzer', 'LLMAnalyzer'),
+    'llm_ast': ('llm_ast_analyzer', 'LLMAstAnalyzer'),
+}
+ANALYZER_NAMES = list(ANALYZERS)
+
+
+def analyzer_class(name: str) -> Type['BaseAnalyzer']:
+    module, class_name = ANALYZERS[name]
+    return getattr(importlib.import_module(module), class_name)
+
 
 class BaseAnalyzer(ABC):
+    # False when document() works from the program alone, so a caller may pass '' as _input
+    reads_source = True
 
     def __init__(self):
         self._input = ''
+        # Sources are normalized fixed-format text (see common.source)
+        self.fixed_format = False
+        # Optional ParseCache consulted before parsing
+        self.parse_cache = None
+        # Optional CopybookLibrary that expands COPY statements
+        self.copybooks = None
 
     @abstractmethod
-    def document(self, _input: str, _output: TextIO = sys.stdout) -> str:
+    def document(self, _input: str, _output: TextIO = sys.stdout, program: Program = None) -> Optional[str]:
+        """Document _input into _output and return the documentation, or None
+        when an analyzer streams it to _output without holding it whole.
+        program, when given, is its already parsed AST and is only read, so
+        one parse can be shared by several analyzers."""
         pass
 
-    def fetch_program(self) -> Program:
-        parser = Parser()
-        parser.build(debug=True)
-        return parser.parse(self._input)
+    def fetch_program(self, source: str = None) -> Program:
+        source = self._input if source is None else source
+        parse = self.parse_cache.parse if self.parse_cache is not None else get_parser().parse
+        parse = partial(parse, fixed_format=self.fixed_format)
+        if self.copybooks is not None:
+            return self.copybooks.parse(source, parse)
+        return parse(source)
+
+    def fetch_member(self, path: str) -> Program:
+        """Parse the member at path, fixed-format ones straight off their
+        memory mapping unless COPY statements need the text expanded."""
+        if not self.fixed_format or self.copybooks is not None:
+            return self.fetch_program(read_source(path, self.fixed_format))
+        if self.parse_cache is not None:
+            return self.parse_cache.parse_file(path)
+        return parse_fixed_format(path)
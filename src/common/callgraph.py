@@ -0,0 +1,153 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from common.ast_encoding import walk_statements
+from common.util import Program
+
+
+class CallGraph:
+    """PERFORM graph of a program's paragraphs.
+
+    nodes maps every paragraph to its 'calls', a list without repeats in
+    statement order, and its 'called_by' set. PERFORMs nested in IF branches count, and PERFORM A THRU B calls every paragraph
+    from A to B in source order. A target that is not a paragraph of the
+    program stays in 'calls' but has no node. Every traversal uses an
+    explicit stack, so call chains of any depth are fine.
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        self._ranges: Dict[Tuple[str, Optional[str]], List[str]] = {}
+        self.order: Dict[str, int] = {}
+        for i, para in enumerate(program.paragraphs):
+            self.order.setdefault(para.name, i)
+        self.nodes: Dict[str, dict] = {
+            para.name: {'calls': [], 'called_by': set()} for para in program.paragraphs}
+        for para in program.paragraphs:
+            calls = dict.fromkeys(self.nodes[para.name]['calls'])
+            for stmt in walk_statements(para.statements):
+                if stmt.type == 'PERFORM':
+                    targets = self.perform_range(stmt.data) or [stmt.data['target']]
+                    calls.update(dict.fromkeys(targets))
+                    for target in targets:
+                        if target in self.nodes:
+                            self.nodes[target]['called_by'].add(para.name)
+            self.nodes[para.name]['calls'] = list(calls)
+        self._successors: Dict[str, List[str]] = {}
+
+    def perform_range(self, perform: dict) -> List[str]:
+        """Paragraphs executed by a PERFORM, in order; empty when a bound is unknown."""
+        key = (perform['target'], perform.get('thru'))
+        names = self._ranges.get(key)
+        if names is None:
+            first = self.order.get(key[0])
+            last = self.order.get(key[1] or key[0])
+            names = []
+            if first is not None and last is not None and first <= last:
+                names = [para.name for para in self.program.paragraphs[first:last + 1]]
+            self._ranges[key] = names
+        return names
+
+    @property
+    def entry(self) -> Optional[str]:
+        return self.program.paragraphs[0].name if self.program.paragraphs else None
+
+    def falls_through(self, name: str) -> bool:
+        """Whether control runs off the end of the paragraph into the next
+        one: it is not performed (so never returns) and has no STOP."""
+        i = self.order[name]
+        if i + 1 >= len(self.program.paragraphs) or self.nodes[name]['called_by']:
+            return False
+        return not any(stmt.type == 'STOP' for stmt in self.program.paragraphs[i].statements)
+
+    def successors(self, name: str) -> List[str]:
+        """Paragraphs control can pass to from name, PERFORMs first."""
+        succs = self._successors.get(name)
+        if succs is None:
+            succs = sorted(callee for callee in self.nodes[name]['calls'] if callee in self.nodes)
+            if self.falls_through(name):
+                succs.append(self.program.paragraphs[self.order[name] + 1].name)
+            self._successors[name] = succs
+        return succs
+
+    def reachable(self, root: str = None) -> Set[str]:
+        root = root or self.entry
+        if root is None:
+            return set()
+        seen = {root}
+        stack = [root]
+        while stack:
+            for succ in self.successors(stack.pop()):
+                if succ not in seen:
+                    seen.add(succ)
+                    stack.append(succ)
+        return seen
+
+    def unreachable(self, root: str = None) -> List[str]:
+        """Paragraphs, in source order, that control can never reach from root."""
+        seen = self.reachable(root)
+        return [name for name in self.nodes if name not in seen]
+
+    def components(self) -> List[List[str]]:
+        """Strongly connected components over control edges (Tarjan), each
+        listed after every component it passes control to."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components = []
+        for root in self.nodes:
+            if root in index:
+                continue
+            work = [(root, iter(self.successors(root)))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, succs = work[-1]
+                for succ in succs:
+                    if succ not in index:
+                        index[succ] = low[succ] = len(index)
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(self.successors(succ))))
+                        break
+                    if succ in on_stack:
+                        low[node] = min(low[node], index[succ])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Components in which paragraphs (directly or mutually) PERFORM themselves."""
+        return [sorted(component) for component in self.components()
+                if len(component) > 1 or component[0] in self.nodes[component[0]]['calls']]
+
+    def walk(self, root: str = None) -> Iterator[Tuple[int, str, bool]]:
+        """Depth-first preorder from root as (depth, name, seen before),
+        calls in statement order; a paragraph seen before is not expanded again."""
+        root = root or self.entry
+        if root is None:
+            return
+        seen = set()
+        stack = [(0, root)]
+        while stack:
+            depth, name = stack.pop()
+            if name in seen:
+                yield depth, name, True
+                continue
+            seen.add(name)
+            yield depth, name, False
+            calls = self.nodes.get(name, {}).get('calls', ())
+            stack.extend((depth + 1, called) for called in reversed(calls))
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from common.ast_encoding import referenced_names
+from common.llm import LLMClient, estimate_tokens
+from common.manifest import ProgramManifest
+from common.util import Paragraph, Program, Variable
+
+MAP_PROMPT = """You are a COBOL documentation expert. Below is part {index} of {total} of the COBOL program {name}: a group of its procedures together with the WORKING-STORAGE items they use.
+
+{payload}
+
+Write concise notes for this part only. For every procedure give its purpose, the procedures it PERFORMs, the variables it reads and writes, and one line per statement. For every variable give its inferred purpose. Do not describe procedures that are not shown.
+"""
+
+MERGE_PROMPT = """You are a COBOL documentation expert. Merge the following notes on parts of the COBOL program {name} into one set of notes. Keep every procedure and variable, and drop only repetition.
+
+{payload}
+"""
+
+REDUCE_PROMPT = """You are a COBOL documentation expert. The COBOL program {name} was too large to analyze at once, so it was analyzed in {total} parts. Using the program overview and the notes below, generate comprehensive documentation in this EXACT format:
+        {template}
+
+        PROGRAM OVERVIEW:
+        Procedures in execution order: {procedures}
+        WORKING-STORAGE items: {variables}
+
+        NOTES:
+        {notes}
+
+Generate the documentation following the format above EXACTLY. Be thorough and accurate.
+"""
+
+Group = Tuple[List[Paragraph], List[Variable]]
+
+
+class Chunk(NamedTuple):
+    paragraphs: List[str]
+    payload: str
+
+
+def plan_chunks(program: Program, token_budget: int, paragraph_cost: Callable[[Paragraph], int],
+                variable_cost: Callable[[Variable], int], fixed: Sequence[Sequence[str]] = ()) -> List[Group]:
+    """Greedily pack consecutive paragraphs, plus the variables they use,
+    into groups whose estimated size stays within token_budget. A paragraph
+    that alone exceeds the budget gets a group of its own.
+
+    Runs of paragraph names in fixed (the unchanged chunks of a previous
+    run) are kept as groups of their own wherever they still occur, so an
+    edit only repacks the stretch around it."""
+    variables = {var.name: var for var in program.variables}
+    order = {var.name: i for i, var in enumerate(program.variables)}
+    runs = {run[0]: list(run) for run in fixed if run}
+    var_costs: Dict[str, int] = {}
+    groups: List[Group] = []
+    paragraphs, used, cost = [], {}, 0
+
+    def group_variables(members: List[Paragraph]) -> List[Variable]:
+        names = set().union(*(referenced_names(para) for para in members))
+        return sorted((variables[name] for name in names if name in variables), key=lambda v: order[v.name])
+
+    i = 0
+    while i < len(program.paragraphs):
+        para = program.paragraphs[i]
+        run = runs.get(para.name)
+        if run and [p.name for p in program.paragraphs[i:i + len(run)]] == run:
+            if paragraphs:
+                groups.append((paragraphs, sorted(used.values(), key=lambda v: order[v.name])))
+                paragraphs, used, cost = [], {}, 0
+            members = program.paragraphs[i:i + len(run)]
+            groups.append((members, group_variables(members)))
+            i += len(run)
+            continue
+        i += 1
+        new_vars = {name: variables[name] for name in referenced_names(para)
+                    if name in variables and name not in used}
+        for name, var in new_vars.items():
+            if name not in var_costs:
+                var_costs[name] = variable_cost(var)
+        added = paragraph_cost(para) + sum(var_costs[name] for name in new_vars)
+        if paragraphs and cost + added > token_budget:
+            groups.append((paragraphs, sorted(used.values(), key=lambda v: order[v.name])))
+            paragraphs, used, cost = [], {}, 0
+            new_vars = {name: variables[name] for name in referenced_names(para) if name in variables}
+            added = paragraph_cost(para) + sum(var_costs[name] for name in new_vars)
+        paragraphs.append(para)
+        used.update(new_vars)
+        cost += added
+
+    if paragraphs:
+        groups.append((paragraphs, sorted(used.values(), key=lambda v: order[v.name])))
+    return groups
+
+
+def ast_chunks(program: Program, token_budget: int, encode: Callable[[Program], str],
+               fixed: Sequence[Sequence[str]] = ()) -> List[Chunk]:
+    """Chunk payloads rendered as sub-programs in the analyzer's AST encoding."""
+    base = estimate_tokens(encode(Program(name=program.name)))
+    groups = plan_chunks(
+        program, token_budget,
+        lambda para: estimate_tokens(encode(Program(name=program.name, paragraphs=[para]))) - base,
+        lambda var: estimate_tokens(encode(Program(name=program.name, variables=[var]))) - base,
+        fixed)
+    return [Chunk([para.name for para in paragraphs],
+                  encode(Program(name=program.name, variables=variables, paragraphs=paragraphs)))
+            for paragraphs, variables in groups]
+
+
+def source_chunks(program: Program, source: str, token_budget: int,
+                  fixed: Sequence[Sequence[str]] = ()) -> List[Chunk]:
+    """Chunk payloads cut from the original source: the declarations of the
+    variables used, followed by the text of each paragraph."""
+    declarations = _declaration_lines(source)
+    paragraph_text = _paragraph_text(program, source)
+    groups = plan_chunks(program, token_budget,
+                         lambda para: estimate_tokens(paragraph_text[para.name]),
+                         lambda var: estimate_tokens(declarations.get(var.name, '')),
+                         fixed)
+    chunks = []
+    for paragraphs, variables in groups:
+        lines = ['WORKING-STORAGE SECTION.']
+        lines += [declarations[var.name] for var in variables if var.name in declarations]
+        lines += ['', 'PROCEDURE DIVISION.']
+        lines += [paragraph_text[para.name] for para in paragraphs]
+        chunks.append(Chunk([para.name for para in paragraphs], '\n'.join(lines)))
+    return chunks
+
+
+def payload_digest(payload: str, *context: str) -> str:
+    """Identifies a chunk's notes by its payload and whatever else went into them."""
+    digest = hashlib.sha256()
+    for part in context + (payload,):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _declaration_lines(source: str) -> Dict[str, str]:
+    declarations = {}
+    for match in re.finditer(r'^[ \t]*\d+[ \t]+([A-Za-z][A-Za-z0-9\-]*)\b.*$', source, re.MULTILINE):
+        declarations.setdefault(match.group(1), match.group(0).strip())
+    return declarations
+
+
+def _paragraph_text(program: Program, source: str) -> Dict[str, str]:
+    division = re.search(r'PROCEDURE\s+DIVISION\s*\.', source, re.IGNORECASE)
+    pos = division.end() if division else 0
+    starts = []
+    for para in program.paragraphs:
+        header = re.compile(rf'^[ \t]*{re.escape(para.name)}[ \t]*\.', re.MULTILINE)
+        match = header.search(source, pos)
+        start = match.start() if match else pos
+        starts.append((para.name, start))
+        pos = match.end() if match else pos
+    bounds = [start for _, start in starts[1:]] + [len(source)]
+    return {name: source[start:end].rstrip() for (name, start), end in zip(starts, bounds)}
+
+
+class MapReduceSummarizer:
+    """Summarize chunks in parallel, merge the notes until they fit the
+    budget, then reduce them into the documentation template.
+
+    With a manifest, notes of chunks whose payload, model and template are
+    unchanged since the previous run are reused instead of summarized
+    again, and reused counts the paragraphs they cover."""
+
+    def __init__(self, client: LLMClient, token_budget: int, manifest: Optional[ProgramManifest] = None,
+                 keys: Dict[str, str] = None):
+        self.client = client
+        self.token_budget = token_budget
+        self.manifest = manifest
+        self.keys = keys or {}
+        self.reused = 0
+        self.context: Tuple[str, ...] = ()
+
+    async def summarize(self, program: Program, chunks: List[Chunk], template: str) -> str:
+        self.context = (self.client.model_name, payload_digest(MAP_PROMPT, template))
+        notes = await asyncio.gather(*(self._map(program, chunk, i, len(chunks))
+                                       for i, chunk in enumerate(chunks, 1)))
+        if self.manifest is not None:
+            self.manifest.chunks = [
+                {'paragraphs': chunk.paragraphs, 'keys': [self.keys.get(name) for name in chunk.paragraphs],
+                 'digest': payload_digest(chunk.payload, *self.context), 'notes': note}
+                for chunk, note in zip(chunks, notes)]
+        notes = await self._merge(program, list(notes))
+        prompt = REDUCE_PROMPT.format(
+            name=program.name, total=len(chunks), template=template,
+            procedures=', '.join(para.name for para in program.paragraphs),
+            variables=', '.join(var.name for var in program.variables),
+            notes='\n\n'.join(notes))
+        return await self.client.generate_async(prompt)
+
+    async def _map(self, program: Program, chunk: Chunk, index: int, total: int) -> str:
+        if self.manifest is not None:
+            notes = self.manifest.chunk_notes(payload_digest(chunk.payload, *self.context))
+            if notes is not None:
+                self.reused += len(chunk.paragraphs)
+                return notes
+        return await self.client.generate_async(
+            MAP_PROMPT.format(index=index, total=total, name=program.name, payload=chunk.payload))
+
+    async def _merge(self, program: Program, notes: List[str]) -> List[str]:
+        while len(notes) > 1 and sum(estimate_tokens(n) for n in notes) > self.token_budget:
+            batches, batch, size = [], [], 0
+            for note in notes:
+                cost = estimate_tokens(note)
+                if batch and size + cost > self.token_budget:
+                    batches.append(batch)
+                    batch, size = [], 0
+                batch.append(note)
+                size += cost
+            batches.append(batch)
+            if len(batches) == len(notes):
+                # Every note fills the budget alone; merge pairwise so the list still shrinks
+                batches = [notes[i:i + 2] for i in range(0, len(notes), 2)]
+            notes = list(await asyncio.gather(*(
+                self.client.generate_async(MERGE_PROMPT.format(name=program.name, payload='\n\n'.join(b)))
+                for b in batches)))
+        return notes
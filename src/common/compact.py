@@ -0,0 +1,192 @@
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from common.util import Program, Statement
+
+
+def intern(name: Optional[str]) -> Optional[str]:
+    # Numeric operands come through as numbers
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+class Node:
+    """Slotted AST node: no per-instance dict, compared, printed and pickled
+    by its slots. Slots named with a leading underscore are caches."""
+    __slots__ = ()
+    # Slots of the class and its bases, in declaration order
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + tuple(name for name in cls.__dict__.get('__slots__', ())
+                                          if not name.startswith('_'))
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash((type(self), self._values()))
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({fields})'
+
+    def __getstate__(self):
+        return None, dict(zip(self._fields, self._values()))
+
+
+class CompactProgram(Node):
+    __slots__ = ('name', 'variables', 'paragraphs')
+
+    def __init__(self, name: str, variables: Tuple['CompactVariable', ...] = (),
+                 paragraphs: Tuple['CompactParagraph', ...] = ()):
+        self.name = intern(name)
+        self.variables = variables
+        self.paragraphs = paragraphs
+
+
+class CompactVariable(Node):
+    __slots__ = ('level', 'name', 'picture', 'value')
+
+    def __init__(self, level: int, name: str, picture: str = None, value: str = None):
+        self.level = level
+        self.name = intern(name)
+        self.picture = intern(picture)
+        self.value = value
+
+
+class CompactParagraph(Node):
+    __slots__ = ('name', 'statements')
+
+    def __init__(self, name: str, statements: Tuple['CompactStatement', ...] = ()):
+        self.name = intern(name)
+        self.statements = statements
+
+
+class CompactStatement(Node):
+    """One subclass per verb. type and data mirror Statement, so read-only
+    consumers of the dataclass AST accept these nodes unchanged. data is
+    built on first access and is read-only, as analyzers share it."""
+    __slots__ = ('_data',)
+    type = ''
+
+    @property
+    def data(self) -> Mapping:
+        try:
+            return self._data
+        except AttributeError:
+            self._data = MappingProxyType(self._make_data())
+            return self._data
+
+    def _make_data(self) -> dict:
+        return {name: value for name, value in zip(self._fields, self._values()) if value is not None}
+
+
+class Move(CompactStatement):
+    __slots__ = ('source', 'target')
+    type = 'MOVE'
+
+    def __init__(self, source: str, target: str):
+        self.source = intern(source)
+        self.target = intern(target)
+
+
+class Arithmetic(CompactStatement):
+    __slots__ = ('operand1', 'operand2', 'target')
+
+    def __init__(self, operand1: str, operand2: str, target: str):
+        self.operand1 = intern(operand1)
+        self.operand2 = intern(operand2)
+        self.target = intern(target)
+
+
+class Add(Arithmetic):
+    __slots__ = ()
+    type = 'ADD'
+
+
+class Subtract(Arithmetic):
+    __slots__ = ()
+    type = 'SUBTRACT'
+
+
+class Multiply(Arithmetic):
+    __slots__ = ()
+    type = 'MULTIPLY'
+
+
+class Compute(CompactStatement):
+    __slots__ = ('target', 'expression')
+    type = 'COMPUTE'
+
+    def __init__(self, target: str, expression: str):
+        self.target = intern(target)
+        self.expression = expression
+
+
+class Perform(CompactStatement):
+    __slots__ = ('target', 'thru', 'until')
+    type = 'PERFORM'
+
+    def __init__(self, target: str, thru: str = None, until: str = None):
+        self.target = intern(target)
+        self.thru = intern(thru)
+        self.until = until
+
+
+class If(CompactStatement):
+    __slots__ = ('condition', 'then', 'else_')
+    type = 'IF'
+
+    def __init__(self, condition: str, then: Tuple[CompactStatement, ...] = (), else_: Tuple[CompactStatement, ...] = None):
+        self.condition = condition
+        self.then = then
+        self.else_ = else_
+
+    def _make_data(self) -> dict:
+        data = {'condition': self.condition, 'then': self.then}
+        if self.else_ is not None:
+            data['else'] = self.else_
+        return data
+
+
+class Display(CompactStatement):
+    __slots__ = ('item',)
+    type = 'DISPLAY'
+
+    def __init__(self, item: str):
+        self.item = intern(item)
+
+
+class Stop(CompactStatement):
+    __slots__ = ()
+    type = 'STOP'
+
+
+STATEMENT_CLASSES: Dict[str, type] = {cls.type: cls for cls in (Move, Add, Subtract, Multiply, Compute,
+                                                                Perform, If, Display, Stop)}
+
+
+def compact_statement(stmt: Statement) -> CompactStatement:
+    if stmt.type == 'IF':
+        else_ = stmt.data.get('else')
+        return If(stmt.data['condition'], compact_statements(stmt.data.get('then', [])),
+                  None if else_ is None else compact_statements(else_))
+    return STATEMENT_CLASSES[stmt.type](**stmt.data)
+
+
+def compact_statements(statements) -> Tuple[CompactStatement, ...]:
+    return tuple(compact_statement(stmt) for stmt in statements)
+
+
+def compact_program(program: Program) -> CompactProgram:
+    """Slotted, typed, interned copy of a parsed Program."""
+    return CompactProgram(
+        program.name,
+        tuple(CompactVariable(var.level, var.name, var.picture, var.value) for var in program.variables),
+        tuple(CompactParagraph(para.name, compact_statements(para.statements)) for para in program.paragraphs))
+
@@ -0,0 +1,203 @@
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from common import profiling
+from common.parser import get_parser
+from common.source import read_source
+from common.util import Program, Variable
+
+COPYBOOK_SUFFIXES = ('', '.cpy', '.CPY', '.copy', '.cbl', '.cob')
+# Search path variable GnuCOBOL reads, os.pathsep separated
+SEARCH_PATH_ENV = 'COBCPY'
+
+_OPERAND = r'(?:==.*?==|"[^"]*"|\'[^\']*\'|[^\s.=]+)'
+COPY_STATEMENT = re.compile(
+    r'(?<![\w-])COPY\s+(?P<name>"[^"]+"|\'[^\']+\'|[A-Za-z0-9][\w-]*)'
+    r'(?:\s+(?:OF|IN)\s+(?P<library>[A-Za-z0-9][\w-]*))?'
+    rf'(?:\s+REPLACING(?P<replacing>(?:\s+{_OPERAND}\s+BY\s+{_OPERAND})+))?'
+    r'\s*\.(?=\s|$)', re.IGNORECASE | re.DOTALL)
+REPLACING_PAIR = re.compile(rf'({_OPERAND})\s+BY\s+({_OPERAND})', re.IGNORECASE | re.DOTALL)
+PROCEDURE_DIVISION = re.compile(r'(?<![\w-])PROCEDURE\s+DIVISION', re.IGNORECASE)
+# Stands in for a COPY statement while the including text is parsed
+MARKER = 'COPY--{}'
+# A copybook holds WORKING-STORAGE entries; this makes it a program the grammar accepts
+COPYBOOK_PROLOGUE = 'IDENTIFICATION DIVISION. PROGRAM-ID. COPYBOOK. DATA DIVISION. WORKING-STORAGE SECTION. '
+COPYBOOK_EPILOGUE = '\nPROCEDURE DIVISION. COPYBOOK-END.'
+
+Replacing = Tuple[Tuple[str, str], ...]
+
+
+class CopybookError(ValueError):
+    pass
+
+
+def default_search_paths() -> List[str]:
+    return [path for path in os.getenv(SEARCH_PATH_ENV, '').split(os.pathsep) if path]
+
+
+def _unquote(operand: str) -> str:
+    if operand.startswith('==') and operand.endswith('==') and len(operand) >= 4:
+        return ' '.join(operand[2:-2].split())
+    if operand[:1] in '"\'' and operand[-1:] == operand[:1]:
+        return operand[1:-1]
+    return operand
+
+
+def parse_replacing(clause: Optional[str]) -> Replacing:
+    if not clause:
+        return ()
+    return tuple((_unquote(old), _unquote(new)) for old, new in REPLACING_PAIR.findall(clause))
+
+
+def apply_replacing(text: str, replacing: Replacing) -> str:
+    """Replace each operand where it stands as whole words; an operand
+    delimited by non-word characters, like :TAG:, also matches inside words.
+    All operands are matched in one left-to-right pass, the first listed
+    winning at a position, so no replacement is matched by a later pair."""
+    alternatives, replacements = [], {}
+    for old, new in replacing:
+        if not old:
+            continue
+        words = r'\s+'.join(map(re.escape, old.split()))
+        start = r'(?<![\w-])' if re.match(r'[\w-]', old) else ''
+        end = r'(?![\w-])' if re.search(r'[\w-]$', old) else ''
+        group = f'r{len(alternatives)}'
+        alternatives.append(f'(?P<{group}>{start}{words}{end})')
+        replacements[group] = new
+    if not alternatives:
+        return text
+    return re.sub('|'.join(alternatives), lambda m: replacements[m.lastgroup], text, flags=re.IGNORECASE)
+
+
+class CopyStatement:
+    def __init__(self, marker: str, name: str, library: Optional[str], replacing: Replacing):
+        self.marker = marker
+        self.name = name
+        self.library = library
+        self.replacing = replacing
+
+
+def find_copy_statements(source: str) -> Tuple[str, List[CopyStatement]]:
+    """source with each COPY statement of its data division replaced by a
+    marker entry that keeps its line count, and the statements replaced.
+    Statements after a '*' on their line are comments to the lexer and kept."""
+    if 'COPY' not in source.upper():
+        return source, []
+    procedure = PROCEDURE_DIVISION.search(source)
+    end = procedure.start() if procedure else len(source)
+    statements, pieces, last = [], [], 0
+    for match in COPY_STATEMENT.finditer(source, 0, end):
+        line_start = source.rfind('\n', 0, match.start()) + 1
+        if '*' in source[line_start:match.start()]:
+            continue
+        marker = MARKER.format(len(statements))
+        statements.append(CopyStatement(marker, _unquote(match['name']), match['library'],
+                                        parse_replacing(match['replacing'])))
+        pieces.append(source[last:match.start()])
+        pieces.append(f'01 {marker}.' + '\n' * match.group().count('\n'))
+        last = match.end()
+    if not statements:
+        return source, []
+    pieces.append(source[last:])
+    return ''.join(pieces), statements
+
+
+class CopybookLibrary:
+    """Resolves COPY ... REPLACING against search paths and splices the
+    copybook's entries into Program.variables where the statement stood.
+
+    Each copybook is read and parsed once per (path, mtime, replacing set)
+    and its entries shared by every program that includes it, so parsing
+    work grows with the distinct copybooks, not the includes. With a
+    parse_cache the parsed copybooks are also shared by other processes
+    and later runs; those lookups are not counted in its hit rate.
+    Copybooks may COPY others; a copybook including itself is an error.
+    """
+
+    def __init__(self, search_paths: Sequence[str] = None, fixed_format: bool = False, parse_cache=None):
+        self.search_paths = list(search_paths) if search_paths is not None else default_search_paths()
+        self.fixed_format = fixed_format
+        self.parse_cache = parse_cache
+        self.parsed = 0
+        self.included = 0
+        self._entries: Dict[Tuple[str, int, Replacing], Tuple[Variable, ...]] = {}
+        self._paths: Dict[Tuple[str, Optional[str]], str] = {}
+        self._lock = threading.RLock()
+
+    def find(self, name: str, library: str = None) -> str:
+        key = (name, library)
+        if key not in self._paths:
+            self._paths[key] = self._search(name, library)
+        return self._paths[key]
+
+    def _search(self, name: str, library: Optional[str]) -> str:
+        for directory in self.search_paths:
+            if library:
+                directory = os.path.join(directory, library)
+            for candidate in dict.fromkeys((name, name.upper(), name.lower())):
+                for suffix in COPYBOOK_SUFFIXES:
+                    path = os.path.join(directory, candidate + suffix)
+                    if os.path.isfile(path):
+                        return os.path.abspath(path)
+        where = f' in {library}' if library else ''
+        raise CopybookError(f"copybook {name}{where} not found on {os.pathsep.join(self.search_paths) or 'an empty search path'}")
+
+    def parse(self, source: str, parse: Callable[[str], Optional[Program]] = None) -> Optional[Program]:
+        """Parse source with its COPY statements expanded. parse, by default
+        get_parser().parse, parses the including text (which may be cached:
+        the COPY statements in it are markers, their entries are spliced
+        after); copybooks themselves are parsed directly."""
+        text, statements = find_copy_statements(source)
+        program = (parse or get_parser().parse)(text)
+        if program is not None and statements:
+            self._splice(program, statements, ())
+        return program
+
+    def _splice(self, program: Program, statements: List[CopyStatement], including: Tuple[str, ...]):
+        entries = {statement.marker: self.entries(statement, including) for statement in statements}
+        variables = []
+        for var in program.variables:
+            if var.name in entries:
+                variables.extend(entries[var.name])
+            else:
+                variables.append(var)
+        program.variables = variables
+        self.included += len(statements)
+        profiling.count('copybook includes', len(statements))
+
+    def entries(self, statement: CopyStatement, including: Tuple[str, ...] = ()) -> Tuple[Variable, ...]:
+        path = self.find(statement.name, statement.library)
+        if path in including:
+            raise CopybookError(f"copybook {statement.name} includes itself: {' -> '.join(including + (path,))}")
+        key = (path, os.stat(path).st_mtime_ns, statement.replacing)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = self._load(path, statement.replacing, including + (path,))
+            return self._entries[key]
+
+    def _load(self, path: str, replacing: Replacing, including: Tuple[str, ...]) -> Tuple[Variable, ...]:
+        with profiling.span('copybook', path=path):
+            text, statements = find_copy_statements(apply_replacing(read_source(path, self.fixed_format), replacing))
+            if not text.strip():
+                return ()
+            text = COPYBOOK_PROLOGUE + text + COPYBOOK_EPILOGUE
+            if self.parse_cache is not None:
+                program = self.parse_cache.parse(text, self.fixed_format, count=False)
+            else:
+                program = get_parser().parse(text, self.fixed_format)
+            if program is None:
+                raise CopybookError(f"copybook {path} could not be parsed")
+            self.parsed += 1
+            profiling.count('copybooks parsed')
+            if statements:
+                self._splice(program, statements, including)
+        return tuple(program.variables)
+
+    def stats(self) -> str:
+        return copybook_report(self.included, self.parsed)
+
+
+def copybook_report(included: int, parsed: int) -> str:
+    return f"Copybooks: {included} includes from {parsed} parsed copybooks"
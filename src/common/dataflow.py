@@ -0,0 +1,471 @@
+import heapq
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from common.callgraph import CallGraph
+from common.expression import operand_names
+from common.util import Program, Statement
+
+
+class SymbolTable:
+    """Interns names to dense integer ids, used as bit positions."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def get(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def bits(mask: int) -> Iterator[int]:
+    """Positions of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class DataflowLinks:
+    """Writer to reader links through each variable, excluding a paragraph
+    flowing into itself. Each reader of a variable keeps its writers as a
+    bit mask over the paragraphs, so memory grows with the readers rather
+    than the links, and pairs are enumerated on demand."""
+
+    def __init__(self, paragraphs: Iterable[str] = ()):
+        self.paragraphs = SymbolTable(paragraphs)
+        self._flows: Dict[str, Dict[int, int]] = {}
+
+    def add(self, variable: str, reader: str, writers: int):
+        """Link reader to the paragraphs whose bits are set in writers."""
+        reader = self.paragraphs.intern(reader)
+        writers &= ~(1 << reader)
+        if writers:
+            flow = self._flows.setdefault(variable, {})
+            flow[reader] = flow.get(reader, 0) | writers
+
+    def variables(self) -> List[str]:
+        return list(self._flows)
+
+    def writers(self, variable: str) -> Set[str]:
+        mask = 0
+        for writers in self._flows[variable].values():
+            mask |= writers
+        return {self.paragraphs.names[writer] for writer in bits(mask)}
+
+    def readers(self, variable: str) -> Set[str]:
+        return {self.paragraphs.names[reader] for reader in self._flows[variable]}
+
+    def pairs(self, variable: str) -> Iterator[Tuple[str, str]]:
+        """Sorted by writer, then reader."""
+        names = self.paragraphs.names
+        flow = self._flows[variable]
+        readers = sorted(flow, key=names.__getitem__)
+        for writer in sorted(self.writers(variable)):
+            bit = 1 << self.paragraphs.ids[writer]
+            for reader in readers:
+                if flow[reader] & bit:
+                    yield writer, names[reader]
+
+    def pair_count(self, variable: str) -> int:
+        return sum(writers.bit_count() for writers in self._flows[variable].values())
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str]]:
+        for variable in self._flows:
+            for writer, reader in self.pairs(variable):
+                yield writer, reader, variable
+
+    def __len__(self) -> int:
+        return sum(self.pair_count(var) for var in self._flows)
+
+    def __contains__(self, link: Tuple[str, str, str]) -> bool:
+        writer, reader, variable = link
+        writer, reader = self.paragraphs.get(writer), self.paragraphs.get(reader)
+        flow = self._flows.get(variable, {})
+        return writer is not None and reader in flow and bool(flow[reader] >> writer & 1)
+
+
+def flow_order(inputs: List[List[int]], outputs: List[List[int]]) -> List[int]:
+    """Reverse postorder along outputs, from the nodes without inputs first,
+    so a solver visits a node after the nodes feeding it, loops aside."""
+    count = len(outputs)
+    visited = [False] * count
+    postorder = []
+    roots = [node for node in range(count) if not inputs[node]]
+    for root in roots + list(range(count)):
+        if visited[root]:
+            continue
+        visited[root] = True
+        stack = [(root, iter(outputs[root]))]
+        while stack:
+            node, successors = stack[-1]
+            for successor in successors:
+                if not visited[successor]:
+                    visited[successor] = True
+                    stack.append((successor, iter(outputs[successor])))
+                    break
+            else:
+                stack.pop()
+                postorder.append(node)
+    postorder.reverse()
+    return postorder
+
+
+def solve(inputs: List[List[int]], outputs: List[List[int]], gen: List[int],
+          kill: List[int]) -> Tuple[List[int], List[int]]:
+    """Worklist solver for a may (union) dataflow problem over bit vectors.
+
+    A node's entry set is the union of the exit sets of the nodes in
+    inputs[node], and its exit set is gen | (entry & ~kill). Pass
+    predecessors as inputs for a forward problem and successors for a
+    backward one; outputs is the opposite relation. The worklist is kept in
+    flow order, so acyclic stretches settle in a single pass.
+    Returns the (entry, exit) set of every node at the fixed point.
+    """
+    count = len(gen)
+    order = flow_order(inputs, outputs)
+    rank = [0] * count
+    for position, node in enumerate(order):
+        rank[node] = position
+    entry, exit = [0] * count, [0] * count
+    worklist = list(range(count))
+    queued = [True] * count
+    while worklist:
+        node = order[heapq.heappop(worklist)]
+        queued[node] = False
+        value = 0
+        for other in inputs[node]:
+            value |= exit[other]
+        entry[node] = value
+        value = gen[node] | (value & ~kill[node])
+        if value != exit[node]:
+            exit[node] = value
+            for other in outputs[node]:
+                if not queued[other]:
+                    queued[other] = True
+                    heapq.heappush(worklist, rank[other])
+    return entry, exit
+
+
+class Definition(NamedTuple):
+    variable: int
+    paragraph: str
+    statement: int
+
+
+class _Item(NamedTuple):
+    statement: int
+    reads: List[int]
+    writes: List[Tuple[int, int]]
+    conditional: bool
+    perform: Optional[dict]
+
+
+ALL = -1  # every bit set, the starting point of kill and def summaries
+
+
+class DataflowEngine:
+    """Reaching definitions and liveness over a program's paragraphs.
+
+    Each paragraph is summarized as a transfer function, (gen, kill) for
+    reaching definitions and (use, def) for liveness, composed from its
+    statements and the summaries of the paragraphs it PERFORMs. The sets
+    at paragraph entry and exit are then solved with the worklist solver
+    over PERFORM sites, THRU ranges and fall-through out of paragraphs that
+    are not performed and do not STOP. Every write statement is a
+    definition; writes nested in an IF, and PERFORMs nested in an IF or
+    with UNTIL, may not execute, so they do not kill. Names are interned to
+    ids so all sets are Python int bit vectors.
+    """
+
+    def __init__(self, program: Program, call_graph: CallGraph):
+        self.program = program
+        self.call_graph = call_graph
+        self.symbols = SymbolTable(var.name for var in program.variables)
+        self.definitions: List[Definition] = []
+        self._items: Dict[str, List[_Item]] = {}
+        for para in program.paragraphs:
+            self._items[para.name] = [item for number, stmt in enumerate(para.statements, 1)
+                                      for item in self._flatten([stmt], para.name, number, False)]
+        self._number_definitions()
+        self._summarize()
+        self._solve()
+
+    def _effects(self, stmt: Statement) -> Tuple[List[str], List[str]]:
+        data = stmt.data
+        if stmt.type == 'MOVE':
+            return [data['source']], [data['target']]
+        if stmt.type in ('ADD', 'SUBTRACT', 'MULTIPLY'):
+            return [data['operand1'], data['operand2']], [data['target']]
+        if stmt.type == 'COMPUTE':
+            return operand_names(data['expression']), [data['target']]
+        if stmt.type == 'DISPLAY':
+            return [data['item']], []
+        if stmt.type == 'IF':
+            return operand_names(data['condition']), []
+        if stmt.type == 'PERFORM' and 'until' in data:
+            return operand_names(data['until']), []
+        return [], []
+
+    def _flatten(self, statements: List[Statement], para_name: str, number: int,
+                 conditional: bool) -> Iterator[_Item]:
+        for stmt in statements:
+            reads, writes = self._effects(stmt)
+            write_ids = []
+            for name in writes:
+                var = self.symbols.get(name)
+                if var is not None:
+                    write_ids.append((var, len(self.definitions)))
+                    self.definitions.append(Definition(var, para_name, number))
+            perform = None
+            if stmt.type == 'PERFORM' and self.call_graph.perform_range(stmt.data):
+                perform = stmt.data
+            yield _Item(number, [self.symbols.ids[name] for name in reads if name in self.symbols.ids],
+                        write_ids, conditional, perform)
+            if stmt.type == 'IF':
+                yield from self._flatten(stmt.data.get('then', []), para_name, number, True)
+                yield from self._flatten(stmt.data.get('else', []), para_name, number, True)
+
+    def _number_definitions(self):
+        """Renumber definitions so each variable's are consecutive bits: its
+        mask is then a single run, and a slice of it is a small int."""
+        order = sorted(range(len(self.definitions)), key=lambda d: self.definitions[d].variable)
+        renumbered = [0] * len(order)
+        for new, old in enumerate(order):
+            renumbered[old] = new
+        self.definitions = [self.definitions[old] for old in order]
+        for name, items in self._items.items():
+            self._items[name] = [item._replace(writes=[(var, renumbered[d]) for var, d in item.writes])
+                                 if item.writes else item for item in items]
+
+        self._var_start = [0] * len(self.symbols)
+        counts = [0] * len(self.symbols)
+        for definition in self.definitions:
+            counts[definition.variable] += 1
+        start = 0
+        for var, count in enumerate(counts):
+            self._var_start[var] = start
+            start += count
+        self._var_defs = [((1 << count) - 1) << self._var_start[var] for var, count in enumerate(counts)]
+
+    def _definitions_of(self, var: int, mask: int) -> Iterator[Definition]:
+        """The definitions of var among mask."""
+        start = self._var_start[var]
+        for offset in bits((mask & self._var_defs[var]) >> start):
+            yield self.definitions[start + offset]
+
+    @staticmethod
+    def _may_skip(item: _Item) -> bool:
+        return item.conditional or 'until' in item.perform
+
+    # Transfer functions. Forward: (gen, kill) applied to a set s gives
+    # gen | (s & ~kill). Backward: (use, def) applied to s gives use | (s & ~def).
+
+    def _forward(self, items: List[_Item], sites: list = None) -> Tuple[int, int]:
+        """Summary of items; sites collects (item, gen, kill) up to each PERFORM."""
+        gen, kill = 0, 0
+        for item in items:
+            for var, definition in item.writes:
+                if item.conditional:
+                    gen |= 1 << definition
+                else:
+                    gen = (gen & ~self._var_defs[var]) | 1 << definition
+                    kill |= self._var_defs[var]
+            if item.perform:
+                if sites is not None:
+                    sites.append((item, gen, kill))
+                callee_gen, callee_kill = self._range_summary(item.perform, self._reach)
+                if self._may_skip(item):
+                    gen |= callee_gen
+                else:
+                    gen = callee_gen | (gen & ~callee_kill)
+                    kill |= callee_kill
+        return gen, kill
+
+    def _backward(self, items: List[_Item], sites: list = None) -> Tuple[int, int]:
+        """Summary of items; sites collects (item, use, def) from after each PERFORM."""
+        use, defs = 0, 0
+        for item in reversed(items):
+            if item.perform:
+                if sites is not None:
+                    sites.append((item, use, defs))
+                callee_use, callee_def = self._range_summary(item.perform, self._live, backward=True)
+                if self._may_skip(item):
+                    use |= callee_use
+                else:
+                    use = callee_use | (use & ~callee_def)
+                    defs |= callee_def
+            for var, _ in item.writes:
+                if not item.conditional:
+                    use &= ~(1 << var)
+                    defs |= 1 << var
+            for var in item.reads:
+                use |= 1 << var
+        return use, defs
+
+    def _range_summary(self, perform: dict, summaries: Dict[str, Tuple[int, int]],
+                       backward: bool = False) -> Tuple[int, int]:
+        names = self.call_graph.perform_range(perform)
+        if backward:
+            names = reversed(names)
+        gen, kill = 0, 0
+        for name in names:
+            callee_gen, callee_kill = summaries[name]
+            gen = callee_gen | (gen & ~callee_kill)
+            kill |= callee_kill
+        return gen, kill
+
+    def _summarize(self):
+        """Paragraph summaries, callees first; PERFORM cycles iterate to a fixed point."""
+        callers = {name: node['called_by'] for name, node in self.call_graph.nodes.items()}
+
+        self._reach = {name: (0, ALL) for name in self._items}
+        self._live = {name: (0, ALL) for name in self._items}
+        names = list(self._items)
+        index = {name: i for i, name in enumerate(names)}
+        callees = [[] for _ in names]
+        for callee, names_calling in callers.items():
+            for caller in names_calling:
+                callees[index[caller]].append(index[callee])
+        order = flow_order(callees, [[index[c] for c in callers[name]] for name in names])
+        pending = [names[i] for i in reversed(order)]
+        queued = set(pending)
+        while pending:
+            name = pending.pop()
+            queued.discard(name)
+            reach = self._forward(self._items[name])
+            live = self._backward(self._items[name])
+            if reach != self._reach[name] or live != self._live[name]:
+                self._reach[name], self._live[name] = reach, live
+                for caller in callers[name] - queued:
+                    queued.add(caller)
+                    pending.append(caller)
+
+    def _solve(self):
+        """Entry sets (reaching) and exit sets (live) of every paragraph.
+
+        Graph nodes are the paragraphs followed by one node per edge into a
+        paragraph, whose gen/kill (or use/def) is the transfer along it.
+        """
+        names = list(self._items)
+        count = len(names)
+        self._node = {name: i for i, name in enumerate(names)}
+        forward = ([[] for _ in names], [0] * count, [0] * count)
+        backward = ([[] for _ in names], [0] * count, [0] * count)
+
+        def edge(graph, source: str, target: str, gen: int, kill: int):
+            inputs, gens, kills = graph
+            inputs.append([self._node[source]])
+            inputs[self._node[target]].append(len(gens))
+            gens.append(gen)
+            kills.append(kill)
+
+        chained = set()
+
+        def chain(first: str, second: str):
+            # Control passes from the end of first to the start of second
+            if (first, second) not in chained:
+                chained.add((first, second))
+                edge(forward, first, second, *self._reach[first])
+                edge(backward, second, first, *self._live[second])
+
+        for name in names:
+            sites = []
+            self._forward(self._items[name], sites)
+            for item, gen, kill in sites:
+                performed = self.call_graph.perform_range(item.perform)
+                if 'until' in item.perform:
+                    gen |= self._range_summary(item.perform, self._reach)[0]
+                edge(forward, name, performed[0], gen, kill)
+                for first, second in zip(performed, performed[1:]):
+                    chain(first, second)
+            sites = []
+            self._backward(self._items[name], sites)
+            for item, use, defs in sites:
+                if 'until' in item.perform:
+                    use |= self._range_summary(item.perform, self._live, backward=True)[0]
+                    use |= sum(1 << var for var in set(item.reads))
+                edge(backward, name, self.call_graph.perform_range(item.perform)[-1], use, defs)
+
+        for para, following in zip(self.program.paragraphs, self.program.paragraphs[1:]):
+            if self.call_graph.falls_through(para.name):
+                chain(para.name, following.name)
+
+        self.reaching_in = self._fixed_point(*forward)[:count]
+        self.live_out = self._fixed_point(*backward)[:count]
+
+    @staticmethod
+    def _fixed_point(inputs: List[List[int]], gen: List[int], kill: List[int]) -> List[int]:
+        outputs = [[] for _ in inputs]
+        for node, sources in enumerate(inputs):
+            for source in sources:
+                outputs[source].append(node)
+        return solve(inputs, outputs, gen, kill)[1]
+
+    def reaching_links(self) -> Iterator[Tuple[str, str, int]]:
+        """(variable, reader, writers) for the variables read in each
+        paragraph, writers being a mask of the paragraphs, by position,
+        whose writes of the variable reach the read."""
+        paragraph_bit = [1 << self._node[definition.paragraph] for definition in self.definitions]
+        for name, items in self._items.items():
+            current = self.reaching_in[self._node[name]]
+            reached: Dict[int, int] = {}
+            for item in items:
+                for var in item.reads:
+                    reached[var] = reached.get(var, 0) | (current & self._var_defs[var])
+                for var, definition in item.writes:
+                    if not item.conditional:
+                        current &= ~self._var_defs[var]
+                    current |= 1 << definition
+                if item.perform:
+                    gen, kill = self._range_summary(item.perform, self._reach)
+                    current = gen | (current if self._may_skip(item) else current & ~kill)
+                    if 'until' in item.perform:
+                        # The condition is tested again after every iteration
+                        for var in item.reads:
+                            reached[var] |= current & self._var_defs[var]
+            for var, mask in reached.items():
+                start, writers = self._var_start[var], 0
+                for offset in bits(mask >> start):
+                    writers |= paragraph_bit[start + offset]
+                if writers:
+                    yield self.symbols.names[var], name, writers
+
+    def unused_definitions(self) -> List[Definition]:
+        """Writes whose value is overwritten or never read on any path."""
+        unused = []
+        for name, items in self._items.items():
+            live = self.live_out[self._node[name]]
+            for item in reversed(items):
+                if item.perform:
+                    use, defs = self._range_summary(item.perform, self._live, backward=True)
+                    live = use | (live if self._may_skip(item) else live & ~defs)
+                for var, definition in item.writes:
+                    if not live >> var & 1:
+                        unused.append(self.definitions[definition])
+                    if not item.conditional:
+                        live &= ~(1 << var)
+                for var in item.reads:
+                    live |= 1 << var
+        unused.sort(key=lambda d: (self.symbols.names[d.variable], d.paragraph, d.statement))
+        return unused
+
+    def live_on_entry(self) -> List[str]:
+        """Variables that may be read before any write from the entry paragraph."""
+        if not self.program.paragraphs:
+            return []
+        entry = self.program.paragraphs[0].name
+        use, defs = self._live[entry]
+        live = use | (self.live_out[self._node[entry]] & ~defs)
+        return [self.symbols.names[var] for var in bits(live)]
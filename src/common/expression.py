@@ -0,0 +1,177 @@
+import re
+from decimal import Decimal, Inexact, InvalidOperation, localcontext
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+NAME_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9\-]*')
+
+# Binding power of binary operators; relations bind loosest
+BINARY_PRECEDENCE = {'>': 1, '<': 1, '=': 1, '>=': 1, '<=': 1,
+                     '+': 2, '-': 2,
+                     '*': 3, '/': 3}
+UNARY_PRECEDENCE = 4
+ARITHMETIC = {'+': Decimal.__add__, '-': Decimal.__sub__, '*': Decimal.__mul__, '/': Decimal.__truediv__}
+
+
+class Unary(NamedTuple):
+    op: str
+    operand: 'Tree'
+
+
+class Binary(NamedTuple):
+    op: str
+    left: 'Tree'
+    right: 'Tree'
+
+
+# Leaves are names (str) and numeric literals (Decimal)
+Tree = Union[str, Decimal, Unary, Binary]
+
+
+def _leaf(term: str) -> Union[str, Decimal]:
+    if term[0].isalpha():
+        return term
+    try:
+        return Decimal(term)
+    except InvalidOperation:
+        return term
+
+
+class _TreeBuilder:
+    """Precedence climbing over the terms of an expression or condition."""
+
+    def __init__(self, terms: Sequence[str]):
+        self.terms = terms
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.terms[self.pos] if self.pos < len(self.terms) else None
+
+    def _next(self) -> str:
+        term = self._peek()
+        if term is None:
+            raise ValueError('expression ends early')
+        self.pos += 1
+        return term
+
+    def build(self) -> Tree:
+        tree = self._expression(0)
+        if self.pos != len(self.terms):
+            raise ValueError(f'unexpected {self.terms[self.pos]!r}')
+        return tree
+
+    def _expression(self, min_precedence: int) -> Tree:
+        left = self._primary()
+        while True:
+            op = self._peek()
+            precedence = BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence <= min_precedence:
+                return left
+            self.pos += 1
+            # Left associative: the right side only takes tighter operators
+            left = Binary(op, left, self._expression(precedence))
+
+    def _primary(self) -> Tree:
+        term = self._next()
+        if term in ('+', '-'):
+            return Unary(term, self._expression(UNARY_PRECEDENCE - 1))
+        if term == '(':
+            tree = self._expression(0)
+            if self._next() != ')':
+                raise ValueError('unbalanced parentheses')
+            return tree
+        if term in BINARY_PRECEDENCE or term == ')':
+            raise ValueError(f'unexpected {term!r}')
+        return _leaf(term)
+
+
+class Expression(str):
+    """An arithmetic expression or condition. It is the text the parser
+    always produced (terms joined by spaces), with its operator-precedence
+    tree and the names it reads worked out once at parse time. tree is None
+    when the terms do not form an expression."""
+
+    def __new__(cls, text: str, tree: Optional[Tree], names: Tuple[str, ...]):
+        self = super().__new__(cls, text)
+        self.tree = tree
+        self.names = names
+        return self
+
+    def __getnewargs__(self):
+        return str(self), self.tree, self.names
+
+    @classmethod
+    def parse(cls, terms: List[str]) -> 'Expression':
+        try:
+            tree = _TreeBuilder(terms).build()
+        except ValueError:
+            tree = None
+        names = tuple(dict.fromkeys(term for term in terms if term[:1].isalpha()))
+        return cls(' '.join(terms), tree, names)
+
+    def folded(self) -> Optional[Tree]:
+        return None if self.tree is None else fold(self.tree)
+
+
+def operand_names(text: str) -> Sequence[str]:
+    """Names an expression or condition reads; plain strings are scanned."""
+    if isinstance(text, Expression):
+        return text.names
+    return NAME_PATTERN.findall(text)
+
+
+def fold(tree: Tree) -> Tree:
+    """The tree with every all-constant arithmetic subtree evaluated."""
+    if isinstance(tree, Unary):
+        operand = fold(tree.operand)
+        if isinstance(operand, Decimal):
+            return -operand if tree.op == '-' else operand
+        return Unary(tree.op, operand)
+    if isinstance(tree, Binary):
+        left, right = fold(tree.left), fold(tree.right)
+        if tree.op in ARITHMETIC and isinstance(left, Decimal) and isinstance(right, Decimal):
+            value = _evaluate(tree.op, left, right)
+            if value is not None:
+                return value
+        return Binary(tree.op, left, right)
+    return tree
+
+
+def _evaluate(op: str, left: Decimal, right: Decimal) -> Optional[Decimal]:
+    """left op right when exact; None when it would round, as 1 / 3 does,
+    divides by zero or overflows, so the expression is left as written."""
+    with localcontext() as context:
+        context.traps[Inexact] = True
+        try:
+            return ARITHMETIC[op](left, right)
+        except ArithmeticError:
+            return None
+
+
+def render(tree: Tree) -> str:
+    """Infix text of a tree, parenthesized only where precedence needs it."""
+    if isinstance(tree, Unary):
+        operand = render(tree.operand)
+        if isinstance(tree.operand, Binary):
+            operand = f'({operand})'
+        return f'{tree.op}{operand}'
+    if isinstance(tree, Binary):
+        precedence = BINARY_PRECEDENCE[tree.op]
+        left, right = render(tree.left), render(tree.right)
+        if isinstance(tree.left, Binary) and BINARY_PRECEDENCE[tree.left.op] < precedence:
+            left = f'({left})'
+        if isinstance(tree.right, Binary) and BINARY_PRECEDENCE[tree.right.op] <= precedence:
+            right = f'({right})'
+        return f'{left} {tree.op} {right}'
+    return str(tree)
+
+
+def complexity(tree: Tree) -> Tuple[int, int]:
+    """Operator count and nesting depth (a lone operand has depth 0)."""
+    if isinstance(tree, Unary):
+        operators, depth = complexity(tree.operand)
+        return operators + 1, depth + 1
+    if isinstance(tree, Binary):
+        left_ops, left_depth = complexity(tree.left)
+        right_ops, right_depth = complexity(tree.right)
+        return left_ops + right_ops + 1, max(left_depth, right_depth) + 1
+    return 0, 0
@@ -1,6 +1,10 @@
+import re
 import sys
+from functools import partial
+from typing import Dict, Iterable, Iterator, Optional, Union
 
 import ply.lex
+from ply.lex import LexToken
 
 class Lexer:
     reserved = {
@@ -105,6 +109,197 @@ class Lexer:
         self.lexer = ply.lex.lex(module=self, debug=False, **kwargs)
         return self.lexer
 
+
+class Scanner:
+    """Single-pass hand-written scanner with the ply lexer interface
+    (input/token/clone/lineno), producing the same tokens as Lexer.
+
+    Accepts a str or any bytes-like object (bytes, mmap, memoryview);
+    bytes-like input is scanned in place and only token values are decoded.
+    With fixed_format=True comments are left to the column-7 indicator
+    (see common.source), so '*' scans as TIMES.
+    """
+
+    WHITESPACE, NEWLINE, COMMENT, QUOTE, ALPHA, DIGIT, RELATION, SINGLE = range(8)
+    SINGLE_TOKENS = {'(': 'LPAREN', ')': 'RPAREN', '=': 'EQUALS', '+': 'PLUS', '-': 'MINUS',
+                     '*': 'TIMES', '/': 'DIVIDE', '.': 'DOT'}
+    RELATION_TOKENS = {'>': ('GT', 'GE'), '<': ('LT', 'LE')}
+
+    KINDS = [None] * 128
+    for _c in ' \t\r':
+        KINDS[ord(_c)] = WHITESPACE
+    KINDS[ord('\n')] = NEWLINE
+    KINDS[ord('"')] = KINDS[ord("'")] = QUOTE
+    for _c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz':
+        KINDS[ord(_c)] = ALPHA
+    for _c in '0123456789':
+        KINDS[ord(_c)] = DIGIT
+    for _c in RELATION_TOKENS:
+        KINDS[ord(_c)] = RELATION
+    for _c in SINGLE_TOKENS:
+        KINDS[ord(_c)] = SINGLE
+    KINDS[ord('*')] = COMMENT
+    del _c
+    FIXED_KINDS = list(KINDS)
+    FIXED_KINDS[ord('*')] = SINGLE
+
+    PATTERNS = {
+        'whitespace': r'[ \t\r]+',
+        'newline': r'\n+',
+        'comment': r'\*.*',
+        'string': r'\"[^\"]*\"|\'[^\']*\'',
+        'identifier': r'[A-Za-z][A-Za-z0-9\-]*',
+        'number': r'\d+\.\d+|\d+',
+    }
+    STR_PATTERNS = {name: re.compile(rule) for name, rule in PATTERNS.items()}
+    BYTES_PATTERNS = {name: re.compile(rule.encode()) for name, rule in PATTERNS.items()}
+
+    def __init__(self, fixed_format: bool = False):
+        self.fixed_format = fixed_format
+        self.kinds = self.FIXED_KINDS if fixed_format else self.KINDS
+        self.lineno = 1
+        self.lexpos = 0
+        self.lexdata: Union[str, memoryview] = ''
+        self._tokens: Optional[Iterator[LexToken]] = None
+        # Identifier spelling -> token type for the current input, so each
+        # distinct spelling pays for .upper() and the reserved lookup once.
+        # Reset by every input, as pooled scanners outlive many members.
+        self.word_types: Dict[str, str] = {}
+
+    def input(self, data):
+        if not isinstance(data, str):
+            data = memoryview(data)
+        self.lexdata = data
+        self.lexpos = 0
+        self.word_types = {}
+        self._tokens = self._scan(data)
+        # Bound per input so each token() call is a single C-level next().
+        self.token = partial(next, self._tokens, None)
+
+    def input_lines(self, lines: Iterable):
+        """Scan an iterable of newline-free lines (str or bytes-like) without
+        joining them; line numbers and lexpos are as if joined with '\\n'."""
+        self.lexdata = None
+        self.lexpos = 0
+        self.word_types = {}
+        self._tokens = self._scan_lines(lines)
+        self.token = partial(next, self._tokens, None)
+
+    def token(self) -> Optional[LexToken]:
+        return None
+
+    def clone(self) -> 'Scanner':
+        return Scanner(self.fixed_format)
+
+    def __iter__(self):
+        return self._tokens
+
+    def _scan_lines(self, lines: Iterable) -> Iterator[LexToken]:
+        offset = 0
+        for line in lines:
+            if not isinstance(line, str):
+                line = memoryview(line)
+            yield from self._scan(line, offset)
+            offset += len(line) + 1
+            self.lineno += 1
+
+    def _scan(self, data, offset: int = 0) -> Iterator[LexToken]:
+        text = isinstance(data, str)
+        patterns = self.STR_PATTERNS if text else self.BYTES_PATTERNS
+        skip_ws = patterns['whitespace'].match
+        newlines = patterns['newline'].match
+        comment = patterns['comment'].match
+        string = patterns['string'].match
+        identifier = patterns['identifier'].match
+        number = patterns['number'].match
+        kinds, singles, relations = self.kinds, self.SINGLE_TOKENS, self.RELATION_TOKENS
+        word_types, reserved = self.word_types, Lexer.reserved
+        WHITESPACE, NEWLINE, COMMENT, QUOTE, ALPHA, DIGIT, RELATION, SINGLE = range(8)
+        equals = '=' if text else ord('=')
+        new_token = LexToken
+        pos, end = 0, len(data)
+        lineno = self.lineno
+
+        while pos < end:
+            code = ord(data[pos]) if text else data[pos]
+            kind = kinds[code] if code < 128 else None
+
+            if kind == WHITESPACE:
+                pos = skip_ws(data, pos).end()
+                continue
+            if kind == NEWLINE:
+                m = newlines(data, pos)
+                lineno += m.end() - pos
+                self.lineno = lineno
+                pos = m.end()
+                continue
+            if kind == COMMENT:
+                pos = comment(data, pos).end()
+                continue
+
+            tok = new_token()
+            tok.lineno = lineno
+            tok.lexpos = offset + pos
+            if kind == ALPHA:
+                m = identifier(data, pos)
+                word = m.group() if text else m.group().decode('ascii')
+                tok_type = word_types.get(word)
+                if tok_type is None:
+                    tok_type = word_types[word] = reserved.get(word.upper(), 'IDENTIFIER')
+                tok.type = tok_type
+                tok.value = word
+                pos = m.end()
+            elif kind == SINGLE:
+                char = chr(code)
+                tok.type = singles[char]
+                tok.value = char
+                pos += 1
+            elif kind == DIGIT or (kind is None and number(data, pos)):
+                m = number(data, pos)
+                value = m.group() if text else m.group().decode('ascii')
+                tok.type = 'NUMBER'
+                tok.value = float(value) if '.' in value else int(value)
+                pos = m.end()
+            elif kind == QUOTE and (m := string(data, pos)):
+                value = m.group()[1:-1]
+                tok.type = 'STRING'
+                tok.value = value if text else value.decode('utf-8')
+                pos = m.end()
+            elif kind == RELATION:
+                char = chr(code)
+                if pos + 1 < end and data[pos + 1] == equals:
+                    tok.type, tok.value = relations[char][1], char + '='
+                    pos += 2
+                else:
+                    tok.type, tok.value = relations[char][0], char
+                    pos += 1
+            else:
+                char = data[pos] if text else chr(code)
+                print(f"Illegal character '{char}' at line {lineno}")
+                pos += 1
+                continue
+
+            self.lexpos = offset + pos
+            yield tok
+        self.lexpos = offset + pos
+
+
+class ScanLexer:
+    """Drop-in alternative to Lexer backed by the hand-written Scanner."""
+
+    tokens = Lexer.tokens
+    reserved = Lexer.reserved
+
+    def __init__(self):
+        self.lexer = None
+
+    def build(self, **kwargs):
+        self.lexer = Scanner()
+        return self.lexer
+
+
+LEXER_ENGINES = {'ply': Lexer, 'scan': ScanLexer}
+
 if __name__ == '__main__':
     if len(sys.argv) != 2:
         print(f'usage: {sys.argv[0]} <filename>', file=sys.stderr )
@@ -0,0 +1,222 @@
+import asyncio
+import math
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, Type
+
+from common import profiling
+from common.response_cache import ResponseCache, response_key
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    GOOGLE_RETRYABLE: Tuple[Type[BaseException], ...] = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+except ImportError:
+    GOOGLE_RETRYABLE = ()
+
+RETRYABLE_ERRORS = (TimeoutError, ConnectionError) + GOOGLE_RETRYABLE
+CHARS_PER_TOKEN = 4
+
+
+TOKEN_PIECES = re.compile(r'[A-Za-z]+|\d+|\s+|[^A-Za-z\d\s]')
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model token count: words cost a token per four letters,
+    digit runs one per three digits, and every whitespace run or punctuation
+    character one token, as in common BPE vocabularies."""
+    tokens = 0
+    for piece in TOKEN_PIECES.findall(text):
+        first = piece[0]
+        if first.isalpha():
+            tokens += math.ceil(len(piece) / CHARS_PER_TOKEN)
+        elif first.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        else:
+            tokens += 1
+    return tokens
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding up to `per_minute` units."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.available = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.available >= amount else (amount - self.available) / self.rate
+
+    def take(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits; None disables either."""
+
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+    def bind_loop(self):
+        """asyncio primitives belong to one event loop; start fresh for a new one."""
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        # Waiters are served in arrival order so a large prompt is not starved
+        async with self._lock:
+            while True:
+                wait = max(self.requests.wait_time(1) if self.requests else 0.0,
+                           self.tokens.wait_time(tokens) if self.tokens else 0.0)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class LLMClient:
+    """Model wrapper shared by the LLM analyzers: a blocking call for
+    document(), and a bounded, rate limited, retrying one for document_async()."""
+
+    def __init__(self, model, max_concurrency: int = 8, limiter: RateLimiter = None, retry: RetryPolicy = None,
+                 cache: ResponseCache = None):
+        self.model = model
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.limiter = limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.model, 'model_name', type(self.model).__name__)
+
+    def generate(self, prompt: str) -> str:
+        key, text = self._cached(prompt)
+        if text is None:
+            start = time.perf_counter()
+            with profiling.span('llm.request'):
+                text = self.model.generate_content(prompt).text
+            self._profile(prompt, text, time.perf_counter() - start)
+            self._store(key, text)
+        return text
+
+    @staticmethod
+    def _profile(prompt: str, text: str, seconds: float):
+        if profiling.active():
+            profiling.count('llm requests')
+            profiling.count('prompt chars', len(prompt))
+            profiling.count('response chars', len(text))
+            profiling.count('llm latency ms', seconds * 1000)
+
+    def _cached(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        key = response_key(self.model_name, prompt)
+        return key, self.cache.get(key)
+
+    def _store(self, key: Optional[str], text: str):
+        if key is not None:
+            self.cache.put(key, text)
+
+    async def _call(self, prompt: str):
+        if hasattr(self.model, 'generate_content_async'):
+            return await self.model.generate_content_async(prompt)
+        return await asyncio.to_thread(self.model.generate_content, prompt)
+
+    async def generate_async(self, prompt: str) -> str:
+        key, text = self._cached(prompt)
+        if text is not None:
+            return text
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.limiter.bind_loop()
+        tokens = estimate_tokens(prompt)
+        async with self._semaphore:
+            for attempt in range(self.retry.max_retries + 1):
+                await self.limiter.acquire(tokens)
+                start = time.perf_counter()
+                try:
+                    with profiling.span('llm.request', attempt=attempt):
+                        response = await self._call(prompt)
+                    self._profile(prompt, response.text, time.perf_counter() - start)
+                    self._store(key, response.text)
+                    return response.text
+                except RETRYABLE_ERRORS:
+                    if attempt == self.retry.max_retries:
+                        raise
+                await asyncio.sleep(self.retry.delay(attempt))
+
+
+class StubModelError(ConnectionError):
+    pass
+
+
+@dataclass
+class StubResponse:
+    text: str
+
+
+class StubModel:
+    """Offline stand-in for genai.GenerativeModel with configurable latency
+    (fixed plus optionally per prompt token) and a rate of transient
+    (retryable) failures."""
+
+    def __init__(self, latency: float = 0.1, error_rate: float = 0.0, seed: int = None,
+                 model_name: str = 'stub', seconds_per_token: float = 0.0):
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.error_rate = error_rate
+        self.model_name = model_name
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def _respond(self, prompt: str) -> StubResponse:
+        self.calls += 1
+        if self._random.random() < self.error_rate:
+            raise StubModelError('stub model transient failure')
+        return StubResponse(f"Stub documentation ({estimate_tokens(prompt)} prompt tokens)\n")
+
+    def _delay(self, prompt: str) -> float:
+        return self.latency + self.seconds_per_token * estimate_tokens(prompt) if self.seconds_per_token else self.latency
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        time.sleep(self._delay(prompt))
+        return self._respond(prompt)
+
+    async def generate_content_async(self, prompt: str) -> StubResponse:
+        await asyncio.sleep(self._delay(prompt))
+        return self._respond(prompt)
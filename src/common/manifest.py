@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from common.ast_encoding import referenced_names
+from common.callgraph import CallGraph
+from common.util import Paragraph, Program, Variable
+
+MANIFEST_VERSION = 3
+# Path of the member being documented, set by the batch runner for the task
+# or thread documenting it, since LLM analyzers serve many members at once
+current_input: ContextVar[Optional[str]] = ContextVar('current_input', default=None)
+
+
+def _digest(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def paragraph_hash(paragraph: Paragraph) -> str:
+    return _digest(repr(paragraph))
+
+
+def variable_hash(variable: Variable) -> str:
+    return _digest(repr(variable))
+
+
+def neighbourhood_keys(program: Program) -> Dict[str, str]:
+    """Per paragraph, a hash of its own content, the paragraphs it performs
+    and is performed by, and the definitions of the variables it uses.
+    A paragraph whose key is unchanged renders to the same fragment."""
+    nodes = CallGraph(program).nodes
+    variables = {var.name: variable_hash(var) for var in program.variables}
+    keys = {}
+    for para in program.paragraphs:
+        used = sorted(name for name in referenced_names(para) if name in variables)
+        keys[para.name] = _digest(
+            paragraph_hash(para),
+            ','.join(sorted(nodes[para.name]['calls'])),
+            ','.join(sorted(nodes[para.name]['called_by'])),
+            ','.join(f'{name}={variables[name]}' for name in used))
+    return keys
+
+
+@dataclass
+class ReuseStats:
+    reused: int = 0
+    total: int = 0
+
+    def add(self, reused: int, total: int):
+        self.reused += reused
+        self.total += total
+
+    def __str__(self) -> str:
+        return f"{self.reused} of {self.total} paragraphs reused"
+
+
+class ProgramManifest:
+    """Per-program record of the previous run: content hashes of every
+    paragraph and variable, plus the fragments rendered from them, so the
+    next run only recomputes what changed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.paragraphs: Dict[str, dict] = {}
+        self.variables: Dict[str, str] = {}
+        self.chunks: List[dict] = []
+
+    @classmethod
+    def load(cls, directory: str, analyzer_name: str, program_name: str,
+             input_path: str = None) -> 'ProgramManifest':
+        """The manifest of program_name as read from input_path, by default
+        current_input, so members sharing a PROGRAM-ID keep their own."""
+        input_path = input_path or current_input.get()
+        name = program_name
+        if input_path is not None:
+            name += '-' + _digest(os.path.abspath(input_path))[:12]
+        manifest = cls(os.path.join(directory, analyzer_name, f'{name}.json'))
+        try:
+            with open(manifest.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get('version') == MANIFEST_VERSION:
+            manifest.paragraphs = data.get('paragraphs', {})
+            manifest.variables = data.get('variables', {})
+            manifest.chunks = data.get('chunks', [])
+        return manifest
+
+    def record_program(self, program: Program):
+        self.variables = {var.name: variable_hash(var) for var in program.variables}
+        live = {para.name for para in program.paragraphs}
+        self.paragraphs = {name: entry for name, entry in self.paragraphs.items() if name in live}
+        for para in program.paragraphs:
+            self.paragraphs.setdefault(para.name, {})['hash'] = paragraph_hash(para)
+
+    def fragment(self, paragraph_name: str, key: str) -> Optional[List[str]]:
+        entry = self.paragraphs.get(paragraph_name)
+        if entry and entry.get('key') == key and 'fragment' in entry:
+            return entry['fragment']
+        return None
+
+    def store_fragment(self, paragraph_name: str, key: str, fragment: List[str]):
+        entry = self.paragraphs.setdefault(paragraph_name, {})
+        entry['key'] = key
+        entry['fragment'] = fragment
+
+    def chunk_notes(self, digest: str) -> Optional[str]:
+        for chunk in self.chunks:
+            if chunk.get('digest') == digest:
+                return chunk['notes']
+        return None
+
+    def reusable_groups(self, keys: Dict[str, str]) -> List[List[str]]:
+        """Previous chunks whose paragraphs all kept their neighbourhood key."""
+        return [chunk['paragraphs'] for chunk in self.chunks
+                if [keys.get(name) for name in chunk['paragraphs']] == chunk['keys']]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {'version': MANIFEST_VERSION, 'paragraphs': self.paragraphs,
+                'variables': self.variables, 'chunks': self.chunks}
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest', dir=os.path.dirname(self.path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from common import profiling
+from common.parser import get_parser, grammar_fingerprint
+from common.source import parse_fixed_format
+from common.util import Program, cache_root
+
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+# Bump when the AST the parser builds changes shape without a grammar change
+AST_VERSION = 1
+
+
+def default_cache_path() -> str:
+    return os.path.join(cache_root(), 'parsed_programs.sqlite3')
+
+
+def cache_version() -> str:
+    return f'{AST_VERSION}:{grammar_fingerprint()}'
+
+
+def source_key(source: str, fixed_format: bool = False) -> str:
+    # The same text lexes differently as fixed format ('*' is always TIMES)
+    prefix = b'fixed\0' if fixed_format else b''
+    return hashlib.sha256(prefix + source.encode()).hexdigest()
+
+
+def file_key(path: str) -> str:
+    """Hash of a fixed-format member's raw bytes, read in blocks without decoding."""
+    digest = hashlib.sha256(b'fixed-file\0')
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(2 ** 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Single-file SQLite store of pickled Program ASTs with size-bounded
+    LRU eviction, keyed by source hash. Entries written under another AST
+    version or grammar are dropped when the cache is opened.
+
+    Safe to open from several processes at once; failed parses are not stored.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.version = cache_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS programs ('
+                         'key TEXT PRIMARY KEY, version TEXT NOT NULL, value BLOB NOT NULL, '
+                         'size INTEGER NOT NULL, accessed REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS programs_accessed ON programs (accessed)')
+        # Running total of programs.size, kept with every insert and delete
+        self._db.execute('CREATE TABLE IF NOT EXISTS total (id INTEGER PRIMARY KEY CHECK (id = 0), '
+                         'size INTEGER NOT NULL)')
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            stale = self._db.execute('DELETE FROM programs WHERE version != ?', (self.version,)).rowcount
+            if stale or self._total() is None:
+                self._db.execute('INSERT OR REPLACE INTO total (id, size) '
+                                 'SELECT 0, COALESCE(SUM(size), 0) FROM programs')
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def get(self, key: str, count: bool = True) -> Optional[Program]:
+        """count=False leaves the lookup out of hits and misses."""
+        with self._lock:
+            row = self._db.execute('SELECT value FROM programs WHERE key = ? AND version = ?',
+                                   (key, self.version)).fetchone()
+            if row is None:
+                self.misses += count
+                return None
+            self.hits += count
+            self._db.execute('UPDATE programs SET accessed = ? WHERE key = ?', (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key: str, program: Program):
+        value = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            # Other processes store and evict too, so the size is only known inside the write lock
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute('SELECT size FROM programs WHERE key = ?', (key,)).fetchone()
+                self._db.execute('INSERT OR REPLACE INTO programs (key, version, value, size, accessed) '
+                                 'VALUES (?, ?, ?, ?, ?)', (key, self.version, value, len(value), time.time()))
+                total = self._total() + len(value) - (row[0] if row else 0)
+                self._db.execute('UPDATE total SET size = ?', (total,))
+                if total > self.max_bytes:
+                    self._evict(total)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+
+    def _total(self) -> Optional[int]:
+        row = self._db.execute('SELECT size FROM total').fetchone()
+        return row[0] if row else None
+
+    def _evict(self, total: int):
+        while total > self.max_bytes:
+            oldest = self._db.execute('SELECT key, size FROM programs ORDER BY accessed LIMIT 64').fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute('DELETE FROM programs WHERE key = ?', (key,))
+                total -= size
+        self._db.execute('UPDATE total SET size = ?', (total,))
+
+    def parse(self, source: str, fixed_format: bool = False, count: bool = True) -> Optional[Program]:
+        """The cached AST of source, parsing and storing it on a miss."""
+        return self._cached(source_key(source, fixed_format), lambda: get_parser().parse(source, fixed_format), count)
+
+    def parse_file(self, path: str) -> Optional[Program]:
+        """The cached AST of a fixed-format member, parsed off its memory mapping on a miss."""
+        return self._cached(file_key(path), lambda: parse_fixed_format(path))
+
+    def _cached(self, key: str, parse: Callable[[], Optional[Program]], count: bool = True) -> Optional[Program]:
+        with profiling.span('parse_cache.get'):
+            program = self.get(key, count)
+        if program is None:
+            program = parse()
+            if program is not None:
+                self.put(key, program)
+        return program
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM programs').fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+def hit_rate_report(hits: int, misses: int) -> str:
+    lookups = hits + misses
+    rate = hits / lookups if lookups else 0.0
+    return f"Parse cache: {hits} hits, {misses} misses ({rate:.0%} hit rate)"
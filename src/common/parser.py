@@ -1,24 +1,37 @@
+import copy
+import hashlib
+import inspect
+import marshal
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+
+import ply.lex
 from ply import yacc
 from ply.yacc import LRParser
 
-from common.lexer import Lexer
-from common.util import Program, Variable, Paragraph, Statement
+from common import expression, profiling, util
+from common.ast_encoding import walk_statements
+from common.expression import Expression
+from common.lexer import LEXER_ENGINES, Lexer, Scanner
+from common.util import Program, Variable, Paragraph, Statement, cache_root
 
 
 class Parser:
     tokens = Lexer.tokens
 
-    def __init__(self):
-        self.lexer = Lexer()
+    def __init__(self, engine: str = 'ply'):
+        self.lexer = LEXER_ENGINES[engine]()
         self.lexer.build()
         self.parser = None
-        self.program = None
-        self.current_paragraph = None
 
     def p_program(self, p):
         '''program : identification_division data_division procedure_division'''
-        self.program = Program(name=p[1], variables=p[2], paragraphs=p[3])
-        p[0] = self.program
+        p[0] = Program(name=p[1], variables=p[2], paragraphs=p[3])
 
     def p_identification_division(self, p):
         '''identification_division : IDENTIFICATION DIVISION DOT PROGRAM_ID DOT IDENTIFIER DOT'''
@@ -37,7 +50,8 @@ class Parser:
         '''variable_list : variable_list variable
                         | variable'''
         if len(p) == 3:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
         else:
             p[0] = [p[1]]
 
@@ -71,15 +85,7 @@ class Parser:
                          | NUMBER LPAREN NUMBER RPAREN IDENTIFIER LPAREN NUMBER RPAREN
                          | NUMBER LPAREN NUMBER RPAREN IDENTIFIER NUMBER LPAREN NUMBER RPAREN'''
         # Reconstruct the picture string from the tokens
-        pic_str = ''
-        for i in range(1, len(p)):
-            if p[i] == '(':
-                pic_str += '('
-            elif p[i] == ')':
-                pic_str += ')'
-            else:
-                pic_str += str(p[i])
-        p[0] = pic_str
+        p[0] = ''.join(str(p[i]) for i in range(1, len(p)))
 
     def p_value_clause(self, p):
         '''value_clause : VALUE NUMBER
@@ -96,7 +102,8 @@ class Parser:
         '''paragraph_list : paragraph_list paragraph
                          | paragraph'''
         if len(p) == 3:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
         else:
             p[0] = [p[1]]
 
@@ -111,7 +118,8 @@ class Parser:
         if p[1] is None:
             p[0] = []
         elif len(p) == 3:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
         else:
             p[0] = [p[1]]
 
@@ -160,15 +168,16 @@ class Parser:
         '''statement : COMPUTE IDENTIFIER EQUALS expression_list DOT
                      | COMPUTE IDENTIFIER EQUALS expression_list
                      '''
-        p[0] = Statement('COMPUTE', {'target': p[2], 'expression': p[4]})
+        p[0] = Statement('COMPUTE', {'target': p[2], 'expression': Expression.parse(p[4])})
 
     def p_expression_list(self, p):
         '''expression_list : expression_list expression_term
                           | expression_term'''
         if len(p) == 3:
-            p[0] = p[1] + ' ' + p[2]
-        else:
+            p[1].append(p[2])
             p[0] = p[1]
+        else:
+            p[0] = [p[1]]
 
     def p_expression_term(self, p):
         '''expression_term : IDENTIFIER
@@ -203,7 +212,7 @@ class Parser:
                     | IDENTIFIER EQUALS IDENTIFIER
                     | IDENTIFIER GE IDENTIFIER
                     | IDENTIFIER LE IDENTIFIER'''
-        p[0] = f"{p[1]} {p[2]} {p[3]}"
+        p[0] = Expression.parse([p[1], p[2], str(p[3])])
 
     def p_statement_if(self, p):
         '''statement : IF condition THEN statement_list END_IF DOT
@@ -242,9 +251,150 @@ class Parser:
         self.parser = yacc.yacc(module=self, **kwargs)
         return self.parser
 
-    def parse(self, code):
-        self.parser.parse(code, lexer=self.lexer.lexer, tracking=True)
-        return self.program
+    def new_pair(self) -> Tuple[Union[ply.lex.Lexer, Scanner], LRParser]:
+        """Fresh lexer/parser state sharing this parser's compiled regexes and tables."""
+        return self.lexer.lexer.clone(), copy.copy(self.parser)
+
+    @staticmethod
+    def run(pair: Tuple[Union[ply.lex.Lexer, Scanner], LRParser], code: str) -> Optional[Program]:
+        lexer, parser = pair
+        lexer.lineno = 1
+        profiler = profiling.active()
+        if profiler is not None:
+            return profiled_parse(profiler, parser, lexer, code)
+        return parser.parse(code, lexer=lexer, tracking=True)
+
+    def parse(self, code, fixed_format: bool = False) -> Optional[Program]:
+        """Reentrant: every call gets its own lexer and parser state, so a
+        failed parse returns None rather than a previous Program.
+        fixed_format code is normalized fixed-format text (see common.source),
+        scanned like parse_lines() does."""
+        if fixed_format:
+            return self.run((Scanner(fixed_format=True), copy.copy(self.parser)), code)
+        return self.run(self.new_pair(), code)
+
+    def parse_lines(self, lines: Iterable) -> Optional[Program]:
+        """Parse normalized fixed-format lines (see common.source) as they
+        stream in; always uses the Scanner engine, where '*' is TIMES."""
+        lexer = Scanner(fixed_format=True)
+        lexer.input_lines(lines)
+        profiler = profiling.active()
+        if profiler is not None:
+            return profiled_parse(profiler, copy.copy(self.parser), lexer, None)
+        return copy.copy(self.parser).parse(None, lexer=lexer, tracking=True)
+
+
+def profiled_parse(profiler: profiling.Profiler, parser: LRParser, lexer, code: Optional[str]) -> Optional[Program]:
+    """Parse with the lexer's share of the time and its tokens counted. PLY
+    pulls tokens as it parses, so lexing is recorded as one span of the
+    summed token time at the start of the parse. code None means the
+    lexer already has its input."""
+    if code is not None:
+        # Scanner.input rebinds token, so the input goes in before wrapping it
+        lexer.input(code)
+    token = lexer.token
+    tokens, lex_seconds = 0, 0.0
+
+    def timed_token():
+        nonlocal tokens, lex_seconds
+        start = time.perf_counter()
+        tok = token()
+        lex_seconds += time.perf_counter() - start
+        tokens += tok is not None
+        return tok
+
+    start = time.perf_counter()
+    with profiler.span('parse'):
+        program = parser.parse(None, lexer=lexer, tokenfunc=timed_token, tracking=True)
+    profiler.record('lex', start, lex_seconds)
+    profiler.count('tokens lexed', tokens)
+    if program is not None:
+        profiler.count('statements parsed', sum(1 for para in program.paragraphs
+                                                for _ in walk_statements(para.statements)))
+    return program
+
+
+def _source(obj) -> bytes:
+    """Source of a function, class or module, or its compiled form when no source ships."""
+    try:
+        return inspect.getsource(obj).encode()
+    except (OSError, TypeError):
+        if inspect.ismodule(obj):
+            with open(obj.__file__, 'rb') as f:
+                return f.read()
+        if inspect.isclass(obj):
+            return b''.join(_source(member) for _, member in sorted(vars(obj).items()) if inspect.isfunction(member))
+        return marshal.dumps(obj.__code__)
+
+
+@lru_cache(maxsize=None)
+def grammar_fingerprint() -> str:
+    """Hash of everything that decides the AST a source parses to: the
+    grammar productions and their actions, the lexer rules and scanner,
+    the modules defining the AST nodes and the PLY table version."""
+    digest = hashlib.sha256()
+    digest.update(yacc.__tabversion__.encode())
+    for name in sorted(dir(Parser)):
+        if name.startswith('p_'):
+            digest.update(name.encode())
+            digest.update(_source(getattr(Parser, name)))
+    for name in sorted(dir(Lexer)):
+        if name.startswith('t_'):
+            rule = getattr(Lexer, name)
+            digest.update(name.encode())
+            digest.update(rule.encode() if isinstance(rule, str) else _source(rule))
+    digest.update(repr(sorted(Lexer.reserved.items())).encode())
+    digest.update(_source(Scanner))
+    for module in (expression, util):
+        digest.update(_source(module))
+    return digest.hexdigest()[:16]
+
+
+def default_cache_dir() -> str:
+    return os.path.join(cache_root(), 'parser', grammar_fingerprint())
+
+
+@lru_cache(maxsize=None)
+def get_parser(cache_dir: str = None, engine: str = 'ply') -> Parser:
+    """Process-wide parser whose LALR tables are built once and cached on disk."""
+    cache_dir = cache_dir or default_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    parser = Parser(engine)
+    parser.build(debug=False, optimize=True, write_tables=False,
+                 picklefile=os.path.join(cache_dir, 'parsetab.pickle'))
+    return parser
+
+
+def parse_source(code: str) -> Optional[Program]:
+    """Module-level entry point, picklable for process pool workers."""
+    return get_parser().parse(code)
+
+
+class ParserPool:
+    """Prebuilt lexer/parser pairs handed out to concurrent parses."""
+
+    def __init__(self, size: int = None, parser: Parser = None):
+        parser = parser or get_parser()
+        self.size = size or os.cpu_count() or 1
+        self._pairs = queue.LifoQueue()
+        for _ in range(self.size):
+            self._pairs.put(parser.new_pair())
+
+    @contextmanager
+    def acquire(self):
+        pair = self._pairs.get()
+        try:
+            yield pair
+        finally:
+            self._pairs.put(pair)
+
+    def parse(self, code: str) -> Optional[Program]:
+        with self.acquire() as pair:
+            return Parser.run(pair, code)
+
+    def parse_all(self, codes: Iterable[str]) -> List[Optional[Program]]:
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(self.parse, codes))
 
 if __name__ == '__main__':
     import sys
@@ -0,0 +1,115 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ADD BY COMPUTE DATA DISPLAY DIVIDE DIVISION DOT ELSE END_IF EQUALS EXIT FROM GE GIVING GOBACK GT IDENTIFICATION IDENTIFIER IF LE LPAREN LT MINUS MOVE MULTIPLY NUMBER PERFORM PIC PICTURE PLUS PROCEDURE PROGRAM_ID RPAREN RUN SECTION STOP STRING SUBTRACT THEN THRU TIMES TO UNTIL VALUE WORKING_STORAGEprogram : identification_division data_division procedure_divisionidentification_division : IDENTIFICATION DIVISION DOT PROGRAM_ID DOT IDENTIFIER DOTdata_division : DATA DIVISION DOT WORKING_STORAGE SECTION DOT variable_list\n                        | DATA DIVISION DOTvariable_list : variable_list variable\n                        | variablevariable : NUMBER IDENTIFIER picture_clause value_clause DOT\n                   | NUMBER IDENTIFIER picture_clause DOT\n                   | NUMBER IDENTIFIER value_clause DOT\n                   | NUMBER IDENTIFIER DOTpicture_clause : PIC picture_string\n                         | PICTURE picture_stringpicture_string : IDENTIFIER\n                         | IDENTIFIER LPAREN NUMBER RPAREN\n                         | IDENTIFIER LPAREN NUMBER RPAREN IDENTIFIER\n                         | IDENTIFIER LPAREN NUMBER RPAREN IDENTIFIER LPAREN NUMBER RPAREN\n                         | NUMBER LPAREN NUMBER RPAREN\n                         | NUMBER LPAREN NUMBER RPAREN IDENTIFIER\n                         | NUMBER LPAREN NUMBER RPAREN IDENTIFIER LPAREN NUMBER RPAREN\n                         | NUMBER LPAREN NUMBER RPAREN IDENTIFIER NUMBER LPAREN NUMBER RPARENvalue_clause : VALUE NUMBER\n                       | VALUE STRING\n                       | VALUE IDENTIFIERprocedure_division : PROCEDURE DIVISION DOT paragraph_listparagraph_list : paragraph_list paragraph\n                         | paragraphparagraph : IDENTIFIER DOT statement_liststatement_list : statement_list statement\n                         | statement\n                         | emptystatement : MOVE IDENTIFIER TO IDENTIFIER DOT\n                    | MOVE NUMBER TO IDENTIFIER DOT\n                    | MOVE STRING TO IDENTIFIER DOTstatement : ADD IDENTIFIER TO IDENTIFIER DOT\n                    | ADD NUMBER TO IDENTIFIER DOT\n                    | ADD IDENTIFIER TO IDENTIFIER GIVING IDENTIFIER DOTstatement : SUBTRACT IDENTIFIER FROM IDENTIFIER DOT\n                    | SUBTRACT NUMBER FROM IDENTIFIER DOT\n                    | SUBTRACT IDENTIFIER FROM IDENTIFIER GIVING IDENTIFIER DOT\n                    | SUBTRACT NUMBER FROM IDENTIFIER GIVING IDENTIFIER DOT\n                    | SUBTRACT IDENTIFIER FROM IDENTIFIER\n                    | SUBTRACT NUMBER FROM IDENTIFIER\n                    | SUBTRACT IDENTIFIER FROM IDENTIFIER GIVING IDENTIFIER\n                    | SUBTRACT NUMBER FROM IDENTIFIER GIVING IDENTIFIER\n                    statement : MULTIPLY IDENTIFIER BY IDENTIFIER DOT\n                    | MULTIPLY NUMBER BY IDENTIFIER DOT\n                    | MULTIPLY IDENTIFIER BY IDENTIFIER GIVING IDENTIFIER DOT\n                    | MULTIPLY NUMBER BY IDENTIFIER GIVING IDENTIFIER DOT\n                    | MULTIPLY IDENTIFIER BY NUMBER GIVING IDENTIFIER DOT\n                    | MULTIPLY NUMBER BY NUMBER GIVING IDENTIFIER DOT\n                    statement : COMPUTE IDENTIFIER EQUALS expression_list DOT\n                     | COMPUTE IDENTIFIER EQUALS expression_list\n                     expression_list : expression_list expression_term\n                          | expression_termexpression_term : IDENTIFIER\n                          | NUMBER\n                          | PLUS\n                          | MINUS\n                          | TIMES\n                          | DIVIDE\n                          | LPAREN\n                          | RPARENstatement : PERFORM IDENTIFIER DOT\n                    | PERFORM IDENTIFIER THRU IDENTIFIER DOT\n                    | PERFORM IDENTIFIER UNTIL condition DOTcondition : IDENTIFIER GT NUMBER\n                    | IDENTIFIER LT NUMBER\n                    | IDENTIFIER EQUALS NUMBER\n                    | IDENTIFIER GE NUMBER\n                    | IDENTIFIER LE NUMBER\n                    | IDENTIFIER GT IDENTIFIER\n                    | IDENTIFIER LT IDENTIFIER\n                    | IDENTIFIER EQUALS IDENTIFIER\n                    | IDENTIFIER GE IDENTIFIER\n                    | IDENTIFIER LE IDENTIFIERstatement : IF condition THEN statement_list END_IF DOT\n                    | IF condition statement_list END_IF DOT\n                    | IF condition THEN statement_list ELSE statement_list END_IF DOTstatement : DISPLAY IDENTIFIER DOT\n                    | DISPLAY STRING DOT\n                    | DISPLAY NUMBER DOTstatement : STOP RUN DOT\n                    | EXIT DOT\n                    | GOBACK DOTempty :'
+    
+_lr_action_items = {'IDENTIFICATION':([0,],[3,]),'$end':([1,7,17,18,22,23,26,27,28,43,61,62,75,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,140,141,142,143,145,146,148,150,154,156,157,158,159,162,167,168,173,177,178,179,180,181,182,183,187,],[0,-1,-24,-26,-25,-85,-27,-29,-30,-28,-83,-84,-63,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,-77,-43,-44,-76,-36,-39,-40,-47,-49,-50,-48,-78,]),'DATA':([2,25,],[5,-2,]),'DIVISION':([3,5,8,],[6,9,11,]),'PROCEDURE':([4,12,40,41,63,91,131,132,163,],[8,-4,-3,-6,-5,-10,-8,-9,-7,]),'DOT':([6,9,11,13,19,20,21,38,39,54,57,58,59,60,64,89,90,95,96,97,98,99,100,101,102,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,121,122,123,124,125,126,127,128,129,130,133,134,136,137,138,139,157,160,166,167,168,169,170,171,172,184,185,186,188,189,196,198,199,],[10,12,14,16,23,24,25,61,62,75,85,86,87,88,91,131,132,140,141,142,143,145,146,148,150,154,-55,156,-54,-56,-57,-58,-59,-60,-61,-62,158,159,162,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,163,-11,-13,-12,-21,-22,-23,-53,173,177,178,179,180,181,182,183,187,-14,-17,-15,-18,-16,-19,-20,]),'PROGRAM_ID':([10,],[13,]),'WORKING_STORAGE':([12,],[15,]),'IDENTIFIER':([14,16,17,18,22,23,26,27,28,29,30,31,32,33,34,35,36,42,43,61,62,65,66,67,68,69,70,71,72,73,74,75,76,77,80,81,82,83,84,85,86,87,88,92,93,94,100,101,106,107,108,109,110,111,112,113,114,115,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,159,162,167,168,173,177,178,179,180,181,182,183,185,186,187,],[19,21,19,-26,-25,-85,-27,-29,-30,44,47,49,51,53,54,56,57,64,-28,-83,-84,95,96,97,98,99,100,101,102,105,106,-63,116,56,120,122,124,126,128,-79,-80,-81,-82,134,134,139,-41,-42,-55,106,-54,-56,-57,-58,-59,-60,-61,-62,-31,-32,-33,-34,166,-35,-37,167,-38,168,-45,169,170,171,-46,172,-51,-53,-64,-65,-77,-43,-44,-76,-36,-39,-40,-47,-49,-50,-48,188,189,-78,]),'SECTION':([15,],[20,]),'MOVE':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[29,29,-29,-30,-28,29,-83,-84,-63,29,29,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,29,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,29,-77,-43,-44,-76,29,-36,-39,-40,-47,-49,-50,-48,-78,]),'ADD':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[30,30,-29,-30,-28,30,-83,-84,-63,30,30,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,30,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,30,-77,-43,-44,-76,30,-36,-39,-40,-47,-49,-50,-48,-78,]),'SUBTRACT':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[31,31,-29,-30,-28,31,-83,-84,-63,31,31,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,31,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,31,-77,-43,-44,-76,31,-36,-39,-40,-47,-49,-50,-48,-78,]),'MULTIPLY':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[32,32,-29,-30,-28,32,-83,-84,-63,32,32,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,32,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,32,-77,-43,-44,-76,32,-36,-39,-40,-47,-49,-50,-48,-78,]),'COMPUTE':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[33,33,-29,-30,-28,33,-83,-84,-63,33,33,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,33,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,33,-77,-43,-44,-76,33,-36,-39,-40,-47,-49,-50,-48,-78,]),'PERFORM':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[34,34,-29,-30,-28,34,-83,-84,-63,34,34,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,34,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,34,-77,-43,-44,-76,34,-36,-39,-40,-47,-49,-50,-48,-78,]),'IF':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[35,35,-29,-30,-28,35,-83,-84,-63,35,35,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,35,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,35,-77,-43,-44,-76,35,-36,-39,-40,-47,-49,-50,-48,-78,]),'DISPLAY':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[36,36,-29,-30,-28,36,-83,-84,-63,36,36,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,36,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,36,-77,-43,-44,-76,36,-36,-39,-40,-47,-49,-50,-48,-78,]),'STOP':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[37,37,-29,-30,-28,37,-83,-84,-63,37,37,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,37,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,37,-77,-43,-44,-76,37,-36,-39,-40,-47,-49,-50,-48,-78,]),'EXIT':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[38,38,-29,-30,-28,38,-83,-84,-63,38,38,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,38,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,38,-77,-43,-44,-76,38,-36,-39,-40,-47,-49,-50,-48,-78,]),'GOBACK':([23,26,27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[39,39,-29,-30,-28,39,-83,-84,-63,39,39,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,39,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,39,-77,-43,-44,-76,39,-36,-39,-40,-47,-49,-50,-48,-78,]),'NUMBER':([24,29,30,31,32,36,40,41,63,72,73,74,80,81,82,83,84,91,92,93,94,106,107,108,109,110,111,112,113,114,115,131,132,157,163,164,165,189,190,192,194,],[42,45,48,50,52,59,42,-6,-5,103,104,109,121,123,125,127,129,-10,135,135,137,-55,109,-54,-56,-57,-58,-59,-60,-61,-62,-8,-9,-53,-7,175,176,191,193,195,197,]),'END_IF':([27,28,43,55,61,62,75,78,79,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,120,121,122,123,124,125,126,127,128,129,140,141,142,143,145,146,148,150,154,156,157,158,159,161,162,167,168,173,174,177,178,179,180,181,182,183,187,],[-29,-30,-28,-85,-83,-84,-63,-85,119,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,160,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,-85,-77,-43,-44,-76,184,-36,-39,-40,-47,-49,-50,-48,-78,]),'ELSE':([27,28,43,61,62,75,78,85,86,87,88,100,101,106,107,108,109,110,111,112,113,114,115,118,140,141,142,143,145,146,148,150,154,156,157,158,159,162,167,168,173,177,178,179,180,181,182,183,187,],[-29,-30,-28,-83,-84,-63,-85,-79,-80,-81,-82,-41,-42,-55,-52,-54,-56,-57,-58,-59,-60,-61,-62,161,-31,-32,-33,-34,-35,-37,-38,-45,-46,-51,-53,-64,-65,-77,-43,-44,-76,-36,-39,-40,-47,-49,-50,-48,-78,]),'STRING':([29,36,94,],[46,58,138,]),'RUN':([37,],[60,]),'TO':([44,45,46,47,48,],[65,66,67,68,69,]),'FROM':([49,50,],[70,71,]),'BY':([51,52,],[72,73,]),'EQUALS':([53,56,],[74,82,]),'THRU':([54,],[76,]),'UNTIL':([54,],[77,]),'THEN':([55,120,121,122,123,124,125,126,127,128,129,],[78,-71,-66,-72,-67,-73,-68,-74,-69,-75,-70,]),'GT':([56,],[80,]),'LT':([56,],[81,]),'GE':([56,],[83,]),'LE':([56,],[84,]),'PIC':([64,],[92,]),'PICTURE':([64,],[93,]),'VALUE':([64,89,133,134,136,185,186,188,189,196,198,199,],[94,94,-11,-13,-12,-14,-17,-15,-18,-16,-19,-20,]),'PLUS':([74,106,107,108,109,110,111,112,113,114,115,157,],[110,-55,110,-54,-56,-57,-58,-59,-60,-61,-62,-53,]),'MINUS':([74,106,107,108,109,110,111,112,113,114,115,157,],[111,-55,111,-54,-56,-57,-58,-59,-60,-61,-62,-53,]),'TIMES':([74,106,107,108,109,110,111,112,113,114,115,157,],[112,-55,112,-54,-56,-57,-58,-59,-60,-61,-62,-53,]),'DIVIDE':([74,106,107,108,109,110,111,112,113,114,115,157,],[113,-55,113,-54,-56,-57,-58,-59,-60,-61,-62,-53,]),'LPAREN':([74,106,107,108,109,110,111,112,113,114,115,134,135,157,188,189,191,],[114,-55,114,-54,-56,-57,-58,-59,-60,-61,-62,164,165,-53,190,192,194,]),'RPAREN':([74,106,107,108,109,110,111,112,113,114,115,157,175,176,193,195,197,],[115,-55,115,-54,-56,-57,-58,-59,-60,-61,-62,-53,185,186,196,198,199,]),'GIVING':([98,100,101,102,103,104,105,],[144,147,149,151,152,153,155,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'identification_division':([0,],[2,]),'data_division':([2,],[4,]),'procedure_division':([4,],[7,]),'paragraph_list':([14,],[17,]),'paragraph':([14,17,],[18,22,]),'statement_list':([23,55,78,161,],[26,79,118,174,]),'statement':([23,26,55,78,79,118,161,174,],[27,43,27,27,43,43,27,43,]),'empty':([23,55,78,161,],[28,28,28,28,]),'variable_list':([24,],[40,]),'variable':([24,40,],[41,63,]),'condition':([35,77,],[55,117,]),'picture_clause':([64,],[89,]),'value_clause':([64,89,],[90,130,]),'expression_list':([74,],[107,]),'expression_term':([74,107,],[108,157,]),'picture_string':([92,93,],[133,136,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> identification_division data_division procedure_division','program',3,'p_program','parser.py',33),
+  ('identification_division -> IDENTIFICATION DIVISION DOT PROGRAM_ID DOT IDENTIFIER DOT','identification_division',7,'p_identification_division','parser.py',37),
+  ('data_division -> DATA DIVISION DOT WORKING_STORAGE SECTION DOT variable_list','data_division',7,'p_data_division','parser.py',42),
+  ('data_division -> DATA DIVISION DOT','data_division',3,'p_data_division','parser.py',43),
+  ('variable_list -> variable_list variable','variable_list',2,'p_variable_list','parser.py',50),
+  ('variable_list -> variable','variable_list',1,'p_variable_list','parser.py',51),
+  ('variable -> NUMBER IDENTIFIER picture_clause value_clause DOT','variable',5,'p_variable','parser.py',59),
+  ('variable -> NUMBER IDENTIFIER picture_clause DOT','variable',4,'p_variable','parser.py',60),
+  ('variable -> NUMBER IDENTIFIER value_clause DOT','variable',4,'p_variable','parser.py',61),
+  ('variable -> NUMBER IDENTIFIER DOT','variable',3,'p_variable','parser.py',62),
+  ('picture_clause -> PIC picture_string','picture_clause',2,'p_picture_clause','parser.py',74),
+  ('picture_clause -> PICTURE picture_string','picture_clause',2,'p_picture_clause','parser.py',75),
+  ('picture_string -> IDENTIFIER','picture_string',1,'p_picture_string','parser.py',79),
+  ('picture_string -> IDENTIFIER LPAREN NUMBER RPAREN','picture_string',4,'p_picture_string','parser.py',80),
+  ('picture_string -> IDENTIFIER LPAREN NUMBER RPAREN IDENTIFIER','picture_string',5,'p_picture_string','parser.py',81),
+  ('picture_string -> IDENTIFIER LPAREN NUMBER RPAREN IDENTIFIER LPAREN NUMBER RPAREN','picture_string',8,'p_picture_string','parser.py',82),
+  ('picture_string -> NUMBER LPAREN NUMBER RPAREN','picture_string',4,'p_picture_string','parser.py',83),
+  ('picture_string -> NUMBER LPAREN NUMBER RPAREN IDENTIFIER','picture_string',5,'p_picture_string','parser.py',84),
+  ('picture_string -> NUMBER LPAREN NUMBER RPAREN IDENTIFIER LPAREN NUMBER RPAREN','picture_string',8,'p_picture_string','parser.py',85),
+  ('picture_string -> NUMBER LPAREN NUMBER RPAREN IDENTIFIER NUMBER LPAREN NUMBER RPAREN','picture_string',9,'p_picture_string','parser.py',86),
+  ('value_clause -> VALUE NUMBER','value_clause',2,'p_value_clause','parser.py',91),
+  ('value_clause -> VALUE STRING','value_clause',2,'p_value_clause','parser.py',92),
+  ('value_clause -> VALUE IDENTIFIER','value_clause',2,'p_value_clause','parser.py',93),
+  ('procedure_division -> PROCEDURE DIVISION DOT paragraph_list','procedure_division',4,'p_procedure_division','parser.py',98),
+  ('paragraph_list -> paragraph_list paragraph','paragraph_list',2,'p_paragraph_list','parser.py',102),
+  ('paragraph_list -> paragraph','paragraph_list',1,'p_paragraph_list','parser.py',103),
+  ('paragraph -> IDENTIFIER DOT statement_list','paragraph',3,'p_paragraph','parser.py',111),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',115),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',116),
+  ('statement_list -> empty','statement_list',1,'p_statement_list','parser.py',117),
+  ('statement -> MOVE IDENTIFIER TO IDENTIFIER DOT','statement',5,'p_statement_move','parser.py',128),
+  ('statement -> MOVE NUMBER TO IDENTIFIER DOT','statement',5,'p_statement_move','parser.py',129),
+  ('statement -> MOVE STRING TO IDENTIFIER DOT','statement',5,'p_statement_move','parser.py',130),
+  ('statement -> ADD IDENTIFIER TO IDENTIFIER DOT','statement',5,'p_statement_add','parser.py',134),
+  ('statement -> ADD NUMBER TO IDENTIFIER DOT','statement',5,'p_statement_add','parser.py',135),
+  ('statement -> ADD IDENTIFIER TO IDENTIFIER GIVING IDENTIFIER DOT','statement',7,'p_statement_add','parser.py',136),
+  ('statement -> SUBTRACT IDENTIFIER FROM IDENTIFIER DOT','statement',5,'p_statement_subtract','parser.py',143),
+  ('statement -> SUBTRACT NUMBER FROM IDENTIFIER DOT','statement',5,'p_statement_subtract','parser.py',144),
+  ('statement -> SUBTRACT IDENTIFIER FROM IDENTIFIER GIVING IDENTIFIER DOT','statement',7,'p_statement_subtract','parser.py',145),
+  ('statement -> SUBTRACT NUMBER FROM IDENTIFIER GIVING IDENTIFIER DOT','statement',7,'p_statement_subtract','parser.py',146),
+  ('statement -> SUBTRACT IDENTIFIER FROM IDENTIFIER','statement',4,'p_statement_subtract','parser.py',147),
+  ('statement -> SUBTRACT NUMBER FROM IDENTIFIER','statement',4,'p_statement_subtract','parser.py',148),
+  ('statement -> SUBTRACT IDENTIFIER FROM IDENTIFIER GIVING IDENTIFIER','statement',6,'p_statement_subtract','parser.py',149),
+  ('statement -> SUBTRACT NUMBER FROM IDENTIFIER GIVING IDENTIFIER','statement',6,'p_statement_subtract','parser.py',150),
+  ('statement -> MULTIPLY IDENTIFIER BY IDENTIFIER DOT','statement',5,'p_statement_multiply','parser.py',158),
+  ('statement -> MULTIPLY NUMBER BY IDENTIFIER DOT','statement',5,'p_statement_multiply','parser.py',159),
+  ('statement -> MULTIPLY IDENTIFIER BY IDENTIFIER GIVING IDENTIFIER DOT','statement',7,'p_statement_multiply','parser.py',160),
+  ('statement -> MULTIPLY NUMBER BY IDENTIFIER GIVING IDENTIFIER DOT','statement',7,'p_statement_multiply','parser.py',161),
+  ('statement -> MULTIPLY IDENTIFIER BY NUMBER GIVING IDENTIFIER DOT','statement',7,'p_statement_multiply','parser.py',162),
+  ('statement -> MULTIPLY NUMBER BY NUMBER GIVING IDENTIFIER DOT','statement',7,'p_statement_multiply','parser.py',163),
+  ('statement -> COMPUTE IDENTIFIER EQUALS expression_list DOT','statement',5,'p_statement_compute','parser.py',168),
+  ('statement -> COMPUTE IDENTIFIER EQUALS expression_list','statement',4,'p_statement_compute','parser.py',169),
+  ('expression_list -> expression_list expression_term','expression_list',2,'p_expression_list','parser.py',174),
+  ('expression_list -> expression_term','expression_list',1,'p_expression_list','parser.py',175),
+  ('expression_term -> IDENTIFIER','expression_term',1,'p_expression_term','parser.py',183),
+  ('expression_term -> NUMBER','expression_term',1,'p_expression_term','parser.py',184),
+  ('expression_term -> PLUS','expression_term',1,'p_expression_term','parser.py',185),
+  ('expression_term -> MINUS','expression_term',1,'p_expression_term','parser.py',186),
+  ('expression_term -> TIMES','expression_term',1,'p_expression_term','parser.py',187),
+  ('expression_term -> DIVIDE','expression_term',1,'p_expression_term','parser.py',188),
+  ('expression_term -> LPAREN','expression_term',1,'p_expression_term','parser.py',189),
+  ('expression_term -> RPAREN','expression_term',1,'p_expression_term','parser.py',190),
+  ('statement -> PERFORM IDENTIFIER DOT','statement',3,'p_statement_perform','parser.py',194),
+  ('statement -> PERFORM IDENTIFIER THRU IDENTIFIER DOT','statement',5,'p_statement_perform','parser.py',195),
+  ('statement -> PERFORM IDENTIFIER UNTIL condition DOT','statement',5,'p_statement_perform','parser.py',196),
+  ('condition -> IDENTIFIER GT NUMBER','condition',3,'p_condition','parser.py',205),
+  ('condition -> IDENTIFIER LT NUMBER','condition',3,'p_condition','parser.py',206),
+  ('condition -> IDENTIFIER EQUALS NUMBER','condition',3,'p_condition','parser.py',207),
+  ('condition -> IDENTIFIER GE NUMBER','condition',3,'p_condition','parser.py',208),
+  ('condition -> IDENTIFIER LE NUMBER','condition',3,'p_condition','parser.py',209),
+  ('condition -> IDENTIFIER GT IDENTIFIER','condition',3,'p_condition','parser.py',210),
+  ('condition -> IDENTIFIER LT IDENTIFIER','condition',3,'p_condition','parser.py',211),
+  ('condition -> IDENTIFIER EQUALS IDENTIFIER','condition',3,'p_condition','parser.py',212),
+  ('condition -> IDENTIFIER GE IDENTIFIER','condition',3,'p_condition','parser.py',213),
+  ('condition -> IDENTIFIER LE IDENTIFIER','condition',3,'p_condition','parser.py',214),
+  ('statement -> IF condition THEN statement_list END_IF DOT','statement',6,'p_statement_if','parser.py',218),
+  ('statement -> IF condition statement_list END_IF DOT','statement',5,'p_statement_if','parser.py',219),
+  ('statement -> IF condition THEN statement_list ELSE statement_list END_IF DOT','statement',8,'p_statement_if','parser.py',220),
+  ('statement -> DISPLAY IDENTIFIER DOT','statement',3,'p_statement_display','parser.py',229),
+  ('statement -> DISPLAY STRING DOT','statement',3,'p_statement_display','parser.py',230),
+  ('statement -> DISPLAY NUMBER DOT','statement',3,'p_statement_display','parser.py',231),
+  ('statement -> STOP RUN DOT','statement',3,'p_statement_stop','parser.py',235),
+  ('statement -> EXIT DOT','statement',2,'p_statement_stop','parser.py',236),
+  ('statement -> GOBACK DOT','statement',2,'p_statement_stop','parser.py',237),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',241),
+]
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Shared by every span() while profiling is off
+_NULL_SPAN = nullcontext()
+
+
+@dataclass
+class SpanEvent:
+    name: str
+    # perf_counter seconds; CLOCK_MONOTONIC, so comparable across worker processes
+    start: float
+    seconds: float
+    pid: int
+    tid: int
+    # The asyncio task the span ran in; overlapping spans of one thread are tasks
+    task: Optional[int] = None
+    args: Optional[dict] = None
+
+
+@dataclass
+class Profile:
+    """Spans and counters recorded by one process, in a picklable form so
+    pool workers can send theirs back with their results."""
+    events: List[SpanEvent] = field(default_factory=list)
+    counters: Counter = field(default_factory=Counter)
+
+
+class Profiler:
+    def __init__(self):
+        self.profile = Profile()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start, **args)
+
+    def record(self, name: str, start: float, seconds: float, **args):
+        try:
+            task = id(asyncio.current_task())
+        except RuntimeError:
+            task = None
+        event = SpanEvent(name, start, seconds, os.getpid(), threading.get_ident(), task, args or None)
+        with self._lock:
+            self.profile.events.append(event)
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.profile.counters[name] += n
+
+    def drain(self) -> Profile:
+        """What was recorded since the last drain."""
+        with self._lock:
+            profile, self.profile = self.profile, Profile()
+        return profile
+
+    def merge(self, profile: Profile):
+        with self._lock:
+            self.profile.events.extend(profile.events)
+            self.profile.counters.update(profile.counters)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def active() -> Optional[Profiler]:
+    return _profiler
+
+
+def span(name: str, **args):
+    """Time the with block as a named stage; a shared no-op when profiling is off."""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _profiler.span(name, **args)
+
+
+def count(name: str, n: float = 1):
+    if _profiler is not None:
+        _profiler.count(name, n)
+
+
+def stage_totals(profile: Profile) -> Dict[str, Tuple[int, float, float]]:
+    """Calls, total and longest seconds of each span name."""
+    totals = {}
+    for event in profile.events:
+        calls, total, longest = totals.get(event.name, (0, 0.0, 0.0))
+        totals[event.name] = (calls + 1, total + event.seconds, max(longest, event.seconds))
+    return totals
+
+
+def summary_table(profile: Profile, wall_seconds: float) -> str:
+    lines = [f"{'stage':<28}{'calls':>8}{'total s':>10}{'mean ms':>10}{'max ms':>10}{'% wall':>8}"]
+    totals = stage_totals(profile)
+    for name, (calls, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        share = total / wall_seconds if wall_seconds else 0.0
+        lines.append(f"{name:<28}{calls:>8}{total:>10.3f}{total / calls * 1000:>10.2f}"
+                     f"{longest * 1000:>10.2f}{share:>8.0%}")
+    if profile.counters:
+        lines.append('')
+        lines.append(f"{'counter':<28}{'value':>14}")
+        for name, value in sorted(profile.counters.items()):
+            lines.append(f"{name:<28}{value:>14,.0f}")
+    return '\n'.join(lines)
+
+
+def chrome_trace(profile: Profile) -> dict:
+    """Trace Event Format, as loaded by chrome://tracing and Perfetto. Spans
+    run inside asyncio tasks become async slices so overlapping requests on
+    one thread stay apart; the rest are complete events."""
+    origin = min((event.start for event in profile.events), default=0.0)
+    events = []
+    for event in profile.events:
+        ts = (event.start - origin) * 1e6
+        common = {'name': event.name, 'pid': event.pid, 'tid': event.tid, 'args': event.args or {}}
+        if event.task is None:
+            events.append({**common, 'ph': 'X', 'ts': ts, 'dur': event.seconds * 1e6})
+        else:
+            slice_id = f'{event.pid}:{event.task}'
+            events.append({**common, 'ph': 'b', 'cat': 'async', 'id': slice_id, 'ts': ts})
+            events.append({**common, 'ph': 'e', 'cat': 'async', 'id': slice_id, 'ts': ts + event.seconds * 1e6})
+    end = max(((event.start - origin + event.seconds) * 1e6 for event in profile.events), default=0.0)
+    for name, value in sorted(profile.counters.items()):
+        events.append({'name': name, 'ph': 'C', 'pid': os.getpid(), 'ts': end, 'args': {'value': value}})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(profile: Profile, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(profile), f)
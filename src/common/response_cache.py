@@ -0,0 +1,91 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from common.util import cache_root
+
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+
+def default_cache_path() -> str:
+    return os.path.join(cache_root(), 'llm_responses.sqlite3')
+
+
+def response_key(model_name: str, prompt: str) -> str:
+    """Content address of a response: the model and the full prompt, which
+    embeds the prompt template and the input (source or serialized AST)."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode())
+    digest.update(b'\0')
+    digest.update(prompt.encode())
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Single-file SQLite store of LLM responses with size-bounded LRU eviction.
+
+    With bypass set, lookups always miss but fresh responses are still stored.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = DEFAULT_MAX_BYTES, bypass: bool = False):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses ('
+                         'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                         'size INTEGER NOT NULL, accessed REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        if self.bypass:
+            return None
+        with self._lock:
+            row = self._db.execute('SELECT value FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, value: str):
+        size = len(value.encode())
+        with self._lock:
+            previous = self._db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._db.execute('INSERT OR REPLACE INTO responses (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                             (key, value, size, time.time()))
+            self._total += size - (previous[0] if previous else 0)
+            self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes:
+            oldest = self._db.execute('SELECT key, size FROM responses ORDER BY accessed LIMIT 64').fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if self._total <= self.max_bytes:
+                    break
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total -= size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"LLM cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), {len(self)} entries"
+
+    def close(self):
+        self._db.close()
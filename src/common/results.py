@@ -0,0 +1,137 @@
+import collections
+import itertools
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, TextIO, Tuple
+
+RESULTS_SUFFIX = '.jsonl'
+
+# Words whose presence in the text counts towards readability
+KEYWORDS = ('perform', 'calculate', 'display', 'initialize', 'execute', 'control')
+# Section names whose presence in a heading counts towards structure
+SECTIONS = ('PROGRAM SUMMARY', 'EXECUTION FLOW', 'DATA FLOW', 'PROCEDURE ANALYSIS', 'VARIABLE REFERENCE')
+
+# Lines of free text scanned at a time; no pattern spans lines
+SCAN_BLOCK_LINES = 4096
+PROCEDURE_OR_CALLS = re.compile(r'PROCEDURE:[ \t]+(\S+)|Calls:[ \t]+(.+)')
+VARIABLE = re.compile(r'^[ \t]*01[ \t]+([\w-]+)', re.MULTILINE)
+STATEMENTS = re.compile(r'Statements[ \t]+\((\d+)[ \t]+total\)')
+PURPOSE = re.compile(r'Purpose:[ \t]+(.+)')
+FLOW = re.compile(r'(?<![\w-])([\w-]+)[ \t]+---?>?\[(?:writes|reads)\]---?>[ \t]+([\w-]+)')
+
+
+class Flow(NamedTuple):
+    variable: str
+    writers: Tuple[str, ...]
+    readers: Tuple[str, ...]
+    links: int
+
+
+@dataclass
+class DocumentationResult:
+    """What a rendered document covers, kept alongside its text so that
+    scoring needs neither the text nor regular expressions."""
+    analyzer: str
+    program: str = ''
+    procedures: List[str] = field(default_factory=list)
+    variables: List[str] = field(default_factory=list)
+    statements: int = 0
+    # Every purpose description rendered, in order
+    purposes: List[str] = field(default_factory=list)
+    flows: List[Flow] = field(default_factory=list)
+    calls: Dict[str, List[str]] = field(default_factory=dict)
+    headings: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    lines: int = 1
+    chars: int = 0
+
+    @property
+    def links(self) -> int:
+        return sum(flow.links for flow in self.flows)
+
+    def observe(self, text: str):
+        """Count a chunk of the rendered text; chunks must end lines."""
+        self.lines += text.count('\n')
+        self.chars += len(text)
+        lowered = text.lower()
+        self.keywords.extend(kw for kw in KEYWORDS if kw not in self.keywords and kw in lowered)
+
+    @classmethod
+    def from_text(cls, analyzer: str, text: str) -> 'DocumentationResult':
+        return cls.from_lines(analyzer, text.splitlines(keepends=True))
+
+    @classmethod
+    def from_lines(cls, analyzer: str, lines: Iterable[str]) -> 'DocumentationResult':
+        """Best-effort result for free text, such as model output, recovered
+        by pattern matching in a single pass over blocks of its lines."""
+        result = cls(analyzer)
+        procedures, variables = {}, {}
+        flows = collections.Counter()
+        caller = ''
+        block: List[str] = []
+        for line in itertools.chain(lines, [None]):
+            if line is not None:
+                block.append(line)
+                if len(block) < SCAN_BLOCK_LINES:
+                    continue
+            text = ''.join(block)
+            block.clear()
+            result.observe(text)
+            for match in PROCEDURE_OR_CALLS.finditer(text):
+                if match.group(1):
+                    caller = match.group(1)
+                    procedures[caller] = None
+                else:
+                    result.calls.setdefault(caller, []).extend(c.strip() for c in match.group(2).split(','))
+            variables.update(dict.fromkeys(VARIABLE.findall(text)))
+            result.statements += sum(int(n) for n in STATEMENTS.findall(text))
+            result.purposes.extend(p.strip() for p in PURPOSE.findall(text))
+            flows.update(FLOW.findall(text))
+            result.headings.extend(name for name in SECTIONS if name not in result.headings and name in text)
+        result.procedures = list(procedures)
+        result.variables = list(variables)
+        result.flows = [Flow('', (writer,), (reader,), links) for (writer, reader), links in flows.items()]
+        return result
+
+    def write_jsonl(self, f: TextIO):
+        """One JSON object per line: a header, then a line per variable,
+        procedure, caller, purpose and flow."""
+        f.write(json.dumps({'analyzer': self.analyzer, 'program': self.program, 'statements': self.statements,
+                            'headings': self.headings, 'keywords': self.keywords,
+                            'lines': self.lines, 'chars': self.chars}) + '\n')
+        for name in self.variables:
+            f.write(json.dumps({'variable': name}) + '\n')
+        for name in self.procedures:
+            f.write(json.dumps({'procedure': name}) + '\n')
+        for name, calls in self.calls.items():
+            f.write(json.dumps({'caller': name, 'calls': calls}) + '\n')
+        for purpose in self.purposes:
+            f.write(json.dumps({'purpose': purpose}) + '\n')
+        for flow in self.flows:
+            f.write(json.dumps({'flow': flow.variable, 'writers': flow.writers,
+                                'readers': flow.readers, 'links': flow.links}) + '\n')
+
+    @classmethod
+    def read_jsonl(cls, f: TextIO) -> 'DocumentationResult':
+        header = json.loads(f.readline())
+        result = cls(**header)
+        for line in f:
+            record = json.loads(line)
+            if 'variable' in record:
+                result.variables.append(record['variable'])
+            elif 'procedure' in record:
+                result.procedures.append(record['procedure'])
+            elif 'caller' in record:
+                result.calls[record['caller']] = record['calls']
+            elif 'purpose' in record:
+                result.purposes.append(record['purpose'])
+            elif 'flow' in record:
+                result.flows.append(Flow(record['flow'], tuple(record['writers']),
+                                         tuple(record['readers']), record['links']))
+        return result
+
+    @classmethod
+    def load(cls, path: str) -> 'DocumentationResult':
+        with open(path, encoding='utf-8') as f:
+            return cls.read_jsonl(f)
@@ -0,0 +1,129 @@
+import mmap
+from itertools import repeat
+from typing import Iterator, Optional, Union
+
+from common.parser import Parser, get_parser
+from common.util import Program, read_file
+
+INDICATOR = 6
+CODE_AREA_START = 7
+CODE_AREA_END = 72
+
+COMMENT_INDICATORS = frozenset(b'*/Dd')
+CONTINUATION = ord('-')
+QUOTES = frozenset(b'"\'')
+
+
+class FixedFormatSource:
+    """Memory-mapped fixed-format COBOL member.
+
+    Yields the code area (columns 8-72) of each line as a memoryview into
+    the mapping, so the file is never copied as a whole. Comment lines
+    (indicator '*', '/' or 'D') come out empty to keep line numbers, and
+    continuation lines ('-') are spliced onto the line they continue.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> 'FixedFormatSource':
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._map = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A caller still holds a line view; unmapped once it is dropped
+                pass
+            self._map = None
+        self._file.close()
+
+    def _raw_lines(self) -> Iterator[memoryview]:
+        if self._map is None:
+            return
+        view = memoryview(self._map)
+        try:
+            start, size = 0, len(view)
+            while start < size:
+                end = self._map.find(b'\n', start)
+                if end < 0:
+                    end = size
+                stop = end - 1 if end > start and view[end - 1] == 0x0D else end
+                yield view[start:stop]
+                start = end + 1
+        finally:
+            view.release()
+
+    def lines(self) -> Iterator[Union[memoryview, bytes]]:
+        pending = None
+        blanks = 0
+        for line in self._raw_lines():
+            indicator = line[INDICATOR] if len(line) > INDICATOR else 0x20
+            code = line[CODE_AREA_START:CODE_AREA_END]
+            if indicator in COMMENT_INDICATORS:
+                blanks += 1
+                continue
+            if indicator == CONTINUATION and pending is not None:
+                pending = _continue_line(pending, code, CODE_AREA_END - CODE_AREA_START - width)
+                width = len(code)
+                blanks += 1
+                continue
+            if pending is not None:
+                yield pending
+            # Comment and continuation lines still count towards line numbers
+            yield from repeat(b'', blanks)
+            pending, width, blanks = code, len(code), 0
+        if pending is not None:
+            yield pending
+        yield from repeat(b'', blanks)
+
+    def text(self, encoding: str = 'utf-8') -> str:
+        """Normalized source as one string, for consumers that need the text."""
+        return '\n'.join(bytes(line).decode(encoding) for line in self.lines())
+
+
+def _continue_line(previous, continuation, padding: int = 0) -> bytes:
+    """Splice a continuation line onto previous, whose last line stopped
+    padding columns short of column 72."""
+    previous = bytes(previous)
+    continuation = bytes(continuation).lstrip(b' ')
+    if _open_literal(previous):
+        # The literal runs to column 72 and resumes after the repeated quote
+        if continuation[:1] and continuation[0] in QUOTES:
+            continuation = continuation[1:]
+        return previous + b' ' * padding + continuation
+    # A continued word or number carries on from the first nonblank character
+    return previous.rstrip(b' ') + continuation
+
+
+def _open_literal(line: bytes) -> bool:
+    quote = None
+    for char in line:
+        if quote is None and char in QUOTES:
+            quote = char
+        elif char == quote:
+            quote = None
+    return quote is not None
+
+
+def parse_fixed_format(path: str, parser: Parser = None) -> Optional[Program]:
+    """Parse a fixed-format member straight off its memory mapping."""
+    parser = parser or get_parser()
+    with FixedFormatSource(path) as source:
+        return parser.parse_lines(source.lines())
+
+
+def read_source(path: str, fixed_format: bool = False) -> str:
+    if fixed_format:
+        with FixedFormatSource(path) as source:
+            return source.text()
+    return read_file(path)
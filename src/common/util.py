@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass, field
 from typing import List, Optional
 from pathlib import Path
@@ -48,4 +49,7 @@ class DataFlow:
     readers: List[str] = field(default_factory=list)
 
 def read_file(filename: str) -> str:
-    return Path(filename).read_text()
\ No newline at end of file
+    return Path(filename).read_text()
+
+def cache_root() -> str:
+    return os.getenv('DOCUMENTER_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'documenter'))
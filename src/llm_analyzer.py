@@ -1,50 +1,106 @@
+import asyncio
 import os
 import sys
-from typing import TextIO
-from dotenv import load_dotenv
-
-import google.generativeai as genai
+from functools import lru_cache
+from typing import Callable, List, TextIO
 
 from common.base import BaseAnalyzer
+from common.chunking import Chunk, MapReduceSummarizer, source_chunks
+from common.llm import LLMClient, estimate_tokens
+from common.manifest import ProgramManifest, ReuseStats, neighbourhood_keys
+from common.util import Program
 
 
 class LLMAnalyzer(BaseAnalyzer):
 
-    def __init__(self):
+    def __init__(self, client: LLMClient = None, chunk_tokens: int = None, manifest_dir: str = None):
         super().__init__()
-        api_key = self._prepare()
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-pro')
+        self.chunk_tokens = chunk_tokens
+        self.manifest_dir = manifest_dir
+        self.reuse = ReuseStats()
+        if client is None:
+            # Imported here so analyzers given a client never load the SDK
+            import google.generativeai as genai
+            api_key = self._prepare()
+            genai.configure(api_key=api_key)
+            client = LLMClient(genai.GenerativeModel('gemini-2.5-pro'))
+        self.client = client
+        self.model = client.model
 
     @staticmethod
     def _prepare():
+        from dotenv import load_dotenv
         load_dotenv()
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key is None:
             raise ValueError("GEMINI_API_KEY environment variable is not set")
         return api_key
 
-    def document(self, _input: str, _output: TextIO = sys.stdout) -> str:
+    def document(self, _input: str, _output: TextIO = sys.stdout, program: Program = None) -> str:
         self._input = _input
-        res = self.generate_documentation()
+        res = self.generate_documentation(program)
+        _output.write(res)
+        return res
+
+    async def document_async(self, _input: str, _output: TextIO = sys.stdout, program: Program = None) -> str:
+        """Concurrent-safe variant of document(): bounded, rate limited and
+        retried by the client, and failures raise instead of being rendered."""
+        res = await self._generate_async(_input, self.build_prompt(_input), program)
         _output.write(res)
         return res
 
-    def generate_documentation(self) -> str:
+    def generate_documentation(self, program: Program = None) -> str:
+        prompt = self.build_prompt(self._input)
+        try:
+            if self._needs_chunking(prompt):
+                return asyncio.run(self._generate_async(self._input, prompt, program))
+            return self.client.generate(prompt)
+        except Exception as e:
+            return f"Error generating documentation: {str(e)}"
+
+    def _needs_chunking(self, prompt: str) -> bool:
+        return bool(self.chunk_tokens) and estimate_tokens(prompt) > self.chunk_tokens
+
+    async def _generate_async(self, source: str, prompt: str, program: Program = None) -> str:
+        if self._needs_chunking(prompt):
+            if program is None:
+                program = self.fetch_program(source)
+            if program is not None and program.paragraphs:
+                return await self._summarize_chunks(program, lambda fixed: source_chunks(
+                    program, source, self.chunk_tokens, fixed))
+        return await self.client.generate_async(prompt)
+
+    async def _summarize_chunks(self, program: Program, make_chunks: Callable[[List[List[str]]], List[Chunk]]) -> str:
+        manifest, keys, fixed = None, {}, []
+        if self.manifest_dir:
+            # Keep the chunks whose paragraphs and their neighbourhoods are unchanged
+            manifest = ProgramManifest.load(self.manifest_dir, 'llm', program.name)
+            keys = neighbourhood_keys(program)
+            fixed = manifest.reusable_groups(keys)
+        summarizer = MapReduceSummarizer(self.client, self.chunk_tokens, manifest, keys)
+        res = await summarizer.summarize(program, make_chunks(fixed), self._load_template())
+        if manifest is not None:
+            manifest.record_program(program)
+            manifest.save()
+            self.reuse.add(summarizer.reused, len(program.paragraphs))
+        return res
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_template() -> str:
         template_path = os.path.join(os.path.dirname(__file__), '../resources/prompt.template')
-        template = open(template_path).read()
+        return open(template_path).read()
+
+    def build_prompt(self, source: str) -> str:
+        template = self._load_template()
         prompt =\
             f"""You are a COBOL documentation expert. Analyze the following COBOL program and generate comprehensive documentation in this EXACT format:
         {template}
         
         COBOL CODE TO ANALYZE:
-        {self._input}
+        {source}
         
 
 Generate the documentation following the format above EXACTLY. Be thorough and accurate.
 """
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating documentation: {str(e)}"
\ No newline at end of file
+        return prompt
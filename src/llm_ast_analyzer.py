@@ -1,43 +1,118 @@
+import asyncio
 import json
 import os
 import sys
-from typing import TextIO, Dict
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Callable, List, TextIO, Dict, Tuple
 
-import google.generativeai as genai
+from common.ast_encoding import AST_ENCODINGS, encode_compact
 from common.base import BaseAnalyzer
-from common.util import Statement
+from common.chunking import Chunk, MapReduceSummarizer, ast_chunks
+from common.compact import CompactStatement
+from common.llm import LLMClient, estimate_tokens
+from common.manifest import ProgramManifest, ReuseStats, neighbourhood_keys
+from common.util import Program, Statement
 
 
 class LLMAstAnalyzer(BaseAnalyzer):
 
-    def __init__(self):
+    def __init__(self, client: LLMClient = None, encoding: str = 'json', chunk_tokens: int = None,
+                 manifest_dir: str = None):
         super().__init__()
+        self.chunk_tokens = chunk_tokens
+        self.manifest_dir = manifest_dir
+        self.reuse = ReuseStats()
+        if encoding not in AST_ENCODINGS:
+            raise ValueError(f"Unknown AST encoding '{encoding}', expected one of {', '.join(AST_ENCODINGS)}")
+        self.encoding = encoding
         self.program = None
-        api_key = self._prepare()
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-pro')
+        if client is None:
+            import google.generativeai as genai
+            api_key = self._prepare()
+            genai.configure(api_key=api_key)
+            client = LLMClient(genai.GenerativeModel('gemini-2.5-pro'))
+        self.client = client
+        self.model = client.model
 
     @staticmethod
     def _prepare():
+        from dotenv import load_dotenv
         load_dotenv()
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key is None:
             raise ValueError("GEMINI_API_KEY environment variable is not set")
         return api_key
 
-    def document(self, _input: str, _output: TextIO = sys.stdout) -> str:
+    def document(self, _input: str, _output: TextIO = sys.stdout, program: Program = None) -> str:
         self._input = _input
-        self.program = self.fetch_program()
+        self.program = program if program is not None else self.fetch_program()
         res = self.generate_documentation()
         _output.write(res)
         return res
 
+    async def document_async(self, _input: str, _output: TextIO = sys.stdout, program: Program = None) -> str:
+        """Concurrent-safe variant of document(): bounded, rate limited and
+        retried by the client, and failures raise instead of being rendered."""
+        if program is None:
+            program = self.fetch_program(_input)
+        res = await self._generate_async(program, self.build_prompt(program))
+        _output.write(res)
+        return res
+
     def generate_documentation(self) -> str:
+        prompt = self.build_prompt(self.program)
+        try:
+            if self._needs_chunking(prompt):
+                return asyncio.run(self._generate_async(self.program, prompt))
+            return self.client.generate(prompt)
+        except Exception as e:
+            return f"Error generating documentation: {str(e)}"
+
+    def _needs_chunking(self, prompt: str) -> bool:
+        return bool(self.chunk_tokens) and estimate_tokens(prompt) > self.chunk_tokens
+
+    async def _generate_async(self, program: Program, prompt: str) -> str:
+        if self._needs_chunking(prompt) and program.paragraphs:
+            return await self._summarize_chunks(program, lambda fixed: ast_chunks(
+                program, self.chunk_tokens, self.encode_ast, fixed))
+        return await self.client.generate_async(prompt)
+
+    async def _summarize_chunks(self, program: Program, make_chunks: Callable[[List[List[str]]], List[Chunk]]) -> str:
+        manifest, keys, fixed = None, {}, []
+        if self.manifest_dir:
+            # Keep the chunks whose paragraphs and their neighbourhoods are unchanged
+            manifest = ProgramManifest.load(self.manifest_dir, 'llm_ast', program.name)
+            keys = neighbourhood_keys(program)
+            fixed = manifest.reusable_groups(keys)
+        summarizer = MapReduceSummarizer(self.client, self.chunk_tokens, manifest, keys)
+        res = await summarizer.summarize(program, make_chunks(fixed), self._load_template())
+        if manifest is not None:
+            manifest.record_program(program)
+            manifest.save()
+            self.reuse.add(summarizer.reused, len(program.paragraphs))
+        return res
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_template() -> str:
         template_path = os.path.join(os.path.dirname(__file__), '../resources/prompt.template')
-        template = open(template_path).read()
-        ast_dict = self._ast_to_dict()
-        ast_json = json.dumps(ast_dict, indent=2)
+        return open(template_path).read()
+
+    def encode_ast(self, program: Program, encoding: str = None) -> str:
+        encoding = encoding or self.encoding
+        if encoding == 'compact':
+            return encode_compact(program)
+        ast_dict = self._ast_to_dict(program)
+        if encoding == 'json_min':
+            return json.dumps(self._drop_nulls(ast_dict), separators=(',', ':'))
+        return json.dumps(ast_dict, indent=2)
+
+    def build_prompt(self, program: Program, encoding: str = None) -> str:
+        template = self._load_template()
+        encoding = encoding or self.encoding
+        ast_json = self.encode_ast(program, encoding)
+        if encoding == 'compact':
+            return self._compact_prompt(template, ast_json)
         prompt = \
             f"""You are a COBOL documentation expert. You are given a parsed Abstract Syntax Tree (AST) of a COBOL program in JSON format. Generate comprehensive documentation in this EXACT format:
         {template}
@@ -54,15 +129,41 @@ Each statement has:
 - type: Statement type (MOVE, ADD, COMPUTE, PERFORM, IF, etc.)
 - data: Dictionary with statement-specific fields
 """
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating documentation: {str(e)}"
+        return prompt
+
+    @staticmethod
+    def _compact_prompt(template: str, ast_text: str) -> str:
+        prompt = \
+            f"""You are a COBOL documentation expert. You are given a parsed Abstract Syntax Tree (AST) of a COBOL program in a compact line format, described by its leading '#' schema lines. Generate comprehensive documentation in this EXACT format:
+        {template}
+
+        AST STRUCTURE (COMPACT):
+        {ast_text}
+
+Analyze the AST structure and generate documentation following the format above EXACTLY. Resolve every $N reference through the SYMBOLS record.
+"""
+        return prompt
+
+    def prompt_sizes(self, program: Program) -> Dict[str, Tuple[int, int]]:
+        """Characters and estimated tokens of the prompt under each encoding."""
+        sizes = {}
+        for encoding in AST_ENCODINGS:
+            prompt = self.build_prompt(program, encoding)
+            sizes[encoding] = (len(prompt), estimate_tokens(prompt))
+        return sizes
+
+    @classmethod
+    def _drop_nulls(cls, value):
+        if isinstance(value, dict):
+            return {k: cls._drop_nulls(v) for k, v in value.items() if v is not None}
+        if isinstance(value, list):
+            return [cls._drop_nulls(v) for v in value]
+        return value
 
-    def _ast_to_dict(self) -> Dict:
+    def _ast_to_dict(self, program: Program = None) -> Dict:
+        program = program or self.program
         return {
-            "program_name": self.program.name,
+            "program_name": program.name,
             "variables": [
                 {
                     "level": var.level,
@@ -70,7 +171,7 @@ Each statement has:
                     "picture": var.picture,
                     "value": var.value
                 }
-                for var in self.program.variables
+                for var in program.variables
             ],
             "procedures": [
                 {
@@ -80,7 +181,7 @@ Each statement has:
                         for stmt in para.statements
                     ]
                 }
-                for para in self.program.paragraphs
+                for para in program.paragraphs
             ]
         }
 
@@ -91,12 +192,12 @@ Each statement has:
         }
 
         for key, value in stmt.data.items():
-            if isinstance(value, list):
+            if isinstance(value, (list, tuple)):
                 stmt_dict["data"][key] = [
-                    self._statement_to_dict(s) if isinstance(s, Statement) else s
+                    self._statement_to_dict(s) if isinstance(s, (Statement, CompactStatement)) else s
                     for s in value
                 ]
-            elif isinstance(value, Statement):
+            elif isinstance(value, (Statement, CompactStatement)):
                 stmt_dict["data"][key] = self._statement_to_dict(value)
             else:
                 stmt_dict["data"][key] = value
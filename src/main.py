@@ -1,34 +1,206 @@
+import argparse
 import os
 import sys
-from os import mkdir
-from typing import List, Dict
+import time
+from typing import Dict, Iterable, List, Optional
 
-from metrics import DocumentationMetrics
-from common.base import BaseAnalyzer
-from common.util import read_file
-from llm_analyzer import LLMAnalyzer
-from llm_ast_analyzer import LLMAstAnalyzer
-from static_analyzer import StaticAnalyzer
+from batch import (DEFAULT_CHUNK_SIZE, BatchOptions, FilePipeline, FileResult, Throughput, expand_inputs, input_root,
+                   run_static)
+from common import profiling
+from common.ast_encoding import AST_ENCODINGS
+from common.base import ANALYZER_NAMES, BaseAnalyzer, analyzer_class
+from common.copybook import SEARCH_PATH_ENV, copybook_report, default_search_paths
+from common.parse_cache import DEFAULT_MAX_BYTES as DEFAULT_PARSE_CACHE_BYTES, ParseCache, hit_rate_report
+from common.response_cache import DEFAULT_MAX_BYTES, ResponseCache
 
-files_to_test: List = ['payroll']
-dict_analyzer: Dict[str, 'BaseAnalyzer'] = {'static': StaticAnalyzer(), 'llm': LLMAnalyzer(), 'llm_ast': LLMAstAnalyzer()}
-INPUT_PATH_TEMPLATE = '../resources/input/{}.cbl'
-OUTPUT_PATH_TEMPLATE = '../resources/output/{}_{}.output'
+DEFAULT_INPUTS = [os.path.join(os.path.dirname(__file__), '../resources/input/payroll.cbl')]
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../resources/output')
+PROFILE_TRACE_NAME = 'profile.trace.json'
+
+
+def build_llm_analyzers(args: argparse.Namespace, cache: ResponseCache) -> Dict[str, 'BaseAnalyzer']:
+    """The selected LLM analyzers; their modules and the model SDK are only imported here."""
+    from common.llm import RateLimiter, RetryPolicy
+
+    settings = {
+        'llm': dict(chunk_tokens=args.chunk_tokens, manifest_dir=args.manifest_dir),
+        'llm_ast': dict(encoding=args.ast_encoding, chunk_tokens=args.chunk_tokens, manifest_dir=args.manifest_dir),
+    }
+    analyzers = {name: analyzer_class(name)(**settings[name]) for name in args.analyzers if name in settings}
+    for analyzer in analyzers.values():
+        analyzer.fixed_format = args.fixed_format
+        analyzer.client.cache = cache
+        analyzer.client.max_concurrency = args.concurrency
+        analyzer.client.limiter = RateLimiter(args.requests_per_minute, args.tokens_per_minute)
+        analyzer.client.retry = RetryPolicy(max_retries=args.max_retries)
+    return analyzers
+
+
+def report_results(results: Iterable[FileResult]) -> Throughput:
+    throughput = Throughput()
+    profiler = profiling.active()
+    for result in results:
+        throughput.add(result)
+        if result.profile is not None and profiler is not None:
+            profiler.merge(result.profile)
+        if result.error is not None:
+            print(f"Something went wrong with {result.input_path}: {result.error}")
+        elif result.summary:
+            print(result.summary)
+    return throughput
+
+
+def run_pipeline(args: argparse.Namespace, options: BatchOptions, inputs: List[str],
+                 llm_analyzers: Dict[str, BaseAnalyzer], parse_cache: Optional[ParseCache], total: Throughput):
+    """Every selected analyzer on each file at once, from one read and parse."""
+    factories = {}
+    for name in args.analyzers:
+        if name == 'static':
+            static_class = analyzer_class(name)
+            factories[name] = lambda: static_class(options.manifest_dir, options.dataflow_cap, stream=True)
+        else:
+            factories[name] = lambda analyzer=llm_analyzers[name]: analyzer
+    print(f"Analyzers {', '.join(factories)} started for {len(inputs)} files...")
+    start = time.perf_counter()
+    pipeline = FilePipeline(factories, options, parse_cache, args.workers)
+    records = pipeline.run_all(inputs)
+    seconds = time.perf_counter() - start
+
+    for name in factories:
+        throughput = report_results(record.results[name] for record in records)
+        # The analyzers share the run, so each is measured against its wall clock
+        throughput.seconds = seconds
+        if name in llm_analyzers:
+            reuse = llm_analyzers[name].reuse
+            throughput.reuse.add(reuse.reused, reuse.total)
+        print(throughput.report(name))
+        total.add_run(throughput)
+    total.seconds = seconds
+    # One parse per file, however many analyzers read it
+    cached = [record.parse_cache_hit for record in records if record.parse_cache_hit is not None]
+    total.parse_hits, total.parse_misses = sum(cached), len(cached) - sum(cached)
+    if pipeline.copybooks is not None:
+        total.copybook_includes, total.copybooks_parsed = pipeline.copybooks.included, pipeline.copybooks.parsed
+    wall = sum(record.seconds for record in records)
+    serial = sum(record.analyzer_seconds for record in records)
+    print(f"Pipeline: {len(records)} files, {wall / len(records):.2f}s per file "
+          f"against {serial / len(records):.2f}s with analyzers run one after another")
+
+
+def write_profile(args: argparse.Namespace, wall_seconds: float):
+    profile = profiling.active().drain()
+    trace_path = args.profile_trace or os.path.join(args.output_dir, PROFILE_TRACE_NAME)
+    profiling.write_chrome_trace(profile, trace_path)
+    print(f"Profile ({wall_seconds:.2f}s wall clock, stages summed over files and workers):")
+    print(profiling.summary_table(profile, wall_seconds))
+    print(f"Chrome trace written to {trace_path}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate documentation for COBOL members.')
+    parser.add_argument('inputs', nargs='*', default=DEFAULT_INPUTS,
+                        help='input files, directories or glob patterns (default: payroll sample)')
+    parser.add_argument('-a', '--analyzers', default=','.join(ANALYZER_NAMES),
+                        help=f'comma separated analyzers to run, from {", ".join(ANALYZER_NAMES)}')
+    parser.add_argument('-o', '--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help='processes for the static analyzer')
+    parser.add_argument('--chunk-size', type=int,
+                        help=f'files handed to a worker at a time in static-only runs (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--fixed-format', action='store_true',
+                        help='treat members as fixed-format (columns 1-6 sequence, 7 indicator, 8-72 code)')
+    parser.add_argument('--concurrency', type=int, default=8, help='LLM requests in flight at once')
+    parser.add_argument('--requests-per-minute', type=float, help='LLM request rate limit')
+    parser.add_argument('--tokens-per-minute', type=float, help='LLM prompt token rate limit')
+    parser.add_argument('--max-retries', type=int, default=5, help='retries for transient LLM errors')
+    parser.add_argument('--ast-encoding', choices=AST_ENCODINGS, default='json',
+                        help='how llm_ast serializes the AST into its prompt')
+    parser.add_argument('--chunk-tokens', type=int,
+                        help='split prompts larger than this many tokens into map-reduce chunks')
+    parser.add_argument('--llm-cache', help='LLM response cache file (default: under DOCUMENTER_CACHE_DIR)')
+    parser.add_argument('--llm-cache-mb', type=float, default=DEFAULT_MAX_BYTES / 2 ** 20,
+                        help='LLM response cache size bound in MiB')
+    parser.add_argument('--bypass-llm-cache', action='store_true', help='always call the model; fresh responses still refresh the cache')
+    parser.add_argument('--parse-cache', help='parsed AST cache file (default: under DOCUMENTER_CACHE_DIR)')
+    parser.add_argument('--parse-cache-mb', type=float, default=DEFAULT_PARSE_CACHE_BYTES / 2 ** 20,
+                        help='parsed AST cache size bound in MiB')
+    parser.add_argument('--no-parse-cache', action='store_true', help='parse every member from source')
+    parser.add_argument('-I', '--copybook-path', action='append', dest='copybook_paths',
+                        help=f'directory searched for COPY members, repeatable (default: ${SEARCH_PATH_ENV})')
+    parser.add_argument('--manifest-dir',
+                        help='keep per-program manifests here and only reprocess paragraphs changed since the last '
+                             'run; LLM analyzers only reuse chunks, so this needs --chunk-tokens for them')
+    parser.add_argument('--dataflow-cap', type=int,
+                        help='summarize variables with more writer to reader links than this in static output')
+    parser.add_argument('--metrics', action=argparse.BooleanOptionalAction, default=True,
+                        help='print documentation quality metrics for every output')
+    parser.add_argument('--profile', action='store_true',
+                        help='time each stage, print a summary table and write a Chrome trace of the run')
+    parser.add_argument('--profile-trace',
+                        help=f'trace-event JSON file for --profile (default: {PROFILE_TRACE_NAME} in the output dir)')
+    args = parser.parse_args(argv)
+    args.analyzers = [name.strip() for name in args.analyzers.split(',') if name.strip()]
+    unknown = set(args.analyzers) - set(ANALYZER_NAMES)
+    if unknown:
+        parser.error(f"unknown analyzers: {', '.join(sorted(unknown))}")
+    if args.chunk_size is not None and set(args.analyzers) - {'static'}:
+        # With LLM analyzers each member is sent to a worker as soon as it is parsed
+        parser.error('--chunk-size only applies to static-only runs')
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print('No input files found.', file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+    options = BatchOptions(output_dir=args.output_dir, fixed_format=args.fixed_format, metrics=args.metrics,
+                           manifest_dir=args.manifest_dir, dataflow_cap=args.dataflow_cap,
+                           parse_cache=args.parse_cache, parse_cache_bytes=int(args.parse_cache_mb * 2 ** 20),
+                           use_parse_cache=not args.no_parse_cache, profile=args.profile,
+                           copybook_paths=tuple(args.copybook_paths or default_search_paths()),
+                           input_root=input_root(inputs))
+    if args.profile:
+        profiling.enable()
+
+    llm_analyzers, cache, parse_cache = {}, None, None
+    if set(args.analyzers) - {'static'}:
+        cache = ResponseCache(args.llm_cache, int(args.llm_cache_mb * 2 ** 20), args.bypass_llm_cache)
+        llm_analyzers = build_llm_analyzers(args, cache)
+        if options.use_parse_cache:
+            parse_cache = ParseCache(options.parse_cache, options.parse_cache_bytes)
+            for analyzer in llm_analyzers.values():
+                analyzer.parse_cache = parse_cache
+
+    total = Throughput()
+    run_start = time.perf_counter()
+    if llm_analyzers:
+        run_pipeline(args, options, inputs, llm_analyzers, parse_cache, total)
+    else:
+        print(f'Analyzer static started for {len(inputs)} files...')
+        start = time.perf_counter()
+        throughput = report_results(run_static(inputs, options, args.workers, args.chunk_size or DEFAULT_CHUNK_SIZE))
+        throughput.seconds = time.perf_counter() - start
+        print(throughput.report('static'))
+        total.add_run(throughput)
+
+    print(total.report('Total'))
+    wall_seconds = time.perf_counter() - run_start
+    if total.parse_hits + total.parse_misses:
+        print(hit_rate_report(total.parse_hits, total.parse_misses))
+    if total.copybook_includes:
+        print(copybook_report(total.copybook_includes, total.copybooks_parsed))
+    if parse_cache is not None:
+        parse_cache.close()
+    if cache is not None:
+        print(cache.stats())
+        cache.close()
+    if args.profile:
+        write_profile(args, wall_seconds)
+    return 0 if total.failures == 0 else 2
 
-def ensure_exist(file_path: str):
-    if not os.path.isfile(file_path):
-        mkdir(file_path)
 
 if __name__ == '__main__':
-    for file_name in files_to_test:
-        for analyzer_name in dict_analyzer:
-            try:
-                input_: str = os.path.join(os.path.dirname(__file__), INPUT_PATH_TEMPLATE.format(file_name))
-                output_: str = os.path.join(os.path.dirname(__file__), OUTPUT_PATH_TEMPLATE.format(analyzer_name, file_name))
-                with open(output_, "w", encoding="utf-8") as f:
-                    print(f'Analyzer {analyzer_name} started for file {file_name}...')
-                    dict_analyzer[analyzer_name].document(read_file(input_), f)
-                    metrics = DocumentationMetrics(output_)
-                    print(metrics.get_summary())
-            except Exception as e:
-                print("Something went wrong!")
+    sys.exit(main())
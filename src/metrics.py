@@ -1,64 +1,63 @@
-import re
+import argparse
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from common.base import ANALYZER_NAMES
+from common.results import KEYWORDS, RESULTS_SUFFIX, SECTIONS, DocumentationResult
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WEIGHTS = {
+    'completeness': 0.25,
+    'detail_richness': 0.20,
+    'structure': 0.15,
+    'coverage': 0.25,
+    'readability': 0.15
+}
+METRIC_NAMES = list(WEIGHTS) + ['overall']
+PERCENTILES = (10, 50, 90)
+OUTPUT_SUFFIX = '.output'
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../resources/output')
 
 
 class DocumentationMetrics:
-    def __init__(self, filepath):
-        self.filepath = filepath
-        self.content = self._load_file()
-        self.info = self._extract_info()
-
-    def _load_file(self):
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    def _extract_info(self):
-        info = {
-            'procedures': set(),
-            'variables': set(),
-            'statements_count': 0,
-            'purposes': [],
-            'data_flows': [],
-            'calls': [],
-            'total_lines': 0,
-            'total_chars': 0
-        }
-
-        proc_matches = re.findall(r'PROCEDURE:\s+(\S+)', self.content)
-        info['procedures'] = set(proc_matches)
-
-        var_matches = re.findall(r'01\s+(\S+)', self.content)
-        info['variables'] = set(var_matches)
-
-        stmt_matches = re.findall(r'Statements\s+\((\d+)\s+total\)', self.content)
-        info['statements_count'] = sum(int(x) for x in stmt_matches)
-
-        purpose_matches = re.findall(r'Purpose:\s+(.+?)(?:\n|$)', self.content)
-        info['purposes'] = [p.strip() for p in purpose_matches]
-
-        flow_matches = re.findall(r'(\w+)\s+---?\[(?:writes|reads)\]---?>\s+(\w+)', self.content)
-        info['data_flows'] = flow_matches
-
-        call_matches = re.findall(r'Calls:\s+(.+?)(?:\n|$)', self.content)
-        info['calls'] = call_matches
-
-        info['total_lines'] = len(self.content.split('\n'))
-        info['total_chars'] = len(self.content)
-
-        return info
+    """Scores computed from a DocumentationResult. Given an output path, its
+    results sidecar is used when there is one, else the text is scanned."""
+
+    def __init__(self, source: Union[str, DocumentationResult], label: str = None):
+        if isinstance(source, DocumentationResult):
+            self.filepath = label or source.program
+            self.result = source
+        else:
+            self.filepath = label or source
+            self.result = self._load(source)
+        self._scores = None
+
+    @staticmethod
+    def _load(path: str) -> DocumentationResult:
+        if os.path.exists(path + RESULTS_SUFFIX):
+            return DocumentationResult.load(path + RESULTS_SUFFIX)
+        with open(path, 'r', encoding='utf-8') as f:
+            return DocumentationResult.from_lines(output_analyzer(path), f)
 
     def completeness_score(self):
         score = 0
 
-        if len(self.info['procedures']) > 0:
+        if self.result.procedures:
             score += 30
 
-        if len(self.info['variables']) > 0:
+        if self.result.variables:
             score += 20
 
-        if len(self.info['purposes']) > 0:
+        if self.result.purposes:
             score += 25
 
-        if len(self.info['data_flows']) > 0:
+        if self.result.links:
             score += 25
 
         return score
@@ -66,44 +65,37 @@ class DocumentationMetrics:
     def detail_richness_score(self):
         score = 0
 
-        if self.info['purposes']:
-            avg_purpose_len = sum(len(p) for p in self.info['purposes']) / len(self.info['purposes'])
+        purposes = self.result.purposes
+        if purposes:
+            avg_purpose_len = sum(len(p) for p in purposes) / len(purposes)
             # Score up to 40 points (capped at 200 chars avg = max points)
             score += min(40, (avg_purpose_len / 200) * 40)
 
-        score += min(30, len(self.info['data_flows']) * 5)
+        score += min(30, self.result.links * 5)
 
-        score += min(30, len(self.info['calls']) * 5)
+        score += min(30, len(self.result.calls) * 5)
 
         return round(score, 2)
 
     def structure_score(self):
         score = 0
 
-        sections = [
-            'PROGRAM SUMMARY',
-            'EXECUTION FLOW',
-            'DATA FLOW',
-            'PROCEDURE ANALYSIS',
-            'VARIABLE REFERENCE'
-        ]
-
-        for section in sections:
-            if section in self.content:
+        for section in SECTIONS:
+            if any(section in heading for heading in self.result.headings):
                 score += 20
 
         return min(100, score)
 
     def coverage_score(self):
-        proc_count = len(self.info['procedures'])
-        var_count = len(self.info['variables'])
+        proc_count = len(self.result.procedures)
+        var_count = len(self.result.variables)
         score = 0
         score += min(40, proc_count * 10)
 
         score += min(40, var_count * 10)
 
         if var_count > 0:
-            flow_coverage = len(self.info['data_flows']) / var_count
+            flow_coverage = self.result.links / var_count
             score += min(20, flow_coverage * 20)
 
         return round(score, 2)
@@ -111,47 +103,35 @@ class DocumentationMetrics:
     def readability_score(self):
         score = 0
 
-        descriptive_purposes = [p for p in self.info['purposes']
+        purposes = self.result.purposes
+        descriptive_purposes = [p for p in purposes
                                 if len(p) > 20 and 'data storage' not in p.lower()]
 
-        if self.info['purposes']:
-            desc_ratio = len(descriptive_purposes) / len(self.info['purposes'])
+        if purposes:
+            desc_ratio = len(descriptive_purposes) / len(purposes)
             score += desc_ratio * 50
 
-        keywords = ['perform', 'calculate', 'display', 'initialize', 'execute', 'control']
-        keyword_count = sum(1 for kw in keywords if kw in self.content.lower())
+        keyword_count = sum(1 for kw in KEYWORDS if kw in self.result.keywords)
         score += min(50, keyword_count * 8)
 
         return round(score, 2)
 
     def calculate_all_metrics(self):
-        return {
-            'completeness': self.completeness_score(),
-            'detail_richness': self.detail_richness_score(),
-            'structure': self.structure_score(),
-            'coverage': self.coverage_score(),
-            'readability': self.readability_score(),
-            'overall': self._calculate_overall()
-        }
-
-    def _calculate_overall(self):
-        weights = {
-            'completeness': 0.25,
-            'detail_richness': 0.20,
-            'structure': 0.15,
-            'coverage': 0.25,
-            'readability': 0.15
-        }
-
-        scores = {
-            'completeness': self.completeness_score(),
-            'detail_richness': self.detail_richness_score(),
-            'structure': self.structure_score(),
-            'coverage': self.coverage_score(),
-            'readability': self.readability_score()
-        }
-
-        overall = sum(scores[k] * weights[k] for k in weights)
+        if self._scores is None:
+            scores = {
+                'completeness': self.completeness_score(),
+                'detail_richness': self.detail_richness_score(),
+                'structure': self.structure_score(),
+                'coverage': self.coverage_score(),
+                'readability': self.readability_score()
+            }
+            scores['overall'] = self._calculate_overall(scores)
+            self._scores = scores
+        return dict(self._scores)
+
+    def _calculate_overall(self, scores: Dict[str, float] = None):
+        scores = scores or self.calculate_all_metrics()
+        overall = sum(scores[k] * WEIGHTS[k] for k in WEIGHTS)
         return round(overall, 2)
 
     def get_summary(self):
@@ -172,20 +152,130 @@ OVERALL SCORE:    {metrics['overall']:.1f}/100
 {'=' * 70}
 
 Statistics:
-  - Procedures documented: {len(self.info['procedures'])}
-  - Variables documented:  {len(self.info['variables'])}
-  - Data flows tracked:    {len(self.info['data_flows'])}
-  - Purpose descriptions:  {len(self.info['purposes'])}
-  - Total lines:           {self.info['total_lines']}
+  - Procedures documented: {len(self.result.procedures)}
+  - Variables documented:  {len(self.result.variables)}
+  - Data flows tracked:    {self.result.links}
+  - Purpose descriptions:  {len(self.result.purposes)}
+  - Total lines:           {self.result.lines}
 """
         return summary
 
-if __name__ == "__main__":
-    print("Analyzing Static Analyzer Output...")
-    static_metrics = DocumentationMetrics('../resources/output/static_add_mul_cal.output')
-    print(static_metrics.get_summary())
+
+def output_analyzer(path: str) -> str:
+    """The analyzer an output was written by, from its name ('<analyzer>_<member>.output')."""
+    name = os.path.basename(path)
+    matches = [analyzer for analyzer in ANALYZER_NAMES if name.startswith(analyzer + '_')]
+    return max(matches, key=len) if matches else name.split('_')[0]
+
+
+def expand_outputs(paths: Iterable[str]) -> List[str]:
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.update(os.path.join(root, n) for n in names if n.endswith(OUTPUT_SUFFIX))
+        elif os.path.isfile(path):
+            found.add(path)
+    return sorted(found)
+
+
+def _score_file(path: str) -> Tuple[str, str, List[float]]:
+    metrics = DocumentationMetrics(path)
+    scores = metrics.calculate_all_metrics()
+    return path, metrics.result.analyzer, [scores[name] for name in METRIC_NAMES]
+
+
+def _percentiles(values: Sequence[float]) -> List[float]:
+    """Linearly interpolated, as numpy.percentile does by default."""
+    values = sorted(values)
+    found = []
+    for q in PERCENTILES:
+        position = (len(values) - 1) * q / 100
+        low = int(position)
+        high = min(low + 1, len(values) - 1)
+        found.append(values[low] + (values[high] - values[low]) * (position - low))
+    return found
+
+
+class MetricsTable:
+    """Scores of many outputs, one column per metric, so that aggregates
+    over a corpus run on whole columns (with NumPy when it is installed)."""
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self.analyzers: List[str] = []
+        self.columns: Dict[str, array] = {name: array('d') for name in METRIC_NAMES}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path: str, analyzer: str, scores: Sequence[float]):
+        self.paths.append(path)
+        self.analyzers.append(analyzer)
+        for name, score in zip(METRIC_NAMES, scores):
+            self.columns[name].append(score)
+
+    def aggregate(self) -> Dict[str, Dict[str, List[float]]]:
+        """Per analyzer and metric: the mean followed by each of PERCENTILES."""
+        aggregate = {}
+        if np is not None:
+            analyzers = np.array(self.analyzers)
+            columns = {name: np.frombuffer(column, dtype=np.float64) for name, column in self.columns.items()}
+            for analyzer in sorted(set(self.analyzers)):
+                mask = analyzers == analyzer
+                aggregate[analyzer] = {name: [float(column[mask].mean())] +
+                                       np.percentile(column[mask], PERCENTILES).tolist()
+                                       for name, column in columns.items()}
+            return aggregate
+        rows: Dict[str, List[int]] = {}
+        for i, analyzer in enumerate(self.analyzers):
+            rows.setdefault(analyzer, []).append(i)
+        for analyzer in sorted(rows):
+            aggregate[analyzer] = {}
+            for name, column in self.columns.items():
+                values = [column[i] for i in rows[analyzer]]
+                aggregate[analyzer][name] = [sum(values) / len(values)] + _percentiles(values)
+        return aggregate
+
+    def report(self) -> str:
+        counts = {}
+        for analyzer in self.analyzers:
+            counts[analyzer] = counts.get(analyzer, 0) + 1
+        lines = []
+        for analyzer, metrics in self.aggregate().items():
+            lines.append(f"\n{analyzer}: {counts[analyzer]} outputs")
+            lines.append(f"  {'metric':<17}{'mean':>8}" + ''.join(f"{'p' + str(q):>8}" for q in PERCENTILES))
+            for name, values in metrics.items():
+                lines.append(f"  {name:<17}" + ''.join(f"{value:>8.1f}" for value in values))
+        return '\n'.join(lines)
+
+
+def _score_files(paths: List[str], workers: int = None, chunk_size: int = 8) -> Iterable[Tuple[str, str, List[float]]]:
+    if workers == 1:
+        yield from map(_score_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_score_file, paths, chunksize=chunk_size)
+
+
+def score_outputs(paths: List[str], workers: int = None, chunk_size: int = 8) -> MetricsTable:
+    table = MetricsTable()
+    for path, analyzer, scores in _score_files(paths, workers, chunk_size):
+        table.add(path, analyzer, scores)
+    return table
 
 
-    print("Analyzing LLM Generated Output...")
-    llm_metrics = DocumentationMetrics('../resources/output/llm_add_mul_cal.output')
-    print(llm_metrics.get_summary())
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Score documentation outputs and aggregate them per analyzer.')
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_OUTPUT_DIR], help='output files or directories')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--per-file', action='store_true', help='also print the full metrics of every output')
+    args = parser.parse_args()
+
+    outputs = expand_outputs(args.paths)
+    if args.per_file:
+        for path in outputs:
+            print(DocumentationMetrics(path).get_summary())
+    table = score_outputs(outputs, args.workers)
+    print(f"Scored {len(table)} outputs")
+    print(table.report())
@@ -1,32 +1,83 @@
+import heapq
 import sys
-from typing import List, TextIO
-import re
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, TextIO
+from common import profiling
+from common.ast_encoding import walk_statements
 from common.base import BaseAnalyzer
-from common.util import Variable, Statement
+from common.callgraph import CallGraph
+from common.dataflow import DataflowEngine, DataflowLinks
+from common.expression import complexity, operand_names, render
+from common.manifest import ProgramManifest, ReuseStats, neighbourhood_keys
+from common.results import DocumentationResult, Flow
+from common.util import Paragraph, Program, Variable, Statement
+
+# Deeper levels of the trace and call tree stop indenting and show their depth
+MAX_INDENT_DEPTH = 40
+# Lines joined into each chunk written while streaming
+STREAM_CHUNK_LINES = 1000
+HEADINGS = ('PROGRAM SUMMARY', 'EXECUTION FLOW TRACE', 'VISUAL CALL GRAPH', 'PROCEDURE CALL HIERARCHY',
+            'DATA FLOW DIAGRAM', 'DATA LINKAGE ANALYSIS', 'DETAILED PROCEDURE ANALYSIS', 'VARIABLE REFERENCE')
+
+
+@dataclass
+class SectionStats:
+    name: str
+    bytes: int
+    seconds: float
+
 
 class StaticAnalyzer(BaseAnalyzer):
-    def __init__(self):
+    reads_source = False
+
+    def __init__(self, manifest_dir: str = None, dataflow_cap: int = None, stream: bool = False):
         super().__init__()
+        self.manifest_dir = manifest_dir
+        # Variables with more writer to reader links than this are summarized
+        self.dataflow_cap = dataflow_cap
+        # Write each section as it is rendered instead of returning the whole document
+        self.stream = stream
+        self.section_stats = []
+        self.result = None
+        self.linked_variables = []
+        self.reuse = None
         self.program = None
         self.var_usage = {}
+        self.para_usage = {}
+        self.graph = None
         self.call_graph = {}
-        self.dataflow = {}
+        self.dataflow = DataflowLinks()
+        self.engine = None
         self.execution_flow = []
 
-    def document(self, _input: str, _output: TextIO = sys.stdout) -> str:
+    def document(self, _input: str, _output: TextIO = sys.stdout, program: Program = None) -> Optional[str]:
+        """The documentation, or None with stream=True: each section is then
+        written to _output as it is rendered and never held whole."""
         self._input = _input
-        self.program = self.fetch_program()
+        self.program = program if program is not None else self.fetch_program()
         self.analyze()
+        if self.stream:
+            for text in self.iter_documentation():
+                _output.write(text)
+            return None
         res = self.generate_documentation()
         _output.write(res)
         return res
 
     def analyze(self):
-        self._init_variables()
-        self._analyze_procedures()
-        self._build_call_graph()
-        self._trace_execution()
-        self._analyze_dataflow_links()
+        with profiling.span('analyze.variables'):
+            self._init_variables()
+        with profiling.span('analyze.procedures'):
+            self._analyze_procedures()
+        with profiling.span('analyze.call_graph'):
+            self._build_call_graph()
+        with profiling.span('analyze.trace'):
+            self._trace_execution()
+        with profiling.span('analyze.dataflow'):
+            self._analyze_dataflow_links()
+        if profiling.active():
+            profiling.count('dataflow links', len(self.dataflow))
 
     def _init_variables(self):
         for var in self.program.variables:
@@ -42,6 +93,7 @@ class StaticAnalyzer(BaseAnalyzer):
 
     def _analyze_procedures(self):
         for para in self.program.paragraphs:
+            self.para_usage.setdefault(para.name, {'reads': set(), 'writes': set()})
             for stmt in para.statements:
                 self._analyze_statement(stmt, para.name)
 
@@ -63,12 +115,12 @@ class StaticAnalyzer(BaseAnalyzer):
             self._record_write(stmt.data['target'], para_name)
         elif stmt.type == 'COMPUTE':
             self._record_write(stmt.data['target'], para_name)
-            for var in re.findall(r'[A-Za-z][A-Za-z0-9\-]*', stmt.data['expression']):
+            for var in operand_names(stmt.data['expression']):
                 self._record_read(var, para_name)
         elif stmt.type == 'DISPLAY':
             self._record_read(stmt.data['item'], para_name)
         elif stmt.type == 'IF':
-            for var in re.findall(r'[A-Za-z][A-Za-z0-9\-]*', stmt.data['condition']):
+            for var in operand_names(stmt.data['condition']):
                 self._record_read(var, para_name)
             for s in stmt.data.get('then', []):
                 self._analyze_statement(s, para_name)
@@ -76,60 +128,36 @@ class StaticAnalyzer(BaseAnalyzer):
                 self._analyze_statement(s, para_name)
 
     def _build_call_graph(self):
-        for para in self.program.paragraphs:
-            self.call_graph[para.name] = {
-                'calls': set(),
-                'called_by': set()
-            }
-
-        for para in self.program.paragraphs:
-            for stmt in para.statements:
-                if stmt.type == 'PERFORM':
-                    target = stmt.data['target']
-                    self.call_graph[para.name]['calls'].add(target)
-                    if target in self.call_graph:
-                        self.call_graph[target]['called_by'].add(para.name)
+        self.graph = CallGraph(self.program)
+        self.call_graph.update(self.graph.nodes)
 
     def _trace_execution(self):
-        if not self.program.paragraphs:
-            return
-
-        visited = set()
-        self._trace_from_paragraph(self.program.paragraphs[0].name, visited, 0)
-
-    def _trace_from_paragraph(self, para_name: str, visited: set, depth: int):
-        if para_name in visited or depth > 10:
-            return
-
-        visited.add(para_name)
-        self.execution_flow.append((depth, para_name))
-
-        if para_name in self.call_graph:
-            for called in self.call_graph[para_name]['calls']:
-                self._trace_from_paragraph(called, visited, depth + 1)
+        for depth, para_name, seen in self.graph.walk():
+            if not seen:
+                self.execution_flow.append((depth, para_name))
 
     def _analyze_dataflow_links(self):
-        for var_name in self.var_usage:
-            writers = self.var_usage[var_name]['writes']
-            readers = self.var_usage[var_name]['reads']
-
-            for writer in writers:
-                for reader in readers:
-                    if writer != reader:
-                        key = (writer, reader, var_name)
-                        self.dataflow[key] = {
-                            'from': writer,
-                            'to': reader,
-                            'variable': var_name
-                        }
+        # Only writes that reach a read, by reaching definitions over the PERFORM graph
+        self.engine = DataflowEngine(self.program, self.graph)
+        self.dataflow = DataflowLinks(para.name for para in self.program.paragraphs)
+        for var_name, reader, writers in self.engine.reaching_links():
+            self.dataflow.add(var_name, reader, writers)
 
     def _record_read(self, var: str, location: str):
         if var in self.var_usage:
             self.var_usage[var]['reads'].add(location)
+            self.para_usage[location]['reads'].add(var)
 
     def _record_write(self, var: str, location: str):
         if var in self.var_usage:
             self.var_usage[var]['writes'].add(location)
+            self.para_usage[location]['writes'].add(var)
+
+    def _paragraph_usage(self, para_name: str):
+        usage = self.para_usage.get(para_name)
+        if usage is None:
+            return set(), set()
+        return usage['reads'], usage['writes']
 
     def _generate_program_summary(self) -> List[str]:
         lines = []
@@ -144,6 +172,20 @@ class StaticAnalyzer(BaseAnalyzer):
         lines.append(f"Total Procedures: {len(self.program.paragraphs)}")
         lines.append(f"Total Variables: {len(self.program.variables)}")
 
+        unreachable = self.graph.unreachable()
+        if unreachable:
+            lines.append(f"Unreachable Procedures: {', '.join(unreachable)}")
+        for cycle in self.graph.cycles():
+            lines.append(f"Recursive PERFORM Cycle: {' -> '.join(cycle)}")
+
+        trees = [value.tree for para in self.program.paragraphs for stmt in walk_statements(para.statements)
+                 for value in (stmt.data.get('expression'), stmt.data.get('condition'), stmt.data.get('until'))
+                 if getattr(value, 'tree', None) is not None]
+        if trees:
+            measures = [complexity(tree) for tree in trees]
+            lines.append(f"Expressions: {len(trees)} ({sum(ops for ops, _ in measures)} operators, "
+                         f"max depth {max(depth for _, depth in measures)})")
+
         lines.append("\nProgram Purpose Analysis:")
 
         computed_vars = [v for v in self.var_usage if self.var_usage[v]['writes']]
@@ -163,9 +205,10 @@ class StaticAnalyzer(BaseAnalyzer):
         lines.append("")
 
         for depth, para_name in self.execution_flow:
-            indent = "  " * depth
+            indent = "  " * min(depth, MAX_INDENT_DEPTH)
             arrow = "|--->" if depth > 0 else ">"
-            lines.append(f"{indent}{arrow} {para_name}")
+            label = para_name if depth <= MAX_INDENT_DEPTH else f"{para_name} (depth {depth})"
+            lines.append(f"{indent}{arrow} {label}")
 
         return lines
 
@@ -176,20 +219,33 @@ class StaticAnalyzer(BaseAnalyzer):
         lines.append("\nShowing how data flows between procedures:")
         lines.append("")
 
-        var_flows = {}
-        for key, flow in self.dataflow.items():
-            var = flow['variable']
-            if var not in var_flows:
-                var_flows[var] = []
-            var_flows[var].append((flow['from'], flow['to']))
+        uninitialized = [name for name in self.engine.live_on_entry()
+                         if not self.var_usage[name]['definition'].value]
+        if uninitialized:
+            lines.append(f"Read before any assignment (no VALUE): {', '.join(sorted(uninitialized))}")
+
+        unused = {}
+        for definition in self.engine.unused_definitions():
+            name = self.engine.symbols.names[definition.variable]
+            unused.setdefault(name, []).append(f"{definition.paragraph} (statement {definition.statement})")
 
-        for var, flows in sorted(var_flows.items()):
+        flowing = set(self.dataflow.variables())
+        self.linked_variables = sorted(flowing | set(unused))
+        for var in self.linked_variables:
             lines.append(f"\n{var}:")
             purpose = self.var_usage[var]['purpose']
             lines.append(f"  Purpose: {purpose}")
-            lines.append(f"  Data Flow:")
-            for from_proc, to_proc in flows:
-                lines.append(f"    {from_proc} --->[writes]---> {var} ----[reads]----> {to_proc}")
+            count = self.dataflow.pair_count(var) if var in flowing else 0
+            if self.dataflow_cap is not None and count > self.dataflow_cap:
+                lines.append(f"  Data Flow ({count} links, summarized):")
+                lines.append(f"    {', '.join(sorted(self.dataflow.writers(var)))} --->[writes]---> {var}")
+                lines.append(f"    {var} ----[reads]----> {', '.join(sorted(self.dataflow.readers(var)))}")
+            elif count:
+                lines.append(f"  Data Flow:")
+                for from_proc, to_proc in self.dataflow.pairs(var):
+                    lines.append(f"    {from_proc} --->[writes]---> {var} ----[reads]----> {to_proc}")
+            if var in unused:
+                lines.append(f"  Unused writes (overwritten or never read): {', '.join(unused[var])}")
         return lines
 
     def _generate_procedure_details(self) -> List[str]:
@@ -197,69 +253,96 @@ class StaticAnalyzer(BaseAnalyzer):
         lines.append("\nDETAILED PROCEDURE ANALYSIS")
         lines.append("=" * 80)
 
+        manifest, keys, reused = None, {}, 0
+        if self.manifest_dir:
+            manifest = ProgramManifest.load(self.manifest_dir, 'static', self.program.name)
+            keys = neighbourhood_keys(self.program)
+
         for para in self.program.paragraphs:
-            lines.append(f"\n{'--' * 80}")
-            lines.append(f"PROCEDURE: {para.name}")
-            lines.append('--' * 80)
-
-            name_upper = para.name.upper()
-            if 'INIT' in name_upper:
-                lines.append("Purpose: Initialize variables and setup")
-            elif 'CALC' in name_upper or 'COMPUTE' in name_upper:
-                lines.append("Purpose: Perform calculations")
-            elif 'PROCESS' in name_upper:
-                lines.append("Purpose: Main processing logic")
-            elif 'DISPLAY' in name_upper or 'SHOW' in name_upper:
-                lines.append("Purpose: Output results")
-            elif 'MAIN' in name_upper:
-                lines.append("Purpose: Main control flow")
-
-            if para.name in self.call_graph:
-                calls = self.call_graph[para.name]['calls']
-                called_by = self.call_graph[para.name]['called_by']
-
-                if called_by:
-                    lines.append(f"Called by: {', '.join(sorted(called_by))}")
-                if calls:
-                    lines.append(f"Calls: {', '.join(sorted(calls))}")
-
-            reads = set()
-            writes = set()
-            for var_name, usage in self.var_usage.items():
-                if para.name in usage['reads']:
-                    reads.add(var_name)
-                if para.name in usage['writes']:
-                    writes.add(var_name)
-
-            if reads:
-                lines.append(f"\nInput Variables (reads): {', '.join(sorted(reads))}")
-            if writes:
-                lines.append(f"Output Variables (writes): {', '.join(sorted(writes))}")
-
-            lines.append(f"\nStatements ({len(para.statements)} total):")
-            for i, stmt in enumerate(para.statements, 1):
-                if stmt.type == 'MOVE':
-                    lines.append(f"  {i}. MOVE {stmt.data['source']} TO {stmt.data['target']}")
-                elif stmt.type in ['ADD', 'SUBTRACT', 'MULTIPLY']:
-                    op1, op2, tgt = stmt.data['operand1'], stmt.data['operand2'], stmt.data['target']
-                    lines.append(f"  {i}. {stmt.type} {op1} and {op2} -> {tgt}")
-                elif stmt.type == 'COMPUTE':
-                    lines.append(f"  {i}. COMPUTE {stmt.data['target']} = {stmt.data['expression']}")
-                elif stmt.type == 'PERFORM':
-                    target = stmt.data['target']
-                    if 'until' in stmt.data:
-                        lines.append(f"  {i}. PERFORM {target} UNTIL {stmt.data['until']}")
-                    else:
-                        lines.append(f"  {i}. PERFORM {target}")
-                elif stmt.type == 'IF':
-                    lines.append(f"  {i}. IF {stmt.data['condition']}")
-                elif stmt.type == 'DISPLAY':
-                    lines.append(f"  {i}. DISPLAY {stmt.data['item']}")
+            fragment = manifest.fragment(para.name, keys[para.name]) if manifest else None
+            if fragment is None:
+                fragment = self._procedure_detail(para)
+                if manifest:
+                    manifest.store_fragment(para.name, keys[para.name], fragment)
+            else:
+                reused += 1
+            lines.extend(fragment)
+
+        if manifest:
+            manifest.record_program(self.program)
+            manifest.save()
+            self.reuse = ReuseStats(reused, len(self.program.paragraphs))
+        return lines
+
+    def _procedure_detail(self, para: Paragraph) -> List[str]:
+        lines = []
+        lines.append(f"\n{'--' * 80}")
+        lines.append(f"PROCEDURE: {para.name}")
+        lines.append('--' * 80)
+
+        purpose = self._procedure_purpose(para.name)
+        if purpose:
+            lines.append(f"Purpose: {purpose}")
+
+        if para.name in self.call_graph:
+            calls = self.call_graph[para.name]['calls']
+            called_by = self.call_graph[para.name]['called_by']
+
+            if called_by:
+                lines.append(f"Called by: {', '.join(sorted(called_by))}")
+            if calls:
+                lines.append(f"Calls: {', '.join(sorted(calls))}")
+
+        reads, writes = self._paragraph_usage(para.name)
+
+        if reads:
+            lines.append(f"\nInput Variables (reads): {', '.join(sorted(reads))}")
+        if writes:
+            lines.append(f"Output Variables (writes): {', '.join(sorted(writes))}")
+
+        lines.append(f"\nStatements ({len(para.statements)} total):")
+        for i, stmt in enumerate(para.statements, 1):
+            if stmt.type == 'MOVE':
+                lines.append(f"  {i}. MOVE {stmt.data['source']} TO {stmt.data['target']}")
+            elif stmt.type in ['ADD', 'SUBTRACT', 'MULTIPLY']:
+                op1, op2, tgt = stmt.data['operand1'], stmt.data['operand2'], stmt.data['target']
+                lines.append(f"  {i}. {stmt.type} {op1} and {op2} -> {tgt}")
+            elif stmt.type == 'COMPUTE':
+                expression = stmt.data['expression']
+                line = f"  {i}. COMPUTE {stmt.data['target']} = {expression}"
+                folded = getattr(expression, 'folded', lambda: None)()
+                if folded is not None and render(folded) != render(expression.tree):
+                    line += f" (folds to {render(folded)})"
+                lines.append(line)
+            elif stmt.type == 'PERFORM':
+                target = stmt.data['target']
+                if 'until' in stmt.data:
+                    lines.append(f"  {i}. PERFORM {target} UNTIL {stmt.data['until']}")
                 else:
-                    lines.append(f"  {i}. {stmt.type}")
+                    lines.append(f"  {i}. PERFORM {target}")
+            elif stmt.type == 'IF':
+                lines.append(f"  {i}. IF {stmt.data['condition']}")
+            elif stmt.type == 'DISPLAY':
+                lines.append(f"  {i}. DISPLAY {stmt.data['item']}")
+            else:
+                lines.append(f"  {i}. {stmt.type}")
 
         return lines
 
+    def _procedure_purpose(self, para_name: str) -> Optional[str]:
+        name_upper = para_name.upper()
+        if 'INIT' in name_upper:
+            return "Initialize variables and setup"
+        elif 'CALC' in name_upper or 'COMPUTE' in name_upper:
+            return "Perform calculations"
+        elif 'PROCESS' in name_upper:
+            return "Main processing logic"
+        elif 'DISPLAY' in name_upper or 'SHOW' in name_upper:
+            return "Output results"
+        elif 'MAIN' in name_upper:
+            return "Main control flow"
+        return None
+
     def _generate_visual_graph(self) -> List[str]:
         lines = []
         lines.append("\nVISUAL CALL GRAPH")
@@ -273,11 +356,13 @@ class StaticAnalyzer(BaseAnalyzer):
         lines.append("\nDATA FLOW DIAGRAM")
         lines.append("")
 
+        order = {name: i for i, name in enumerate(self.var_usage)}
         for para in self.program.paragraphs:
-            writes = [v for v in self.var_usage if para.name in self.var_usage[v]['writes']]
+            # Declaration order, as the first few writes are shown
+            writes = heapq.nsmallest(3, self._paragraph_usage(para.name)[1], key=order.get)
             if writes:
                 lines.append(f"[{para.name}]")
-                for var in writes[:3]:
+                for var in writes:
                     lines.append(f"    |")
                     lines.append(f"    |----> {var}")
                 lines.append("")
@@ -285,32 +370,35 @@ class StaticAnalyzer(BaseAnalyzer):
         return lines
 
     def _draw_call_tree(self, para_name: str, lines: List[str], prefix: str, visited: set):
-        if para_name in visited:
-            lines.append(f"{prefix}|-- {para_name} (already shown)")
-            return
-
-        visited.add(para_name)
-        lines.append(f"{prefix}|-- {para_name}")
-
-        if para_name in self.call_graph:
-            calls = sorted(self.call_graph[para_name]['calls'])
-            for i, called in enumerate(calls):
-                is_last = (i == len(calls) - 1)
-                new_prefix = prefix + ("   " if is_last else "|  ")
-                self._draw_call_tree(called, lines, new_prefix, visited)
-
-    def generate_documentation(self) -> str:
+        stack = [(para_name, prefix, 0)]
+        while stack:
+            para_name, prefix, depth = stack.pop()
+            label = para_name if depth <= MAX_INDENT_DEPTH else f"{para_name} (depth {depth})"
+            if para_name in visited:
+                lines.append(f"{prefix}|-- {label} (already shown)")
+                continue
+
+            visited.add(para_name)
+            lines.append(f"{prefix}|-- {label}")
+
+            if para_name in self.call_graph:
+                calls = sorted(self.call_graph[para_name]['calls'])
+                for i, called in reversed(list(enumerate(calls))):
+                    is_last = (i == len(calls) - 1)
+                    new_prefix = prefix
+                    if depth < MAX_INDENT_DEPTH:
+                        new_prefix += "   " if is_last else "|  "
+                    stack.append((called, new_prefix, depth + 1))
+
+    def _generate_header(self) -> List[str]:
         lines = []
         lines.append("=" * 80)
         lines.append(f"COBOL PROGRAM DOCUMENTATION: {self.program.name}")
         lines.append("=" * 80)
+        return lines
 
-        lines.extend(self._generate_program_summary())
-        lines.extend(self._generate_execution_trace())
-        lines.extend(self._generate_visual_graph())
-        lines.extend(self._generate_data_linkage())
-        lines.extend(self._generate_procedure_details())
-
+    def _generate_variable_reference(self) -> List[str]:
+        lines = []
         lines.append("\n\nVARIABLE REFERENCE")
         lines.append("=" * 80)
         for var in self.program.variables:
@@ -325,4 +413,52 @@ class StaticAnalyzer(BaseAnalyzer):
         lines.append("\n" + "=" * 80)
         lines.append("END OF DOCUMENTATION")
         lines.append("=" * 80)
-        return "\n".join(lines)
\ No newline at end of file
+        return lines
+
+    def iter_documentation(self) -> Iterator[str]:
+        """The document as text chunks; a section is rendered only when the
+        previous one has been consumed, so at most one section's lines are
+        held at a time. Each section is timed into section_stats."""
+        sections = [('header', self._generate_header),
+                    ('summary', self._generate_program_summary),
+                    ('execution trace', self._generate_execution_trace),
+                    ('call graph', self._generate_visual_graph),
+                    ('data linkage', self._generate_data_linkage),
+                    ('procedures', self._generate_procedure_details),
+                    ('variables', self._generate_variable_reference)]
+        self.section_stats = []
+        self.result = DocumentationResult('static', self.program.name, headings=list(HEADINGS))
+        for i, (name, generate) in enumerate(sections):
+            start = time.perf_counter()
+            with profiling.span(f'render.{name}'):
+                lines = generate()
+            stats = SectionStats(name, 0, 0.0)
+            self.section_stats.append(stats)
+            for first in range(0, len(lines), STREAM_CHUNK_LINES):
+                text = "\n".join(lines[first:first + STREAM_CHUNK_LINES])
+                if i or first:
+                    text = "\n" + text
+                stats.bytes += len(text) if text.isascii() else len(text.encode('utf-8'))
+                self.result.observe(text)
+                yield text
+            stats.seconds = time.perf_counter() - start
+        self._collect_result()
+
+    def _collect_result(self):
+        """Fill self.result with what the rendered sections covered."""
+        result = self.result
+        result.procedures = list(dict.fromkeys(para.name for para in self.program.paragraphs))
+        result.variables = list(dict.fromkeys(var.name for var in self.program.variables))
+        result.statements = sum(len(para.statements) for para in self.program.paragraphs)
+        result.calls = {name: sorted(node['calls']) for name, node in self.call_graph.items() if node['calls']}
+        result.flows = [Flow(var, tuple(sorted(self.dataflow.writers(var))), tuple(sorted(self.dataflow.readers(var))),
+                             self.dataflow.pair_count(var)) for var in sorted(self.dataflow.variables())]
+
+        # In the order the sections render them
+        purposes = [self.var_usage[var]['purpose'] for var in self.linked_variables]
+        purposes += filter(None, (self._procedure_purpose(para.name) for para in self.program.paragraphs))
+        purposes += [self.var_usage[var.name]['purpose'] for var in self.program.variables if var.name in self.var_usage]
+        result.purposes = purposes
+
+    def generate_documentation(self) -> str:
+        return "".join(self.iter_documentation())
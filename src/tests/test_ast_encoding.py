@@ -0,0 +1,38 @@
+import unittest
+
+from common.ast_encoding import encode_compact
+from common.parser import get_parser
+
+PROGRAM = """IDENTIFICATION DIVISION. PROGRAM-ID. LITERALS.
+DATA DIVISION. WORKING-STORAGE SECTION.
+01 TOTAL PIC X(5) VALUE "A|B".
+01 DASH PIC X(1) VALUE "-".
+PROCEDURE DIVISION.
+MAIN.
+    DISPLAY "TOTAL | TOTAL".
+    DISPLAY TOTAL.
+    MOVE "-" TO DASH.
+    MOVE 1.5 TO TOTAL.
+    STOP RUN.
+"""
+
+
+class CompactEncodingTest(unittest.TestCase):
+
+    def setUp(self):
+        records = encode_compact(get_parser().parse(PROGRAM)).splitlines()
+        self.records = [record for record in records if not record.startswith('#')]
+
+    def test_literals_are_quoted_and_escaped(self):
+        self.assertIn('V|1|$0|X(5)|"A\\|B"', self.records)
+        self.assertIn('V|1|$1|X(1)|"-"', self.records)
+        self.assertIn(' MOVE|"-"|$1', self.records)
+
+    def test_no_symbols_inside_literals(self):
+        self.assertIn(' DISPLAY|"TOTAL \\| TOTAL"', self.records)
+        self.assertIn(' DISPLAY|$0', self.records)
+        self.assertIn(' MOVE|1.5|$0', self.records)
+
+
+if __name__ == '__main__':
+    unittest.main()
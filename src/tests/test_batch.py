@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import batch
+from batch import BatchOptions, FilePipeline, input_root, output_path, run_static
+from common.llm import LLMClient, StubModel
+from llm_analyzer import LLMAnalyzer
+from common.compact import CompactProgram
+from static_analyzer import StaticAnalyzer
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'resources', 'input', 'payroll.cbl')
+
+
+class OutputPathTest(unittest.TestCase):
+
+    def test_members_sharing_a_name_do_not_collide(self):
+        inputs = ['estate/a/X.cbl', 'estate/b/X.cbl', 'estate/b/X.cob']
+        options = BatchOptions(output_dir='out', input_root=input_root(inputs))
+        paths = [output_path(options, 'static', path) for path in inputs]
+        self.assertEqual(paths, [os.path.join('out', 'a', 'static_X.cbl.output'),
+                                 os.path.join('out', 'b', 'static_X.cbl.output'),
+                                 os.path.join('out', 'b', 'static_X.cob.output')])
+
+    def test_without_a_root_outputs_are_flat(self):
+        options = BatchOptions(output_dir='out')
+        self.assertEqual(output_path(options, 'llm', 'a/X.cbl'), os.path.join('out', 'llm_X.cbl.output'))
+
+    def test_document_writes_mirrored_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(SAMPLE) as f:
+                source = f.read()
+            inputs = []
+            for directory in ('a', 'b'):
+                os.makedirs(os.path.join(tmp, 'in', directory))
+                inputs.append(os.path.join(tmp, 'in', directory, 'PAY.cbl'))
+                with open(inputs[-1], 'w') as f:
+                    f.write(source)
+            options = BatchOptions(output_dir=os.path.join(tmp, 'out'), metrics=False, use_parse_cache=False,
+                                   input_root=input_root(inputs))
+            results = list(run_static(inputs, options, workers=1))
+            self.assertEqual([r.error for r in results], [None, None])
+            self.assertEqual(len({r.output_path for r in results}), 2)
+            self.assertTrue(all(os.path.isfile(r.output_path) for r in results))
+
+
+class CopybookCountTest(unittest.TestCase):
+
+    def test_static_results_count_copybooks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'lib'))
+            with open(os.path.join(tmp, 'lib', 'RATES.cpy'), 'w') as f:
+                f.write('       01 BASE-RATE PIC 9(3) VALUE 10.\n')
+            with open(SAMPLE) as f:
+                source = f.read().replace('       01 HOURLY-RATE PIC 9(3)V99 VALUE 25.50.', '       COPY RATES.')
+            inputs = []
+            for name in ('A', 'B'):
+                inputs.append(os.path.join(tmp, f'{name}.cbl'))
+                with open(inputs[-1], 'w') as f:
+                    f.write(source)
+            options = BatchOptions(output_dir=os.path.join(tmp, 'out'), metrics=False, use_parse_cache=False,
+                                   copybook_paths=(os.path.join(tmp, 'lib'),))
+            throughput = batch.Throughput()
+            for result in run_static(inputs, options, workers=1):
+                self.assertIsNone(result.error)
+                throughput.add(result)
+            # Parsed for the first member, shared with the second
+            self.assertEqual((throughput.copybook_includes, throughput.copybooks_parsed), (2, 1))
+
+
+class RecordingAnalyzer(StaticAnalyzer):
+    programs = []
+
+    def document(self, _input, _output=None, program=None):
+        self.programs.append(program)
+        return super().document(_input, _output, program)
+
+
+class FilePipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.options = BatchOptions(output_dir=self.dir.name, metrics=False, use_parse_cache=False)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_parse_failure_is_reported_once(self):
+        path = os.path.join(self.dir.name, 'BROKEN.cbl')
+        with open(path, 'w') as f:
+            f.write('IDENTIFICATION DIVISION. PROGRAM-ID.\n')
+
+        def factory():
+            raise AssertionError('analyzer run on a member that failed to parse')
+        record, = FilePipeline({'static': factory, 'llm': factory}, self.options, workers=1).run_all([path])
+        self.assertIn('could not be parsed', record.error)
+        self.assertEqual({name: result.error for name, result in record.results.items()},
+                         {'static': record.error, 'llm': record.error})
+
+    def test_analyzers_share_a_compact_program(self):
+        RecordingAnalyzer.programs = []
+        factories = {'a': RecordingAnalyzer, 'b': RecordingAnalyzer}
+        record, = FilePipeline(factories, self.options, workers=1).run_all([SAMPLE])
+        self.assertIsNone(record.error)
+        first, second = RecordingAnalyzer.programs
+        self.assertIs(first, second)
+        self.assertIsInstance(first, CompactProgram)
+
+    def test_files_in_flight_are_bounded(self):
+        in_flight, peak = 0, 0
+        run = FilePipeline.run
+
+        async def counting(pipeline, path):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await run(pipeline, path)
+            finally:
+                in_flight -= 1
+
+        analyzer = LLMAnalyzer(LLMClient(StubModel(latency=0.01)))
+        with mock.patch.object(FilePipeline, 'run', counting):
+            records = FilePipeline({'llm': lambda: analyzer}, self.options, workers=1).run_all([SAMPLE] * 10, 3)
+        self.assertEqual([record.error for record in records], [None] * 10)
+        self.assertEqual(peak, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from common.callgraph import CallGraph
+from common.parser import get_parser
+
+SOURCE = '''
+       IDENTIFICATION DIVISION.
+       PROGRAM-ID. CALL-ORDER.
+       DATA DIVISION.
+       WORKING-STORAGE SECTION.
+       01 FLAG PIC 9(1) VALUE 0.
+       PROCEDURE DIVISION.
+       MAIN-PARA.
+           PERFORM ZETA.
+           IF FLAG > 0 THEN
+               PERFORM ALPHA.
+           END-IF.
+           PERFORM MIDDLE.
+           PERFORM ZETA.
+           STOP RUN.
+       ALPHA.
+           DISPLAY FLAG.
+       MIDDLE.
+           PERFORM BETA.
+           PERFORM ALPHA.
+       BETA.
+           DISPLAY FLAG.
+       ZETA.
+           DISPLAY FLAG.
+'''
+
+
+class WalkTest(unittest.TestCase):
+
+    def test_calls_follow_statement_order(self):
+        graph = CallGraph(get_parser().parse(SOURCE))
+        self.assertEqual(graph.nodes['MAIN-PARA']['calls'], ['ZETA', 'ALPHA', 'MIDDLE'])
+        self.assertEqual(list(graph.walk()), [(0, 'MAIN-PARA', False), (1, 'ZETA', False),
+                                              (1, 'ALPHA', False), (1, 'MIDDLE', False),
+                                              (2, 'BETA', False), (2, 'ALPHA', True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
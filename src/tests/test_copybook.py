@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from common.copybook import CopybookLibrary, apply_replacing, parse_replacing
+from common.parse_cache import ParseCache
+
+PROGRAM = """IDENTIFICATION DIVISION. PROGRAM-ID. COPIES.
+DATA DIVISION. WORKING-STORAGE SECTION.
+01 TOTAL PIC 9(5) VALUE 0.
+COPY EMPREC REPLACING ==:P:== BY ==EMP==.
+PROCEDURE DIVISION. MAIN. STOP RUN.
+"""
+
+
+class ApplyReplacingTest(unittest.TestCase):
+
+    def test_pairs_do_not_chain(self):
+        replacing = parse_replacing('==:P:== BY ==XX== ==XX-ID== BY ==ZZ-ID==')
+        self.assertEqual(apply_replacing('01 :P:-ID PIC X.', replacing), '01 XX-ID PIC X.')
+
+    def test_first_listed_operand_wins(self):
+        replacing = parse_replacing('==A B== BY ==ONE== ==A== BY ==TWO==')
+        self.assertEqual(apply_replacing('A B A', replacing), 'ONE TWO')
+
+    def test_whole_words_only(self):
+        replacing = parse_replacing('==ID== BY ==KEY==')
+        self.assertEqual(apply_replacing('ID CUST-ID IDS', replacing), 'KEY CUST-ID IDS')
+
+
+
+class CopybookParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.dir.name, 'EMPREC.cpy'), 'w') as f:
+            f.write('01 :P:-NAME PIC X(20).\n01 :P:-RATE PIC 9(3)V99 VALUE 0.\n')
+        self.cache = ParseCache(os.path.join(self.dir.name, 'cache.sqlite3'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.dir.cleanup()
+
+    def test_copybooks_parsed_once_across_libraries(self):
+        library = CopybookLibrary([self.dir.name], parse_cache=self.cache)
+        names = [v.name for v in library.parse(PROGRAM, self.cache.parse).variables]
+        self.assertEqual(names, ['TOTAL', 'EMP-NAME', 'EMP-RATE'])
+        # Another worker's library loads the copybook instead of parsing it
+        with mock.patch('common.parse_cache.get_parser', side_effect=AssertionError('parsed again')):
+            program = CopybookLibrary([self.dir.name], parse_cache=self.cache).parse(PROGRAM, self.cache.parse)
+        self.assertEqual([v.name for v in program.variables], names)
+        # Only the member's own lookups count towards the hit rate
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
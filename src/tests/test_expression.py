@@ -0,0 +1,24 @@
+import unittest
+
+from common.expression import Expression, render
+
+
+def folded(text: str) -> str:
+    return render(Expression.parse(text.split()).folded())
+
+
+class FoldTest(unittest.TestCase):
+
+    def test_exact_results_fold(self):
+        self.assertEqual(folded('2 * 3 + A'), '6 + A')
+        self.assertEqual(folded('A + 10 / 4'), 'A + 2.5')
+
+    def test_inexact_and_invalid_results_stay_as_written(self):
+        self.assertEqual(folded('1 / 3'), '1 / 3')
+        self.assertEqual(folded('10 / 4 / 3'), '2.5 / 3')
+        self.assertEqual(folded('5 / 0'), '5 / 0')
+        self.assertEqual(folded('99999999999999999999 * 99999999999'), '99999999999999999999 * 99999999999')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from batch import BatchOptions, FilePipeline, document_file
+from common.parse_cache import ParseCache
+from common.source import FixedFormatSource, read_source
+from static_analyzer import StaticAnalyzer
+
+
+def fixed_line(body: str, indicator: str = ' ') -> str:
+    return f'000000{indicator}{body:<65}IDENTIFY'
+
+
+PROGRAM = '\n'.join([
+    fixed_line('IDENTIFICATION DIVISION.'),
+    fixed_line('PROGRAM-ID. TIMES.'),
+    fixed_line('DATA DIVISION.'),
+    fixed_line('WORKING-STORAGE SECTION.'),
+    fixed_line('01 A PIC 9(3) VALUE 2.'),
+    fixed_line('01 B PIC 9(3) VALUE 3.'),
+    fixed_line('01 C PIC 9(5) VALUE 0.'),
+    fixed_line('PROCEDURE DIVISION.'),
+    fixed_line('* A comment line', '*'),
+    fixed_line('MAIN.'),
+    fixed_line('    COMPUTE C = A * B + 1.'),
+    fixed_line('    STOP RUN.'),
+]) + '\n'
+
+
+def compute_names(program) -> set:
+    statement = next(s for p in program.paragraphs for s in p.statements if s.type == 'COMPUTE')
+    return set(statement.data['expression'].names)
+
+
+class FixedFormatParseTest(unittest.TestCase):
+    """'*' in a fixed-format member is TIMES; only the indicator column marks comments."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'TIMES.cbl')
+        with open(self.path, 'w') as f:
+            f.write(PROGRAM)
+        self.options = BatchOptions(output_dir=self.dir.name, fixed_format=True, metrics=False)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_document_file(self):
+        analyzer = StaticAnalyzer(stream=True)
+        analyzer.fixed_format = True
+        result = document_file('static', analyzer, self.path, self.options)
+        self.assertIsNone(result.error)
+        self.assertEqual(compute_names(analyzer.program), {'A', 'B'})
+
+    def test_document_file_parse_cache(self):
+        analyzer = StaticAnalyzer(stream=True)
+        analyzer.fixed_format = True
+        analyzer.parse_cache = ParseCache(os.path.join(self.dir.name, 'cache.sqlite3'))
+        for hit in (False, True):
+            result = document_file('static', analyzer, self.path, self.options)
+            self.assertIsNone(result.error)
+            self.assertEqual(result.parse_cache_hit, hit)
+            self.assertEqual(compute_names(analyzer.program), {'A', 'B'})
+        analyzer.parse_cache.close()
+
+    def test_fetch_program(self):
+        analyzer = StaticAnalyzer()
+        analyzer.fixed_format = True
+        self.assertEqual(compute_names(analyzer.fetch_program(read_source(self.path, True))), {'A', 'B'})
+
+    def test_pipeline(self):
+        pipeline = FilePipeline({}, self.options)
+        program, _ = pipeline._parse(read_source(self.path, True))
+        self.assertEqual(compute_names(program), {'A', 'B'})
+
+
+class ContinuationTest(unittest.TestCase):
+
+    def lines(self, *lines: str) -> list:
+        with tempfile.NamedTemporaryFile('w', suffix='.cbl', delete=False) as f:
+            f.write('\n'.join(lines) + '\n')
+        try:
+            with FixedFormatSource(f.name) as source:
+                return [bytes(line).decode() for line in source.lines()]
+        finally:
+            os.unlink(f.name)
+
+    def test_word_continues_without_a_space(self):
+        lines = self.lines(fixed_line('    MOVE 1 TO TOT'), fixed_line('    AL-A.', '-'))
+        self.assertEqual(lines[0].strip(), 'MOVE 1 TO TOTAL-A.')
+        self.assertEqual(lines[1], '')
+
+    def test_literal_keeps_spaces_to_column_72(self):
+        # The literal's line stops short; its missing columns are spaces
+        lines = self.lines('000000     DISPLAY "AB  ', fixed_line('    "CD".', '-'))
+        # "AB ends in column 22, so the literal holds 50 spaces before CD
+        self.assertEqual(lines[0].strip(), 'DISPLAY "AB' + ' ' * 50 + 'CD".')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import glob
+import os
+import unittest
+
+from benchmarks.generate import generate_program
+from common.lexer import LEXER_ENGINES, Scanner
+from common.util import read_file
+
+INPUT_GLOB = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'resources', 'input', '*.cbl')
+
+
+def tokenize(engine: str, code):
+    lexer = LEXER_ENGINES[engine]().build()
+    lexer.input(code)
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in iter(lexer.token, None)]
+
+
+class LexerEnginesTest(unittest.TestCase):
+    """The scan engine yields the same tokens as ply, from str and bytes alike."""
+
+    def test_scan_matches_ply(self):
+        samples = {path: read_file(path) for path in sorted(glob.glob(INPUT_GLOB))}
+        samples.update({f'generated-{n}': generate_program(n, name=f'GEN-{n}') for n in (10, 500)})
+        for name, code in samples.items():
+            expected = tokenize('ply', code)
+            for data in (code, code.encode()):
+                with self.subTest(name=name, input=type(data).__name__):
+                    self.assertEqual(tokenize('scan', data), expected)
+
+    def test_reused_scanner_keeps_only_the_current_spellings(self):
+        scanner = Scanner()
+        for i in range(3):
+            scanner.input(generate_program(50, name=f'GEN-{i}'))
+            words = {tok.value for tok in iter(scanner.token, None)
+                     if isinstance(tok.value, str) and tok.value[:1].isalpha()}
+            self.assertLessEqual(set(scanner.word_types), words)
+
+
+if __name__ == '__main__':
+    unittest.main()
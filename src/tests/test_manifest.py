@@ -0,0 +1,55 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from batch import BatchOptions, document_file
+from common.chunking import Chunk, MapReduceSummarizer
+from common.llm import LLMClient, StubModel
+from common.manifest import ProgramManifest
+from static_analyzer import StaticAnalyzer
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'resources', 'input', 'payroll.cbl')
+
+
+class ManifestKeyTest(unittest.TestCase):
+
+    def test_members_sharing_a_program_id_keep_their_own(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifests = os.path.join(tmp, 'manifests')
+            options = BatchOptions(output_dir=os.path.join(tmp, 'out'), metrics=False, manifest_dir=manifests)
+            with open(SAMPLE) as f:
+                source = f.read()
+            for directory in ('a', 'b'):
+                path = os.path.join(tmp, directory, 'PAY.cbl')
+                os.makedirs(os.path.dirname(path))
+                with open(path, 'w') as f:
+                    f.write(source)
+                result = document_file('static', StaticAnalyzer(options.manifest_dir), path, options)
+                self.assertIsNone(result.error)
+                # A fresh run of the same member finds only its own manifest
+                self.assertEqual(result.reused, 0)
+            self.assertEqual(len(os.listdir(os.path.join(manifests, 'static'))), 2)
+
+
+class ChunkNotesTest(unittest.TestCase):
+
+    def summarize(self, manifest: ProgramManifest, model_name: str, template: str) -> int:
+        with open(SAMPLE) as f:
+            program = StaticAnalyzer().fetch_program(f.read())
+        summarizer = MapReduceSummarizer(LLMClient(StubModel(model_name=model_name)), 10 ** 6, manifest)
+        chunk = Chunk([para.name for para in program.paragraphs], 'PROCEDURE DIVISION.')
+        asyncio.run(summarizer.summarize(program, [chunk], template))
+        return summarizer.reused
+
+    def test_notes_are_reused_for_the_same_model_and_template_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = ProgramManifest(os.path.join(tmp, 'PAYROLL-CALC.json'))
+            self.assertEqual(self.summarize(manifest, 'a', 'T'), 0)
+            self.assertGreater(self.summarize(manifest, 'a', 'T'), 0)
+            self.assertEqual(self.summarize(manifest, 'b', 'T'), 0)
+            self.assertEqual(self.summarize(manifest, 'b', 'U'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
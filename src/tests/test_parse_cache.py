@@ -0,0 +1,69 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from common.parse_cache import ParseCache
+from common.parser import Parser, grammar_fingerprint
+from common.util import Program, Variable
+
+
+class GrammarFingerprintTest(unittest.TestCase):
+
+    def tearDown(self):
+        grammar_fingerprint.cache_clear()
+
+    def test_action_bodies_count(self):
+        before = grammar_fingerprint()
+
+        def p_program(self, p):
+            '''program : identification_division data_division procedure_division'''
+            p[0] = None
+        grammar_fingerprint.cache_clear()
+        with mock.patch.object(Parser, 'p_program', p_program):
+            self.assertNotEqual(grammar_fingerprint(), before)
+        grammar_fingerprint.cache_clear()
+        self.assertEqual(grammar_fingerprint(), before)
+
+
+class EvictionTest(unittest.TestCase):
+
+    def test_bound_holds_across_connections(self):
+        program = Program('P', [Variable(1, f'V{i}', 'X(10)') for i in range(50)])
+        size = len(pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite3')
+            # Two processes open the cache, then both store into it
+            first, second = ParseCache(path, size * 3), ParseCache(path, size * 3)
+            for i in range(3):
+                first.put(f'first{i}', program)
+            for i in range(2):
+                second.put(f'second{i}', program)
+            self.assertEqual(len(second), 3)
+            self.assertIsNotNone(second.get('second1'))
+            first.close()
+            second.close()
+
+    def test_replacing_an_entry_counts_it_once(self):
+        program = Program('P', [Variable(1, f'V{i}', 'X(10)') for i in range(50)])
+        size = len(pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL))
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'), size * 2)
+            for key in ('a', 'b', 'a', 'a'):
+                cache.put(key, program)
+            self.assertEqual(len(cache), 2)
+            self.assertIsNotNone(cache.get('b'))
+            cache.close()
+            # The total survives reopening, and a stale version is subtracted from it
+            reopened = ParseCache(os.path.join(tmp, 'cache.sqlite3'), size * 2)
+            self.assertEqual(reopened._total(), size * 2)
+            reopened.close()
+            with mock.patch('common.parse_cache.AST_VERSION', -1):
+                stale = ParseCache(os.path.join(tmp, 'cache.sqlite3'), size * 2)
+            self.assertEqual((len(stale), stale._total()), (0, 0))
+            stale.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import glob
+import os
+import sys
+import threading
+import unittest
+
+from benchmarks.generate import generate_program
+from common.parser import ParserPool, get_parser
+from common.util import read_file
+
+INPUT_GLOB = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'resources', 'input', '*.cbl')
+# Fixed, so the parses overlap however many cores the machine has
+THREADS = 8
+
+
+def corpus():
+    sources = [read_file(path) for path in sorted(glob.glob(INPUT_GLOB))]
+    return sources + [generate_program(50 + i * 37, name=f'GEN-{i}') for i in range(THREADS * 2)]
+
+
+class ParserConcurrencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sources = corpus()
+        self.serial = [get_parser().parse(code) for code in self.sources]
+        self.assertTrue(all(program is not None for program in self.serial))
+        # Switch threads as often as possible, so parses interleave even on one core
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def test_pool_matches_serial(self):
+        self.assertEqual(ParserPool(THREADS).parse_all(self.sources), self.serial)
+
+    def test_shared_parser_is_reentrant(self):
+        parser = get_parser()
+        barrier = threading.Barrier(THREADS)
+        results = [None] * THREADS
+
+        def parse_all(index: int):
+            barrier.wait()
+            order = self.sources[index:] + self.sources[:index]
+            results[index] = [parser.parse(code) for code in order]
+
+        threads = [threading.Thread(target=parse_all, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for index, programs in enumerate(results):
+            self.assertEqual(programs, self.serial[index:] + self.serial[:index])
+
+    def test_failed_parse_returns_none(self):
+        parser = get_parser()
+        self.assertIsNotNone(parser.parse(self.sources[0]))
+        self.assertIsNone(parser.parse('IDENTIFICATION DIVISION. PROGRAM-ID.'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import unittest
+
+from common import profiling
+from common.parser import Parser, get_parser
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'resources', 'input', 'payroll.cbl')
+
+
+class ProfiledParseTest(unittest.TestCase):
+    """Every lexer engine reports its tokens and lexing time."""
+
+    def setUp(self):
+        with open(SAMPLE) as f:
+            self.source = f.read()
+        self.profiler = profiling.enable()
+        self.profiler.drain()
+
+    def tearDown(self):
+        profiling.disable()
+
+    def assert_lexed(self, program):
+        self.assertIsNotNone(program)
+        profile = self.profiler.drain()
+        self.assertGreater(profile.counters['tokens lexed'], 0)
+        lex = [event for event in profile.events if event.name == 'lex']
+        self.assertEqual(len(lex), 1)
+        self.assertGreater(lex[0].seconds, 0)
+
+    def test_ply_engine(self):
+        self.assert_lexed(get_parser().parse(self.source))
+
+    def test_scan_engine(self):
+        parser = Parser('scan')
+        parser.build()
+        self.assert_lexed(parser.parse(self.source))
+
+    def test_fixed_format_text(self):
+        self.assert_lexed(get_parser().parse(self.source, fixed_format=True))
+
+    def test_fixed_format_lines(self):
+        self.assert_lexed(get_parser().parse_lines(self.source.splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import io
+import os
+import unittest
+
+from static_analyzer import StaticAnalyzer
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'resources', 'input', 'payroll.cbl')
+
+
+class DocumentTest(unittest.TestCase):
+
+    def test_stream_writes_the_document_and_returns_none(self):
+        with open(SAMPLE) as f:
+            source = f.read()
+        whole, streamed = io.StringIO(), io.StringIO()
+        text = StaticAnalyzer().document(source, whole)
+        self.assertEqual(text, whole.getvalue())
+        self.assertIsNone(StaticAnalyzer(stream=True).document(source, streamed))
+        self.assertEqual(streamed.getvalue(), text)
+
+
+if __name__ == '__main__':
+    unittest.main()